@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment, teardown_test_environment  # noqa: E402
+
+from payouts import metrics  # noqa: E402
+from payouts.models import CurrencyChoices, Payout  # noqa: E402
+
+
+@contextmanager
+def benchmark_database() -> Iterator[None]:
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def create_payouts(count: int, batch_size: int = 5000) -> None:
+    currencies = CurrencyChoices.values
+    for start in range(0, count, batch_size):
+        payouts = [
+            Payout(
+                amount=Decimal(index % 5000) + Decimal("0.25"),
+                currency=currencies[index % len(currencies)],
+                recipient_name=f"Recipient {index}",
+                recipient_account=f"ACC-{index % 1000:06d}",
+                description="Benchmark",
+                callback_url="https://example.com/hook" if index % 2 else "",
+            )
+            for index in range(start, min(start + batch_size, count))
+        ]
+        Payout.objects.bulk_create(payouts)
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+@dataclass(frozen=True)
+class Result:
+    name: str
+    operations: int
+    elapsed: float
+    p50_ms: float
+    p99_ms: float
+    queries_per_op: float
+
+    @property
+    def ops_per_sec(self) -> float:
+        return self.operations / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "ops_per_sec": round(self.ops_per_sec, 2),
+            "p50_ms": round(self.p50_ms, 3),
+            "p99_ms": round(self.p99_ms, 3),
+            "queries_per_op": round(self.queries_per_op, 2),
+        }
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(max(math.ceil(fraction * len(ordered)) - 1, 0), len(ordered) - 1)]
+
+
+def measure(name: str, func: Callable[[int], object], iterations: int, ops_per_call: int = 1) -> Result:
+    latencies: list[float] = []
+    queries = 0
+    started = time.perf_counter()
+    for iteration in range(iterations):
+        call_started = time.perf_counter()
+        with metrics.count_queries() as counter:
+            func(iteration)
+        latencies.append(time.perf_counter() - call_started)
+        queries += counter[0]
+    elapsed = time.perf_counter() - started
+    return Result(
+        name=name,
+        operations=iterations * ops_per_call,
+        elapsed=elapsed,
+        p50_ms=percentile(latencies, 0.50) * 1000,
+        p99_ms=percentile(latencies, 0.99) * 1000,
+        queries_per_op=queries / iterations if iterations else 0.0,
+    )
+
+
+class _StubWebhookHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.received += 1
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@contextmanager
+def stub_webhook_server() -> Iterator[ThreadingHTTPServer]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubWebhookHandler)
+    server.received = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
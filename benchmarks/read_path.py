@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import argparse
+
+from benchmarks.base import benchmark_database, best_of, create_payouts
+from payouts.models import Payout
+from payouts.renderers import PayoutJSONRenderer
+from payouts.serializers import PAYOUT_READ_FIELDS, PayoutSerializer
+from rest_framework.renderers import JSONRenderer
+
+
+def model_serializer_path(limit: int) -> bytes:
+    payouts = Payout.objects.order_by("-created_at", "-id")[:limit]
+    return JSONRenderer().render(PayoutSerializer(payouts, many=True).data)
+
+
+def values_path(limit: int) -> bytes:
+    rows = Payout.objects.order_by("-created_at", "-id").values(*PAYOUT_READ_FIELDS)[:limit]
+    return PayoutJSONRenderer().render(list(rows))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare payout list serialization paths.")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        create_payouts(args.rows)
+        for name, func in [("ModelSerializer", model_serializer_path), ("values()", values_path)]:
+            elapsed = best_of(lambda: func(args.rows), args.repeat)
+            print(f"{name:<16} {args.rows / elapsed:>12,.0f} rows/sec ({elapsed * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
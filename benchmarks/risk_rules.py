@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import argparse
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from benchmarks.base import benchmark_database, best_of, create_payouts
+from payouts.models import Payout
+from payouts.risk import (
+    RISK_FIELDS,
+    BlocklistRule,
+    CurrencyLimitRule,
+    RiskCandidate,
+    RiskEngine,
+    VelocityRule,
+)
+
+
+def build_engine() -> RiskEngine:
+    return RiskEngine(
+        [
+            CurrencyLimitRule({"USD": "4000", "EUR": "3500"}, default="1000000"),
+            BlocklistRule([f"ACC-{index:06d}" for index in range(0, 1000, 50)]),
+            VelocityRule(timedelta(hours=1), max_count=20),
+            VelocityRule(timedelta(hours=24), max_count=200),
+        ]
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure batch risk rule evaluation throughput.")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        create_payouts(args.rows)
+        candidates = [
+            RiskCandidate(*row)
+            for row in Payout.objects.order_by("created_at").values_list(*RISK_FIELDS)[: args.batch]
+        ]
+        engine = build_engine()
+        with CaptureQueriesContext(connection) as queries:
+            flagged = engine.evaluate(candidates)
+        elapsed = best_of(lambda: engine.evaluate(candidates), args.repeat)
+
+    evaluations = len(candidates) * len(engine.rules)
+    print(f"batch of {len(candidates):,} payouts, {len(engine.rules)} rules, {len(flagged):,} flagged")
+    print(f"{evaluations / elapsed:>12,.0f} rules/sec ({elapsed * 1000:.1f} ms per batch)")
+    print(f"{len(candidates) / elapsed:>12,.0f} payouts/sec, {len(queries)} queries per batch")
+
+
+if __name__ == "__main__":
+    main()
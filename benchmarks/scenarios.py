@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextvars
+import json
+import sys
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks.base import Result, benchmark_database, create_payouts, measure, stub_webhook_server
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from payouts import outbox
+from payouts.models import Payout
+from payouts.tasks import finalize_due_payouts
+from rest_framework.test import APIClient
+
+
+def _check(response, expected: int = 200) -> None:
+    if response.status_code != expected:
+        raise RuntimeError(f"Unexpected HTTP {response.status_code}: {response.content[:200]!r}")
+
+
+def _payout(index: int, **extra) -> dict:
+    return {
+        "amount": f"{index % 900 + 1}.00",
+        "currency": "USD",
+        "recipient_name": f"Bench {index}",
+        "recipient_account": f"BENCH-{index:08d}",
+        **extra,
+    }
+
+
+def bulk_create(client: APIClient, args: argparse.Namespace) -> list[Result]:
+    url = reverse("payout-bulk-create")
+    payloads = [
+        [_payout(iteration * args.bulk_size + index) for index in range(args.bulk_size)]
+        for iteration in range(args.iterations)
+    ]
+    return [
+        measure(
+            f"bulk_create[{args.bulk_size}]",
+            lambda iteration: _check(client.post(url, payloads[iteration], format="json"), 201),
+            args.iterations,
+            ops_per_call=args.bulk_size,
+        )
+    ]
+
+
+def list_search(client: APIClient, args: argparse.Namespace) -> list[Result]:
+    missing = args.rows - Payout.objects.count()
+    if missing > 0:
+        create_payouts(missing)
+
+    url = reverse("payout-list")
+    cursor = {"url": f"{url}?page_size=100"}
+
+    def walk(iteration: int) -> None:
+        response = client.get(cursor["url"])
+        _check(response)
+        cursor["url"] = response.json()["next"] or f"{url}?page_size=100"
+
+    queries = {
+        "list_first_page": {"page_size": 100},
+        "search_account_prefix": {"search": "ACC-00012", "page_size": 100},
+        "search_name": {"search": "Recipient 4242", "page_size": 100},
+        "filter_status_currency": {"status": "pending", "currency": "USD,EUR", "page_size": 100},
+    }
+    results = [
+        measure(name, lambda iteration, params=params: _check(client.get(url, params)), args.iterations)
+        for name, params in queries.items()
+    ]
+    results.append(measure("list_cursor_walk", walk, args.iterations))
+    return results
+
+
+def end_to_end(client: APIClient, args: argparse.Namespace) -> list[Result]:
+    url = reverse("payout-list")
+    with stub_webhook_server() as server, override_settings(
+        CELERY_TASK_ALWAYS_EAGER=True,
+        PAYOUT_PROCESSING_DELAY_SECONDS=0,
+        WEBHOOK_RETRY_BACKOFF_SECONDS=0,
+    ):
+        callback_url = f"http://127.0.0.1:{server.server_address[1]}/hook"
+
+        def create_finalize_notify(iteration: int) -> None:
+            payload = _payout(10_000_000 + iteration, callback_url=callback_url)
+            _check(client.post(url, payload, format="json"), 201)
+            outbox.relay()
+            finalize_due_payouts.apply()
+
+        result = measure("create_finalize_webhook", create_finalize_notify, args.iterations)
+        if server.received != args.iterations:
+            raise RuntimeError(f"Expected {args.iterations} webhooks, got {server.received}.")
+    return [result]
+
+
+def status_polling(client: APIClient, args: argparse.Namespace) -> list[Result]:
+    payout_ids = [str(payout_id) for payout_id in Payout.objects.values_list("id", flat=True)[:1000]]
+    if not payout_ids:
+        create_payouts(1000)
+        payout_ids = [str(payout_id) for payout_id in Payout.objects.values_list("id", flat=True)[:1000]]
+    user = get_user_model().objects.get(username="bench")
+    concurrency = args.concurrency
+
+    def poll_urls(iteration: int, name: str) -> list[str]:
+        start = iteration * concurrency
+        return [
+            reverse(name, args=[payout_ids[(start + index) % len(payout_ids)]]) for index in range(concurrency)
+        ]
+
+    login = Client()
+    login.force_login(user)
+    local = threading.local()
+
+    def wsgi_get(url: str) -> None:
+        if not hasattr(local, "client"):
+            local.client = Client()
+            local.client.cookies = login.cookies
+        _check(local.client.get(url))
+
+    def wsgi_batch(urls: list[str]) -> None:
+        futures = [executor.submit(contextvars.copy_context().run, wsgi_get, url) for url in urls]
+        for future in futures:
+            future.result()
+
+    async_client = AsyncClient()
+    async_client.cookies = login.cookies
+
+    async def asgi_batch(urls: list[str]) -> None:
+        for response in await asyncio.gather(*(async_client.get(url) for url in urls)):
+            _check(response)
+
+    # Both sides read the same payout detail from the database: the sync retrieve cache would
+    # otherwise turn the WSGI side into cache reads while the async view always queries.
+    loop = asyncio.new_event_loop()
+    try:
+        with override_settings(
+            PAYOUT_RETRIEVE_CACHE_TTL_SECONDS=0,
+            PAYOUT_RETRIEVE_CACHE_TERMINAL_TTL_SECONDS=0,
+        ):
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                wsgi = measure(
+                    f"detail_poll_wsgi[c={concurrency}]",
+                    lambda iteration: wsgi_batch(poll_urls(iteration, "payout-detail")),
+                    args.iterations,
+                    ops_per_call=concurrency,
+                )
+            asgi = measure(
+                f"detail_poll_asgi[c={concurrency}]",
+                lambda iteration: loop.run_until_complete(
+                    asgi_batch(poll_urls(iteration, "async-payout-detail"))
+                ),
+                args.iterations,
+                ops_per_call=concurrency,
+            )
+    finally:
+        loop.close()
+    return [wsgi, asgi]
+
+
+SCENARIOS: dict[str, Callable[[APIClient, argparse.Namespace], list[Result]]] = {
+    "bulk_create": bulk_create,
+    "list_search": list_search,
+    "end_to_end": end_to_end,
+    "status_polling": status_polling,
+}
+
+
+def compare(results: list[Result], baseline: dict[str, dict], threshold: float) -> bool:
+    regressed = False
+    print()
+    print(f"{'scenario':<28} {'ops/sec':>12} {'baseline':>12} {'change':>8}  queries/op")
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            print(f"{result.name:<28} {result.ops_per_sec:>12,.1f} {'-':>12} {'new':>8}")
+            continue
+        change = result.ops_per_sec / base["ops_per_sec"] - 1 if base["ops_per_sec"] else 0.0
+        slower = change < -threshold
+        more_queries = result.queries_per_op > base["queries_per_op"]
+        regressed = regressed or slower or more_queries
+        marker = "  REGRESSION" if slower or more_queries else ""
+        print(
+            f"{result.name:<28} {result.ops_per_sec:>12,.1f} {base['ops_per_sec']:>12,.1f} "
+            f"{change:>+8.1%}  {result.queries_per_op:g} (was {base['queries_per_op']:g}){marker}"
+        )
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run payout API benchmark scenarios.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--bulk-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--save", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    results: list[Result] = []
+    with benchmark_database():
+        user = get_user_model().objects.create_user(username="bench", password="bench-password")
+        client = APIClient()
+        client.force_authenticate(user)
+        for name in args.scenario or list(SCENARIOS):
+            results.extend(SCENARIOS[name](client, args))
+
+    print(f"{'scenario':<28} {'ops/sec':>12} {'p50 ms':>9} {'p99 ms':>9} {'queries/op':>11}")
+    for result in results:
+        print(
+            f"{result.name:<28} {result.ops_per_sec:>12,.1f} {result.p50_ms:>9.2f} "
+            f"{result.p99_ms:>9.2f} {result.queries_per_op:>11.1f}"
+        )
+
+    if args.save:
+        args.save.write_text(
+            json.dumps({result.name: result.as_dict() for result in results}, indent=2) + "\n"
+        )
+    if args.baseline:
+        if not args.baseline.exists():
+            print(f"\nNo baseline at {args.baseline}; skipping comparison.")
+        elif compare(results, json.loads(args.baseline.read_text()), args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import itertools
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "uvicorn.workers.UvicornWorker")
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "1000"))
+reload = os.getenv("GUNICORN_RELOAD", "").lower() in {"1", "true", "yes", "on"}
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+
+# Every worker keeps its own metrics registry, so /metrics on the main port only shows whichever
+# worker answered. With PAYOUT_METRICS_WEB_PORT set, each worker also serves its registry on
+# port + slot (slots are reused when a worker is replaced), like Celery's PAYOUT_METRICS_WORKER_PORT.
+metrics_port = int(os.getenv("PAYOUT_METRICS_WEB_PORT", "0"))
+
+
+def pre_fork(server, worker):
+    used = {getattr(other, "metrics_slot", None) for other in server.WORKERS.values()}
+    worker.metrics_slot = next(slot for slot in itertools.count() if slot not in used)
+
+
+def post_fork(server, worker):
+    if not metrics_port:
+        return
+    from payouts import metrics
+
+    try:
+        metrics.start_http_server(metrics_port + worker.metrics_slot)
+    except OSError as exc:
+        server.log.warning("Worker %s cannot serve metrics: %s", worker.pid, exc)
@@ -38,6 +38,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "payouts.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -66,6 +67,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"
 
 DATABASES: dict[str, dict[str, str | Path]] = {
     "default": {
@@ -87,6 +89,16 @@ if os.getenv("DB_NAME"):
         },
     }
 
+PAYOUT_READ_REPLICAS: list[str] = []
+if os.getenv("DB_NAME"):
+    for index, host in enumerate(filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")), start=1):
+        alias = f"replica_{index}"
+        DATABASES[alias] = {**DATABASES["default"], "HOST": host.strip(), "TEST": {"MIRROR": "default"}}
+        PAYOUT_READ_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["payouts.routing.ReplicaRouter"]
+PAYOUT_REPLICA_PIN_SECONDS = int(os.getenv("PAYOUT_REPLICA_PIN_SECONDS", "5"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -118,6 +130,7 @@ REST_FRAMEWORK = {
         "rest_framework.renderers.BrowsableAPIRenderer",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
+        "payouts.authentication.ApiTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
         "rest_framework.authentication.BasicAuthentication",
     ],
@@ -137,6 +150,26 @@ CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
 CELERY_TASK_ALWAYS_EAGER = str_to_bool(os.getenv("CELERY_TASK_ALWAYS_EAGER"))
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_TASK_ROUTES = {
+    "payouts.tasks.send_payout_webhook": {"queue": "webhooks"},
+    "payouts.tasks.send_payout_webhooks": {"queue": "webhooks"},
+    "payouts.tasks.flush_batched_webhooks": {"queue": "webhooks"},
+}
+
+CACHE_URL = os.getenv("CACHE_URL")
+if CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
 
 LOGGING = {
     "version": 1,
@@ -160,5 +193,101 @@ LOGGING = {
 }
 
 PAYOUT_PROCESSING_DELAY_SECONDS = int(os.getenv("PAYOUT_PROCESSING_DELAY_SECONDS", "2"))
+PAYOUT_PAGE_SIZE = int(os.getenv("PAYOUT_PAGE_SIZE", "100"))
+PAYOUT_MAX_PAGE_SIZE = int(os.getenv("PAYOUT_MAX_PAGE_SIZE", "1000"))
+PAYOUT_BULK_MAX_ITEMS = int(os.getenv("PAYOUT_BULK_MAX_ITEMS", "10000"))
+PAYOUT_TASK_CHUNK_SIZE = int(os.getenv("PAYOUT_TASK_CHUNK_SIZE", "500"))
+PAYOUT_FINALIZE_CHUNK_SIZE = int(os.getenv("PAYOUT_FINALIZE_CHUNK_SIZE", "500"))
+PAYOUT_FINALIZE_MAX_CHUNKS = int(os.getenv("PAYOUT_FINALIZE_MAX_CHUNKS", "20"))
+PAYOUT_FINALIZE_SWEEP_INTERVAL_SECONDS = float(os.getenv("PAYOUT_FINALIZE_SWEEP_INTERVAL_SECONDS", "1"))
+PAYOUT_EXPORT_CHUNK_SIZE = int(os.getenv("PAYOUT_EXPORT_CHUNK_SIZE", "2000"))
+PAYOUT_ROLLUP_SHARDS = int(os.getenv("PAYOUT_ROLLUP_SHARDS", "8"))
+PAYOUT_IDEMPOTENCY_TTL_SECONDS = int(os.getenv("PAYOUT_IDEMPOTENCY_TTL_SECONDS", "86400"))
+PAYOUT_RISK_RULES = [
+    "payouts.risk.CurrencyLimitRule",
+    "payouts.risk.BlocklistRule",
+    "payouts.risk.VelocityRule",
+]
+PAYOUT_RISK_AMOUNT_LIMIT = os.getenv("PAYOUT_RISK_AMOUNT_LIMIT", "1000000")
+PAYOUT_RISK_CURRENCY_LIMITS = dict(
+    item.strip().split(":", 1)
+    for item in os.getenv("PAYOUT_RISK_CURRENCY_LIMITS", "").split(",")
+    if item.strip()
+)
+PAYOUT_RISK_BLOCKED_ACCOUNTS = [
+    account.strip()
+    for account in os.getenv("PAYOUT_RISK_BLOCKED_ACCOUNTS", "").split(",")
+    if account.strip()
+]
+PAYOUT_RISK_VELOCITY_WINDOW_SECONDS = int(os.getenv("PAYOUT_RISK_VELOCITY_WINDOW_SECONDS", "3600"))
+PAYOUT_RISK_VELOCITY_MAX_COUNT = int(os.getenv("PAYOUT_RISK_VELOCITY_MAX_COUNT", "0")) or None
+PAYOUT_RISK_VELOCITY_MAX_AMOUNT = os.getenv("PAYOUT_RISK_VELOCITY_MAX_AMOUNT") or None
+PAYOUT_RETRIEVE_CACHE_TTL_SECONDS = int(os.getenv("PAYOUT_RETRIEVE_CACHE_TTL_SECONDS", "30"))
+PAYOUT_RETRIEVE_CACHE_TERMINAL_TTL_SECONDS = int(
+    os.getenv("PAYOUT_RETRIEVE_CACHE_TERMINAL_TTL_SECONDS", "86400")
+)
+PAYOUT_AUTH_TOKEN_CACHE_TTL_SECONDS = int(os.getenv("PAYOUT_AUTH_TOKEN_CACHE_TTL_SECONDS", "300"))
+PAYOUT_AUTH_TOKEN_LOCAL_TTL_SECONDS = float(os.getenv("PAYOUT_AUTH_TOKEN_LOCAL_TTL_SECONDS", "10"))
+PAYOUT_AUTH_TOKEN_LRU_SIZE = int(os.getenv("PAYOUT_AUTH_TOKEN_LRU_SIZE", "1024"))
+PAYOUT_THROTTLE_STORE = os.getenv(
+    "PAYOUT_THROTTLE_STORE",
+    "payouts.throttling.RedisTokenBucketStore" if CACHE_URL else "payouts.throttling.LocalTokenBucketStore",
+)
+PAYOUT_THROTTLE_REDIS_URL = os.getenv("PAYOUT_THROTTLE_REDIS_URL", CACHE_URL or CELERY_BROKER_URL)
+PAYOUT_THROTTLE_BREAKER_SECONDS = float(os.getenv("PAYOUT_THROTTLE_BREAKER_SECONDS", "5"))
+PAYOUT_THROTTLE_RATES = {
+    "read": os.getenv("PAYOUT_THROTTLE_READ_RATE") or None,
+    "write": os.getenv("PAYOUT_THROTTLE_WRITE_RATE") or None,
+}
+PAYOUT_ADMISSION_MAX_BACKLOG = int(os.getenv("PAYOUT_ADMISSION_MAX_BACKLOG", "0"))
+PAYOUT_ADMISSION_CHECK_INTERVAL_SECONDS = float(os.getenv("PAYOUT_ADMISSION_CHECK_INTERVAL_SECONDS", "1.0"))
+PAYOUT_ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("PAYOUT_ADMISSION_RETRY_AFTER_SECONDS", "5"))
+PAYOUT_STATUS_BROKER = os.getenv(
+    "PAYOUT_STATUS_BROKER",
+    "payouts.notifications.RedisStatusBroker" if CACHE_URL else "payouts.notifications.LocalStatusBroker",
+)
+PAYOUT_STATUS_PUBSUB_URL = os.getenv("PAYOUT_STATUS_PUBSUB_URL", CACHE_URL or CELERY_BROKER_URL)
+PAYOUT_STATUS_WAIT_SECONDS = int(os.getenv("PAYOUT_STATUS_WAIT_SECONDS", "30"))
+PAYOUT_VELOCITY_STORE = os.getenv("PAYOUT_VELOCITY_STORE", "payouts.velocity.CacheVelocityStore")
+PAYOUT_VELOCITY_WINDOW_SECONDS = int(os.getenv("PAYOUT_VELOCITY_WINDOW_SECONDS", "3600"))
+PAYOUT_VELOCITY_BUCKET_SECONDS = int(os.getenv("PAYOUT_VELOCITY_BUCKET_SECONDS", "60"))
+PAYOUT_VELOCITY_MAX_COUNT = int(os.getenv("PAYOUT_VELOCITY_MAX_COUNT", "0")) or None
+PAYOUT_VELOCITY_MAX_AMOUNT = os.getenv("PAYOUT_VELOCITY_MAX_AMOUNT") or None
+PAYOUT_ARCHIVE_AFTER_DAYS = int(os.getenv("PAYOUT_ARCHIVE_AFTER_DAYS", "90"))
+PAYOUT_ARCHIVE_CHUNK_SIZE = int(os.getenv("PAYOUT_ARCHIVE_CHUNK_SIZE", "1000"))
+PAYOUT_OUTBOX_BATCH_SIZE = int(os.getenv("PAYOUT_OUTBOX_BATCH_SIZE", "1000"))
+PAYOUT_OUTBOX_MAX_BATCHES = int(os.getenv("PAYOUT_OUTBOX_MAX_BATCHES", "50"))
+PAYOUT_OUTBOX_RELAY_INTERVAL_SECONDS = float(os.getenv("PAYOUT_OUTBOX_RELAY_INTERVAL_SECONDS", "1"))
+PAYOUT_METRICS_WORKER_PORT = int(os.getenv("PAYOUT_METRICS_WORKER_PORT", "0"))
+PAYOUT_METRICS_ALLOWED_IPS = [
+    address.strip() for address in os.getenv("PAYOUT_METRICS_ALLOWED_IPS", "").split(",") if address.strip()
+]
 WEBHOOK_TIMEOUT_SECONDS = int(os.getenv("WEBHOOK_TIMEOUT_SECONDS", "5"))
+WEBHOOK_MAX_CONCURRENCY = int(os.getenv("WEBHOOK_MAX_CONCURRENCY", "50"))
+WEBHOOK_MAX_CONNECTIONS_PER_HOST = int(os.getenv("WEBHOOK_MAX_CONNECTIONS_PER_HOST", "4"))
+WEBHOOK_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "3"))
+WEBHOOK_RETRY_BACKOFF_SECONDS = float(os.getenv("WEBHOOK_RETRY_BACKOFF_SECONDS", "0.5"))
+WEBHOOK_BATCH_SIZE = int(os.getenv("WEBHOOK_BATCH_SIZE", "200"))
+WEBHOOK_BATCH_WINDOW_SECONDS = float(os.getenv("WEBHOOK_BATCH_WINDOW_SECONDS", "5"))
+WEBHOOK_BATCH_FLUSH_LIMIT = int(os.getenv("WEBHOOK_BATCH_FLUSH_LIMIT", "5000"))
+WEBHOOK_BATCH_CLAIM_SECONDS = float(os.getenv("WEBHOOK_BATCH_CLAIM_SECONDS", "120"))
+
+CELERY_BEAT_SCHEDULE = {
+    "relay-payout-outbox": {
+        "task": "payouts.tasks.relay_payout_outbox",
+        "schedule": PAYOUT_OUTBOX_RELAY_INTERVAL_SECONDS,
+        "options": {"expires": PAYOUT_OUTBOX_RELAY_INTERVAL_SECONDS * 10},
+    },
+    "finalize-due-payouts": {
+        "task": "payouts.tasks.finalize_due_payouts",
+        "schedule": PAYOUT_FINALIZE_SWEEP_INTERVAL_SECONDS,
+        "options": {"expires": PAYOUT_FINALIZE_SWEEP_INTERVAL_SECONDS * 10},
+    },
+    "flush-batched-webhooks": {
+        "task": "payouts.tasks.flush_batched_webhooks",
+        "schedule": WEBHOOK_BATCH_WINDOW_SECONDS,
+        "options": {"expires": WEBHOOK_BATCH_WINDOW_SECONDS * 10},
+    },
+}
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
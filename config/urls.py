@@ -3,6 +3,8 @@ from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework.routers import DefaultRouter
 
+from payouts import async_views
+from payouts.metrics import metrics_view
 from payouts.views import PayoutViewSet
 
 router = DefaultRouter()
@@ -17,4 +19,13 @@ urlpatterns = [
         name="docs",
     ),
     path("api/", include(router.urls)),
+    path("api/async/payouts/", async_views.payout_list, name="async-payout-list"),
+    path("api/async/payouts/<uuid:pk>/", async_views.payout_detail, name="async-payout-detail"),
+    path("api/async/payouts/<uuid:pk>/status/", async_views.payout_status, name="async-payout-status"),
+    path(
+        "api/async/payouts/<uuid:pk>/status/wait/",
+        async_views.payout_status_wait,
+        name="async-payout-status-wait",
+    ),
+    path("metrics", metrics_view, name="metrics"),
 ]
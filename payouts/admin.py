@@ -1,6 +1,9 @@
 from django.contrib import admin
+from rest_framework.filters import search_smart_split
 
-from payouts.models import Payout
+from payouts import routing
+from payouts.filters import search_payouts
+from payouts.models import ApiToken, Payout
 
 
 @admin.register(Payout)
@@ -15,4 +18,32 @@ class PayoutAdmin(admin.ModelAdmin):
     )
     search_fields = ("recipient_name", "recipient_account", "status")
     list_filter = ("status", "currency", "created_at")
-    ordering = ("-created_at",)
+    ordering = ("-created_at", "-id")
+
+    def get_search_results(self, request, queryset, search_term):
+        return search_payouts(queryset, search_smart_split(search_term)), False
+
+    @routing.replica_reads
+    def changelist_view(self, request, extra_context=None):
+        return super().changelist_view(request, extra_context)
+
+    @routing.replica_reads
+    def change_view(self, request, object_id, form_url="", extra_context=None):
+        return super().change_view(request, object_id, form_url, extra_context)
+
+
+@admin.register(ApiToken)
+class ApiTokenAdmin(admin.ModelAdmin):
+    list_display = ("prefix", "name", "user", "created_at", "revoked_at")
+    list_filter = ("revoked_at",)
+    search_fields = ("prefix", "name", "user__username")
+    readonly_fields = ("prefix", "created_at", "revoked_at")
+    actions = ["revoke"]
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    @admin.action(description="Revoke selected tokens")
+    def revoke(self, request, queryset) -> None:
+        for token in queryset.filter(revoked_at__isnull=True):
+            token.revoke()
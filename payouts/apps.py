@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class PayoutsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'payouts'
+
+    def ready(self) -> None:
+        from payouts import (  # noqa: F401
+            authentication,
+            events,
+            instrumentation,
+            notifications,
+            response_cache,
+            rollups,
+        )
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from payouts.models import TERMINAL_STATUSES, ArchivedPayout, Payout
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FIELDS = tuple(field.attname for field in Payout._meta.concrete_fields)
+
+
+def archive_batch(cutoff, chunk_size: int) -> int:
+    with transaction.atomic():
+        rows = list(
+            Payout.objects.select_for_update(skip_locked=True)
+            .filter(status__in=TERMINAL_STATUSES, created_at__lt=cutoff)
+            .order_by("created_at", "id")
+            .values(*ARCHIVE_FIELDS)[:chunk_size]
+        )
+        if not rows:
+            return 0
+        now = timezone.now()
+        ArchivedPayout.objects.bulk_create([ArchivedPayout(**row, archived_at=now) for row in rows])
+        Payout.objects.filter(id__in=[row["id"] for row in rows]).delete()
+    return len(rows)
+
+
+def archive(
+    older_than: timedelta | None = None,
+    chunk_size: int | None = None,
+    max_chunks: int | None = None,
+) -> int:
+    if older_than is None:
+        older_than = timedelta(days=settings.PAYOUT_ARCHIVE_AFTER_DAYS)
+    chunk_size = max(chunk_size or settings.PAYOUT_ARCHIVE_CHUNK_SIZE, 1)
+    cutoff = timezone.now() - older_than
+    archived = 0
+    chunks = 0
+    while max_chunks is None or chunks < max_chunks:
+        count = archive_batch(cutoff, chunk_size)
+        archived += count
+        chunks += 1
+        if count < chunk_size:
+            break
+    if archived:
+        logger.info("Archived %s terminal payouts created before %s.", archived, cutoff.isoformat())
+    return archived
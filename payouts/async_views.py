@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from functools import wraps
+from typing import Any
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed, JsonResponse
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from payouts import notifications, routing
+from payouts.models import TERMINAL_STATUSES, ArchivedPayout, Payout
+from payouts.pagination import KeysetPagination
+from payouts.renderers import PayoutJSONEncoder
+from payouts.serializers import PAYOUT_READ_FIELDS
+from payouts.throttling import PayoutRateThrottle
+from payouts.views import PayoutViewSet
+
+STATUS_FIELDS = ("id", "status", "updated_at")
+
+AsyncView = Callable[..., Awaitable[HttpResponse]]
+
+
+def json_response(data: Any, status: int = 200) -> JsonResponse:
+    return JsonResponse(
+        data,
+        status=status,
+        encoder=PayoutJSONEncoder,
+        safe=False,
+        json_dumps_params={"separators": (",", ":"), "ensure_ascii": False},
+    )
+
+
+def error_response(request: Request, exc: exceptions.APIException) -> JsonResponse:
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+    response = json_response(data, exc.status_code)
+    if getattr(exc, "wait", None):
+        response["Retry-After"] = str(exc.wait)
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        header = request.authenticators[0].authenticate_header(request) if request.authenticators else None
+        if header:
+            response["WWW-Authenticate"] = header
+        else:
+            response.status_code = 403
+    return response
+
+
+def async_read_view(view: AsyncView) -> AsyncView:
+    @wraps(view)
+    async def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        if request.method not in ("GET", "HEAD"):
+            return HttpResponseNotAllowed(["GET", "HEAD"])
+        api_request = Request(
+            request,
+            authenticators=[authenticator() for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES],
+        )
+        with routing.route_request(request):
+            try:
+                user = await sync_to_async(lambda: api_request.user)()
+                if not user.is_authenticated:
+                    raise exceptions.NotAuthenticated()
+                throttle = PayoutRateThrottle()
+                if not await sync_to_async(throttle.allow_request)(api_request, None):
+                    raise exceptions.Throttled(throttle.wait())
+                return await view(api_request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                return error_response(api_request, exc)
+
+    return wrapper
+
+
+async def read_payout(pk: UUID, fields: Sequence[str], using: str | None = None) -> dict:
+    for model in (Payout, ArchivedPayout):
+        queryset = model.objects.using(using) if using else model.objects
+        try:
+            return await queryset.values(*fields).aget(pk=pk)
+        except model.DoesNotExist:
+            continue
+    raise exceptions.NotFound()
+
+
+@async_read_view
+async def payout_list(request: Request) -> HttpResponse:
+    view = PayoutViewSet(request=request, args=(), kwargs={}, format_kwarg=None, action="list")
+    queryset = view.filter_queryset(view.get_queryset()).values(*PAYOUT_READ_FIELDS)
+    paginator = KeysetPagination()
+    rows = await paginator.apaginate_queryset(queryset, request)
+    return json_response({"next": paginator.next_link, "previous": paginator.previous_link, "results": rows})
+
+
+@async_read_view
+async def payout_detail(request: Request, pk: UUID) -> HttpResponse:
+    return json_response(await read_payout(pk, PAYOUT_READ_FIELDS))
+
+
+@async_read_view
+async def payout_status(request: Request, pk: UUID) -> HttpResponse:
+    return json_response(await read_payout(pk, STATUS_FIELDS))
+
+
+def wait_timeout(request: Request) -> float:
+    limit = settings.PAYOUT_STATUS_WAIT_SECONDS
+    value = request.query_params.get("timeout")
+    if value is None:
+        return limit
+    try:
+        timeout = float(value)
+    except ValueError:
+        raise exceptions.ValidationError({"timeout": "Expected a number of seconds."})
+    return min(max(timeout, 0.0), limit)
+
+
+@async_read_view
+async def payout_status_wait(request: Request, pk: UUID) -> HttpResponse:
+    timeout = wait_timeout(request)
+    async with notifications.get_broker().subscribe(pk) as subscription:
+        row = await read_payout(pk, STATUS_FIELDS)
+        seen = request.query_params.get("status", row["status"])
+        if row["status"] != seen or row["status"] in TERMINAL_STATUSES:
+            return json_response(row)
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            status = await subscription.wait(remaining)
+            if status is None:
+                break
+            if status != seen:
+                # Replicas may lag behind the notification, so confirm on the primary.
+                return json_response(await read_payout(pk, STATUS_FIELDS, using=DEFAULT_DB_ALIAS))
+    return json_response(await read_payout(pk, STATUS_FIELDS))
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from payouts import metrics
+from payouts.models import ApiToken, hash_token
+
+_principals: PrincipalCache | None = None
+_principals_lock = threading.Lock()
+
+
+class PrincipalCache:
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max(max_size, 1)
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls) -> PrincipalCache:
+        return cls(settings.PAYOUT_AUTH_TOKEN_LRU_SIZE, settings.PAYOUT_AUTH_TOKEN_LOCAL_TTL_SECONDS)
+
+    def get(self, key: str) -> Any | None:
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def discard(self, keys: Iterable[str]) -> None:
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
+
+
+def get_principals() -> PrincipalCache:
+    global _principals
+    if _principals is None:
+        with _principals_lock:
+            if _principals is None:
+                _principals = PrincipalCache.from_settings()
+    return _principals
+
+
+def _principal_stats() -> dict[str, int]:
+    principals = _principals
+    return principals.stats() if principals is not None else {}
+
+
+metrics.REGISTRY.register_collector(
+    metrics.stats_collector(
+        "payout_auth_principal_cache",
+        "API token principal cache statistics",
+        _principal_stats,
+    )
+)
+
+
+class Principal(NamedTuple):
+    user_id: Any
+    is_active: bool
+
+    def user(self):
+        # Only the id and the active flag are cached (never the password hash or other
+        # credentials); every request gets a fresh instance whose other fields load on access.
+        User = get_user_model()
+        return User.from_db(None, [User._meta.pk.attname, "is_active"], [self.user_id, self.is_active])
+
+
+def _cache_key(key_hash: str) -> str:
+    return f"payouts:auth-principal:{key_hash}"
+
+
+def resolve(key_hash: str) -> Principal | None:
+    principals = get_principals()
+    principal = principals.get(key_hash)
+    if principal is not None:
+        return principal
+    principal = cache.get(_cache_key(key_hash))
+    if principal is None:
+        row = (
+            ApiToken.objects.filter(key_hash=key_hash, revoked_at__isnull=True)
+            .values_list("user_id", "user__is_active")
+            .first()
+        )
+        if row is None:
+            return None
+        principal = Principal(*row)
+        cache.set(_cache_key(key_hash), tuple(principal), settings.PAYOUT_AUTH_TOKEN_CACHE_TTL_SECONDS)
+    else:
+        principal = Principal(*principal)
+    principals.set(key_hash, principal)
+    return principal
+
+
+def invalidate(key_hashes: Iterable[str]) -> None:
+    key_hashes = list(key_hashes)
+    if not key_hashes:
+        return
+    get_principals().discard(key_hashes)
+
+    def clear() -> None:
+        cache.delete_many([_cache_key(key_hash) for key_hash in key_hashes])
+        get_principals().discard(key_hashes)
+
+    transaction.on_commit(clear)
+
+
+class ApiTokenAuthentication(BaseAuthentication):
+    keyword = "Token"
+
+    def authenticate(self, request):
+        parts = get_authorization_header(request).split()
+        if not parts or parts[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(parts) != 2:
+            raise exceptions.AuthenticationFailed("Invalid token header.")
+        try:
+            key = parts[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed("Invalid token header.")
+
+        key_hash = hash_token(key)
+        principal = resolve(key_hash)
+        if principal is None:
+            raise exceptions.AuthenticationFailed("Invalid token.")
+        if not principal.is_active:
+            raise exceptions.AuthenticationFailed("User inactive or deleted.")
+        return principal.user(), key_hash
+
+    def authenticate_header(self, request) -> str:
+        return self.keyword
+
+
+@receiver(post_save, sender=ApiToken, dispatch_uid="payouts.authentication.token_saved")
+@receiver(post_delete, sender=ApiToken, dispatch_uid="payouts.authentication.token_deleted")
+def invalidate_token(sender, instance: ApiToken, **kwargs) -> None:
+    invalidate([instance.key_hash])
+
+
+@receiver(post_save, sender=get_user_model(), dispatch_uid="payouts.authentication.user_saved")
+def invalidate_user_tokens(sender, instance, created: bool = False, **kwargs) -> None:
+    if not created:
+        invalidate(ApiToken.objects.filter(user=instance).values_list("key_hash", flat=True))
+
+
+@receiver(setting_changed, dispatch_uid="payouts.authentication.reset_principals")
+def reset_principals(setting: str, **kwargs) -> None:
+    global _principals
+    if setting.startswith("PAYOUT_AUTH_TOKEN_"):
+        _principals = None
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from django.dispatch import receiver
+from django.utils import timezone
+
+from payouts.models import PayoutEvent
+from payouts.signals import PayoutChange, payouts_changed
+
+EVENT_FIELDS = ("id", "payout_id", "from_status", "to_status", "currency", "amount", "created_at")
+
+
+def build_events(changes: Iterable[PayoutChange]) -> list[PayoutEvent]:
+    now = timezone.now()
+    events = []
+    for change in changes:
+        state = change.after or change.before
+        events.append(
+            PayoutEvent(
+                payout_id=change.payout_id,
+                from_status=change.before.status if change.before else "",
+                to_status=change.after.status if change.after else "",
+                currency=state.currency,
+                amount=state.amount,
+                created_at=now,
+            )
+        )
+    return events
+
+
+@receiver(payouts_changed, dispatch_uid="payouts.events.record_events")
+def record_events(sender, changes: list[PayoutChange], **kwargs) -> None:
+    PayoutEvent.objects.bulk_create(build_events(changes))
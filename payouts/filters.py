@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from datetime import datetime, time
+
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+from payouts.models import CurrencyChoices, PayoutStatus
+
+ACCOUNT_PREFIX_RE = re.compile(r"^[A-Z0-9\-]+$")
+
+
+def search_term_condition(term: str, vendor: str) -> Q:
+    account = term.replace(" ", "").upper()
+    if vendor == "postgresql":
+        # icontains compiles to UPPER(recipient_name::text) LIKE UPPER(...), which is served by the
+        # payout_recipient_name_upper_trgm_idx expression index (migration 0013).
+        condition = Q(recipient_name__icontains=term)
+    else:
+        # Without pg_trgm there is no index for substring matches: narrow to a prefix search.
+        condition = Q(recipient_name__istartswith=term)
+    if ACCOUNT_PREFIX_RE.match(account):
+        condition |= Q(recipient_account__startswith=account)
+    if term.upper() in CurrencyChoices.values:
+        condition |= Q(currency=term.upper())
+    if term.lower() in PayoutStatus.values:
+        condition |= Q(status=term.lower())
+    return condition
+
+
+def search_payouts(queryset: QuerySet, terms: Iterable[str]) -> QuerySet:
+    vendor = connections[queryset.db].vendor
+    for term in terms:
+        queryset = queryset.filter(search_term_condition(term, vendor))
+    return queryset
+
+
+class PayoutSearchFilter(filters.SearchFilter):
+    def filter_queryset(self, request, queryset: QuerySet, view) -> QuerySet:
+        return search_payouts(queryset, self.get_search_terms(request))
+
+
+class PayoutAttributeFilter(filters.BaseFilterBackend):
+    def filter_queryset(self, request, queryset: QuerySet, view) -> QuerySet:
+        params = request.query_params
+        errors: dict[str, str] = {}
+
+        statuses = [item.lower() for item in params.get("status", "").split(",") if item]
+        if statuses:
+            if set(statuses) - set(PayoutStatus.values):
+                errors["status"] = "Unsupported status."
+            queryset = queryset.filter(status__in=statuses)
+
+        currencies = [item.upper() for item in params.get("currency", "").split(",") if item]
+        if currencies:
+            if set(currencies) - set(CurrencyChoices.values):
+                errors["currency"] = "Unsupported currency."
+            queryset = queryset.filter(currency__in=currencies)
+
+        for param, lookup in [("created_after", "created_at__gte"), ("created_before", "created_at__lt")]:
+            if param not in params:
+                continue
+            value = self.parse_moment(params[param])
+            if value is None:
+                errors[param] = "Expected an ISO 8601 date or datetime."
+            else:
+                queryset = queryset.filter(**{lookup: value})
+
+        if errors:
+            raise ValidationError(errors)
+        return queryset
+
+    @staticmethod
+    def parse_moment(value: str) -> datetime | None:
+        try:
+            moment = parse_datetime(value)
+            if moment is None:
+                day = parse_date(value)
+                if day is None:
+                    return None
+                moment = datetime.combine(day, time.min)
+        except ValueError:
+            return None
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment
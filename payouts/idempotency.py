@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+from payouts.models import Payout
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 100
+
+
+def scoped_key(user_id: Any, key: str) -> str:
+    return f"{user_id}:{key}"
+
+
+def _cache_key(scoped: str) -> str:
+    digest = hashlib.sha256(scoped.encode("utf-8")).hexdigest()
+    return f"payouts:idempotency:{digest}"
+
+
+def cached_response(scoped: str) -> dict | None:
+    return cache.get(_cache_key(scoped))
+
+
+def stored_response(scoped: str, fields: tuple[str, ...]) -> dict | None:
+    row = Payout.objects.filter(idempotency_key=scoped).values(*fields).first()
+    if row is not None:
+        remember(scoped, row)
+    return row
+
+
+def remember(scoped: str, data: dict) -> None:
+    cache.set(_cache_key(scoped), data, settings.PAYOUT_IDEMPOTENCY_TTL_SECONDS)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import time
+from collections import Counter
+
+from billiard.process import current_process
+from celery.signals import (
+    before_task_publish,
+    task_failure,
+    task_postrun,
+    task_prerun,
+    worker_process_init,
+)
+from django.conf import settings
+from django.dispatch import receiver
+
+from payouts import metrics
+from payouts.signals import PayoutChange, payouts_changed
+
+PUBLISHED_AT_HEADER = "published_at"
+
+
+@before_task_publish.connect(dispatch_uid="payouts.instrumentation.stamp_published_at")
+def stamp_published_at(headers: dict | None = None, **kwargs) -> None:
+    if headers is not None:
+        headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+
+
+@task_prerun.connect(dispatch_uid="payouts.instrumentation.task_started")
+def task_started(task=None, **kwargs) -> None:
+    request = task.request
+    published_at = getattr(request, PUBLISHED_AT_HEADER, None)
+    if published_at:
+        metrics.TASK_QUEUE_WAIT.observe(max(time.time() - float(published_at), 0), task.name)
+    request.metrics_query_token, request.metrics_query_count = metrics.begin_query_count()
+    request.metrics_started = time.perf_counter()
+
+
+@task_postrun.connect(dispatch_uid="payouts.instrumentation.task_finished")
+def task_finished(task=None, state: str | None = None, **kwargs) -> None:
+    request = task.request
+    started = getattr(request, "metrics_started", None)
+    if started is None:
+        return
+    metrics.TASK_DURATION.observe(time.perf_counter() - started, task.name, state or "UNKNOWN")
+    metrics.end_query_count(request.metrics_query_token)
+    metrics.TASK_QUERIES.observe(request.metrics_query_count[0], task.name)
+    request.metrics_started = None
+
+
+@task_failure.connect(dispatch_uid="payouts.instrumentation.task_failed")
+def task_failed(sender=None, **kwargs) -> None:
+    metrics.TASK_FAILURES.inc(sender.name)
+
+
+@worker_process_init.connect(dispatch_uid="payouts.instrumentation.serve_worker_metrics")
+def serve_worker_metrics(**kwargs) -> None:
+    port = settings.PAYOUT_METRICS_WORKER_PORT
+    if port:
+        metrics.start_http_server(port + (current_process().index or 0))
+
+
+@receiver(payouts_changed, dispatch_uid="payouts.instrumentation.count_transitions")
+def count_transitions(sender, changes: list[PayoutChange], **kwargs) -> None:
+    transitions = Counter(
+        (
+            change.before.status if change.before else "created",
+            change.after.status if change.after else "deleted",
+        )
+        for change in changes
+        if change.status_changed
+    )
+    for (source, target), count in transitions.items():
+        metrics.STATUS_TRANSITIONS.inc(source, target, amount=count)
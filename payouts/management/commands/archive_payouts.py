@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from payouts import archive
+
+
+class Command(BaseCommand):
+    help = "Move completed, failed and cancelled payouts older than a threshold into the archive table."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--older-than-days", type=int, default=settings.PAYOUT_ARCHIVE_AFTER_DAYS)
+        parser.add_argument("--chunk-size", type=int, default=settings.PAYOUT_ARCHIVE_CHUNK_SIZE)
+        parser.add_argument("--max-chunks", type=int, default=None)
+
+    def handle(self, *args, **options) -> None:
+        archived = archive.archive(
+            older_than=timedelta(days=options["older_than_days"]),
+            chunk_size=options["chunk_size"],
+            max_chunks=options["max_chunks"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} payouts."))
@@ -0,0 +1,21 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from payouts.models import ApiToken
+
+
+class Command(BaseCommand):
+    help = "Issue an API token for a user. The token is printed once and only its hash is stored."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("username")
+        parser.add_argument("--name", default="")
+
+    def handle(self, *args, **options) -> None:
+        user_model = get_user_model()
+        try:
+            user = user_model.objects.get(**{user_model.USERNAME_FIELD: options["username"]})
+        except user_model.DoesNotExist:
+            raise CommandError(f"User {options['username']!r} does not exist.")
+        _, key = ApiToken.issue(user, name=options["name"])
+        self.stdout.write(key)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from payouts import rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute payout status/currency rollups from the payouts table."
+
+    def handle(self, *args, **options) -> None:
+        buckets = rollups.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {buckets} payout rollup buckets."))
@@ -0,0 +1,35 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+import payouts.tasks  # noqa: F401  registers the tasks outbox messages are relayed to
+from payouts import outbox
+
+
+class Command(BaseCommand):
+    help = "Publish pending payout outbox messages to the Celery broker."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--batch-size", type=int, default=settings.PAYOUT_OUTBOX_BATCH_SIZE)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep relaying, sleeping --interval seconds whenever the outbox is drained.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.PAYOUT_OUTBOX_RELAY_INTERVAL_SECONDS,
+        )
+
+    def handle(self, *args, **options) -> None:
+        batch_size = max(options["batch_size"], 1)
+        if not options["loop"]:
+            relayed = outbox.relay(batch_size=batch_size)
+            self.stdout.write(self.style.SUCCESS(f"Relayed {relayed} outbox messages."))
+            return
+
+        while True:
+            if outbox.relay_batch(batch_size) < batch_size:
+                time.sleep(options["interval"])
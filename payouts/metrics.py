@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUEUE_WAIT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+MAX_WEBHOOK_HOST_LABELS = 100
+
+_query_counters: ContextVar[tuple[list[int], ...]] = ContextVar("payout_metrics_query_counters", default=())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class LabelLimiter:
+    # Caps the distinct values of a client-controlled label: the first ``limit`` values are kept
+    # and everything after them is reported under ``overflow``.
+    def __init__(self, limit: int, overflow: str = "other") -> None:
+        self.limit = limit
+        self.overflow = overflow
+        self.values: set[str] = set()
+        self.lock = threading.Lock()
+
+    def __call__(self, value: str) -> str:
+        if value in self.values:
+            return value
+        with self.lock:
+            if len(self.values) < self.limit:
+                self.values.add(value)
+                return value
+        return self.overflow
+
+
+def method_label(method: str | None) -> str:
+    return method if method in HTTP_METHODS else "OTHER"
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self.values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        with self.lock:
+            items = sorted(self.values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in items
+        ]
+
+    def reset(self) -> None:
+        with self.lock:
+            self.values.clear()
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                # Bucket counts followed by the observation count and sum.
+                series = self.series[labels] = [0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def count(self, *labels: str) -> int:
+        series = self.series.get(labels)
+        return int(series[-2]) if series else 0
+
+    def render(self) -> list[str]:
+        with self.lock:
+            items = sorted((labels, list(series)) for labels, series in self.series.items())
+        lines = self.header()
+        for labels, series in items:
+            cumulative = 0
+            for bound, observed in zip(self.buckets, series):
+                cumulative += observed
+                bucket = _format_labels(self.labelnames, labels, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{bucket} {cumulative}")
+            bucket = _format_labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{bucket} {int(series[-2])}")
+            suffix = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_count{suffix} {int(series[-2])}")
+            lines.append(f"{self.name}_sum{suffix} {_format_value(series[-1])}")
+        return lines
+
+    def reset(self) -> None:
+        with self.lock:
+            self.series.clear()
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.metrics: list[Metric] = []
+        self.collectors: list[Callable[[], list[str]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], list[str]]) -> Callable[[], list[str]]:
+        self.collectors.append(collector)
+        return collector
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        for metric in self.metrics:
+            metric.reset()
+
+
+def stats_collector(
+    prefix: str,
+    documentation: str,
+    stats: Callable[[], dict[str, int]],
+) -> Callable[[], list[str]]:
+    # Exposes a component's stats() snapshot as one gauge per key, read at scrape time.
+    def collect() -> list[str]:
+        lines: list[str] = []
+        for key, value in sorted(stats().items()):
+            name = f"{prefix}_{key}"
+            lines += [f"# HELP {name} {documentation} ({key}).", f"# TYPE {name} gauge"]
+            lines.append(f"{name} {_format_value(value)}")
+        return lines
+
+    return collect
+
+
+REGISTRY = Registry()
+
+REQUEST_DURATION = REGISTRY.register(
+    Histogram("payout_http_request_duration_seconds", "HTTP request latency.", ["view", "method", "status"])
+)
+REQUEST_QUERIES = REGISTRY.register(
+    Histogram(
+        "payout_http_request_db_queries",
+        "Database queries per HTTP request.",
+        ["view", "method"],
+        QUERY_COUNT_BUCKETS,
+    )
+)
+STAGE_DURATION = REGISTRY.register(
+    Histogram("payout_stage_duration_seconds", "Latency of payout API stages.", ["stage"])
+)
+TASK_QUEUE_WAIT = REGISTRY.register(
+    Histogram(
+        "payout_celery_queue_wait_seconds",
+        "Time between task publish and start.",
+        ["task"],
+        QUEUE_WAIT_BUCKETS,
+    )
+)
+TASK_DURATION = REGISTRY.register(
+    Histogram("payout_celery_task_duration_seconds", "Celery task runtime.", ["task", "state"])
+)
+TASK_QUERIES = REGISTRY.register(
+    Histogram(
+        "payout_celery_task_db_queries",
+        "Database queries per Celery task.",
+        ["task"],
+        QUERY_COUNT_BUCKETS,
+    )
+)
+TASK_FAILURES = REGISTRY.register(
+    Counter("payout_celery_task_failures_total", "Celery task failures.", ["task"])
+)
+WEBHOOK_DURATION = REGISTRY.register(
+    Histogram("payout_webhook_duration_seconds", "Webhook HTTP attempt latency.", ["host", "outcome"])
+)
+WEBHOOK_HOST_LABEL = LabelLimiter(MAX_WEBHOOK_HOST_LABELS)
+STATUS_TRANSITIONS = REGISTRY.register(
+    Counter("payout_status_transitions_total", "Payout status transitions.", ["source", "target"])
+)
+REQUESTS_REJECTED = REGISTRY.register(
+    Counter(
+        "payout_http_rejected_total",
+        "Requests rejected by rate limiting or admission control.",
+        ["reason"],
+    )
+)
+
+
+def _count_query(execute, sql, params, many, context):
+    for counter in _query_counters.get():
+        counter[0] += 1
+    return execute(sql, params, many, context)
+
+
+def install_query_counter() -> None:
+    for connection in connections.all():
+        if _count_query not in connection.execute_wrappers:
+            connection.execute_wrappers.insert(0, _count_query)
+
+
+@receiver(connection_created, dispatch_uid="payouts.metrics.count_new_connections")
+def count_new_connections(sender, connection, **kwargs) -> None:
+    # Async views query from sync_to_async threads whose connections the request never touched.
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _count_query)
+
+
+def begin_query_count() -> tuple[Token, list[int]]:
+    install_query_counter()
+    counter = [0]
+    return _query_counters.set((*_query_counters.get(), counter)), counter
+
+
+def end_query_count(token: Token) -> None:
+    _query_counters.reset(token)
+
+
+@contextmanager
+def count_queries() -> Iterator[list[int]]:
+    token, counter = begin_query_count()
+    try:
+        yield counter
+    finally:
+        end_query_count(token)
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    # The API port is public: only staff sessions and allowlisted scrapers may read the registry.
+    # Prometheus should preferably scrape the per-worker metrics ports instead.
+    user = getattr(request, "user", None)
+    allowed = request.META.get("REMOTE_ADDR") in settings.PAYOUT_METRICS_ALLOWED_IPS or (
+        user is not None and user.is_active and user.is_staff
+    )
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def start_http_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="payout-metrics", daemon=True).start()
+    return server
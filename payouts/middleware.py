@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import HttpRequest, HttpResponse
+
+from payouts import metrics
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with metrics.count_queries() as queries:
+            response = self.get_response(request)
+        return self.observe(request, response, time.perf_counter() - started, queries[0])
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        started = time.perf_counter()
+        with metrics.count_queries() as queries:
+            response = await self.get_response(request)
+        return self.observe(request, response, time.perf_counter() - started, queries[0])
+
+    def observe(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        elapsed: float,
+        queries: int,
+    ) -> HttpResponse:
+        match = request.resolver_match
+        view = match.view_name if match else "unmatched"
+        method = metrics.method_label(request.method)
+        metrics.REQUEST_DURATION.observe(elapsed, view, method, str(response.status_code))
+        metrics.REQUEST_QUERIES.observe(queries, view, method)
+        return response
@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0002_payout_callback_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payout',
+            name='webhook_attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='payout',
+            name='webhook_batching',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='payout',
+            name='webhook_delivered_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='payout',
+            name='webhook_delivered_status',
+            field=models.CharField(blank=True, choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], max_length=16),
+        ),
+        migrations.AddField(
+            model_name='payout',
+            name='webhook_pending_since',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='payout',
+            index=models.Index(condition=models.Q(('webhook_pending_since__isnull', False)), fields=['webhook_pending_since'], name='payout_webhook_pending_idx'),
+        ),
+    ]
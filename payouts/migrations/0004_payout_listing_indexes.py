@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0003_payout_webhook_batching'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='payout',
+            options={'ordering': ['-created_at', '-id']},
+        ),
+        migrations.AddIndex(
+            model_name='payout',
+            index=models.Index(fields=['created_at', 'id'], name='payout_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payout',
+            index=models.Index(fields=['amount', 'created_at', 'id'], name='payout_amount_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payout',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='payout_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0005_payout_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayoutRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(choices=[('USD', 'US Dollar'), ('EUR', 'Euro'), ('RUB', 'Russian Ruble'), ('GBP', 'British Pound')], max_length=3)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], max_length=16)),
+                ('shard', models.PositiveSmallIntegerField(default=0)),
+                ('payout_count', models.BigIntegerField(default=0)),
+                ('amount_total', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=20)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='payoutrollup',
+            constraint=models.UniqueConstraint(fields=('currency', 'status', 'shard'), name='payout_rollup_unique_bucket'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0006_payoutrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payout',
+            name='idempotency_key',
+            field=models.CharField(blank=True, editable=False, max_length=128, null=True, unique=True),
+        ),
+    ]
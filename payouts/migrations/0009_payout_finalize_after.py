@@ -0,0 +1,29 @@
+from django.db import migrations, models
+from django.db.models import F
+
+
+def schedule_in_flight_payouts(apps, schema_editor):
+    Payout = apps.get_model('payouts', 'Payout')
+    Payout.objects.filter(status='processing', finalize_after__isnull=True).update(
+        finalize_after=F('updated_at')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0008_outboxmessage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payout',
+            name='finalize_after',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='payout',
+            index=models.Index(condition=models.Q(('finalize_after__isnull', False)), fields=['finalize_after'], name='payout_finalize_after_idx'),
+        ),
+        migrations.RunPython(schedule_in_flight_payouts, migrations.RunPython.noop),
+    ]
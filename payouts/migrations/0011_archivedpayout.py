@@ -0,0 +1,42 @@
+from decimal import Decimal
+import django.core.validators
+from django.db import migrations, models
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0010_payoutevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPayout',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12, validators=[django.core.validators.MinValueValidator(Decimal('0.01'))])),
+                ('currency', models.CharField(choices=[('USD', 'US Dollar'), ('EUR', 'Euro'), ('RUB', 'Russian Ruble'), ('GBP', 'British Pound')], default='USD', max_length=3)),
+                ('recipient_name', models.CharField(max_length=128)),
+                ('recipient_account', models.CharField(max_length=64, validators=[django.core.validators.RegexValidator(message='Recipient account may only contain uppercase letters, digits, and dashes.', regex='^[A-Z0-9\\-]+$')])),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], default='pending', max_length=16)),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('callback_url', models.URLField(blank=True, max_length=255)),
+                ('webhook_batching', models.BooleanField(default=False)),
+                ('webhook_pending_since', models.DateTimeField(blank=True, null=True)),
+                ('webhook_delivered_status', models.CharField(blank=True, choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], max_length=16)),
+                ('webhook_delivered_at', models.DateTimeField(blank=True, null=True)),
+                ('webhook_attempts', models.PositiveSmallIntegerField(default=0)),
+                ('finalize_after', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('idempotency_key', models.CharField(blank=True, editable=False, max_length=128, null=True, unique=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['created_at', 'id'], name='archived_payout_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+def create_upper_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS payout_recipient_name_upper_trgm_idx '
+        'ON payouts_payout USING gin ((UPPER(recipient_name::text)) gin_trgm_ops)'
+    )
+    schema_editor.execute('DROP INDEX IF EXISTS payout_recipient_name_trgm_idx')
+
+
+def restore_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS payout_recipient_name_trgm_idx '
+        'ON payouts_payout USING gin (recipient_name gin_trgm_ops)'
+    )
+    schema_editor.execute('DROP INDEX IF EXISTS payout_recipient_name_upper_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0012_apitoken'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_upper_trigram_index, restore_trigram_index),
+    ]
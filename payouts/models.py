@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import hashlib
+import secrets
 import uuid
+from datetime import datetime, timedelta
 from decimal import Decimal
 
+from django.conf import settings
 from django.core.validators import MinValueValidator, RegexValidator
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
+
+from payouts.signals import PayoutChange, PayoutState, payouts_changed
 
 
 class CurrencyChoices(models.TextChoices):
@@ -22,7 +29,65 @@ class PayoutStatus(models.TextChoices):
     CANCELLED = "cancelled", "Cancelled"
 
 
-class Payout(models.Model):
+TERMINAL_STATUSES = frozenset(
+    {PayoutStatus.COMPLETED, PayoutStatus.FAILED, PayoutStatus.CANCELLED}
+)
+
+ALLOWED_TRANSITIONS: dict[str, frozenset[str]] = {
+    status: frozenset() for status in PayoutStatus
+} | {
+    PayoutStatus.PENDING: frozenset(
+        {PayoutStatus.PROCESSING, PayoutStatus.FAILED, PayoutStatus.CANCELLED}
+    ),
+    PayoutStatus.PROCESSING: frozenset({PayoutStatus.COMPLETED, PayoutStatus.FAILED}),
+}
+
+
+def allowed_sources(target: str) -> frozenset[str]:
+    return frozenset(
+        source for source, targets in ALLOWED_TRANSITIONS.items() if target in targets
+    )
+
+
+def finalize_after_for(status: str, now: datetime) -> datetime | None:
+    if status != PayoutStatus.PROCESSING:
+        return None
+    return now + timedelta(seconds=max(settings.PAYOUT_PROCESSING_DELAY_SECONDS, 0))
+
+
+class PayoutQuerySet(models.QuerySet):
+    def transition(self, target: str, updated_at: datetime | None = None) -> int:
+        sources = allowed_sources(target)
+        if not sources:
+            return 0
+        with transaction.atomic(using=self.db):
+            rows = list(
+                self.filter(status__in=sources)
+                .select_for_update()
+                .values_list("id", "currency", "status", "amount")
+            )
+            if not rows:
+                return 0
+            now = updated_at or timezone.now()
+            updated = self.model._default_manager.filter(
+                id__in=[row[0] for row in rows],
+                status__in=sources,
+            ).update(status=target, updated_at=now, finalize_after=finalize_after_for(target, now))
+            payouts_changed.send(
+                sender=self.model,
+                changes=[
+                    PayoutChange(
+                        payout_id,
+                        PayoutState(currency, status, amount),
+                        PayoutState(currency, target, amount),
+                    )
+                    for payout_id, currency, status, amount in rows
+                ],
+            )
+        return updated
+
+
+class PayoutRecord(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     amount = models.DecimalField(
         max_digits=12,
@@ -51,23 +116,182 @@ class Payout(models.Model):
     )
     description = models.CharField(max_length=255, blank=True)
     callback_url = models.URLField(max_length=255, blank=True)
+    webhook_batching = models.BooleanField(default=False)
+    webhook_pending_since = models.DateTimeField(null=True, blank=True)
+    webhook_delivered_status = models.CharField(
+        max_length=16,
+        choices=PayoutStatus.choices,
+        blank=True,
+    )
+    webhook_delivered_at = models.DateTimeField(null=True, blank=True)
+    webhook_attempts = models.PositiveSmallIntegerField(default=0)
+    finalize_after = models.DateTimeField(null=True, blank=True, editable=False)
+    idempotency_key = models.CharField(
+        max_length=128,
+        unique=True,
+        null=True,
+        blank=True,
+        editable=False,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ["-created_at"]
+        abstract = True
 
     def __str__(self) -> str:
         return f"{self.id} ({self.amount} {self.currency})"
 
-    def mark_processing(self) -> None:
-        self.status = PayoutStatus.PROCESSING
-        self.save(update_fields=["status", "updated_at"])
 
-    def mark_completed(self) -> None:
-        self.status = PayoutStatus.COMPLETED
-        self.save(update_fields=["status", "updated_at"])
+class Payout(PayoutRecord):
+    objects = PayoutQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="payout_created_id_idx"),
+            models.Index(fields=["amount", "created_at", "id"], name="payout_amount_created_idx"),
+            models.Index(fields=["status", "created_at", "id"], name="payout_status_created_idx"),
+            models.Index(fields=["currency", "created_at", "id"], name="payout_currency_created_idx"),
+            models.Index(
+                fields=["recipient_account"],
+                name="payout_account_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            models.Index(
+                fields=["webhook_pending_since"],
+                name="payout_webhook_pending_idx",
+                condition=models.Q(webhook_pending_since__isnull=False),
+            ),
+            models.Index(
+                fields=["finalize_after"],
+                name="payout_finalize_after_idx",
+                condition=models.Q(finalize_after__isnull=False),
+            ),
+        ]
+
+    @property
+    def state(self) -> PayoutState:
+        return PayoutState(self.currency, self.status, Decimal(self.amount))
+
+    def transition_to(self, target: str) -> bool:
+        if target not in ALLOWED_TRANSITIONS.get(self.status, ()):
+            return False
+        now = timezone.now()
+        finalize_after = finalize_after_for(target, now)
+        before = self.state
+        with transaction.atomic():
+            updated = Payout.objects.filter(pk=self.pk, status=self.status).update(
+                status=target,
+                updated_at=now,
+                finalize_after=finalize_after,
+            )
+            if updated:
+                self.status = target
+                self.updated_at = now
+                self.finalize_after = finalize_after
+                payouts_changed.send(
+                    sender=Payout,
+                    changes=[PayoutChange(self.pk, before, self.state)],
+                )
+        return bool(updated)
+
+    def mark_processing(self) -> bool:
+        return self.transition_to(PayoutStatus.PROCESSING)
+
+    def mark_completed(self) -> bool:
+        return self.transition_to(PayoutStatus.COMPLETED)
+
+    def mark_failed(self) -> bool:
+        return self.transition_to(PayoutStatus.FAILED)
+
+
+class ArchivedPayout(PayoutRecord):
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="archived_payout_created_idx"),
+        ]
+
+
+class PayoutRollup(models.Model):
+    currency = models.CharField(max_length=3, choices=CurrencyChoices.choices)
+    status = models.CharField(max_length=16, choices=PayoutStatus.choices)
+    shard = models.PositiveSmallIntegerField(default=0)
+    payout_count = models.BigIntegerField(default=0)
+    amount_total = models.DecimalField(max_digits=20, decimal_places=2, default=Decimal("0"))
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["currency", "status", "shard"],
+                name="payout_rollup_unique_bucket",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.currency}/{self.status}#{self.shard}: {self.payout_count}"
+
+
+class OutboxMessage(models.Model):
+    task = models.CharField(max_length=128)
+    payout_id = models.UUIDField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"{self.task}({self.payout_id})"
+
+
+class PayoutEvent(models.Model):
+    payout_id = models.UUIDField()
+    from_status = models.CharField(max_length=16, choices=PayoutStatus.choices, blank=True)
+    to_status = models.CharField(max_length=16, choices=PayoutStatus.choices, blank=True)
+    currency = models.CharField(max_length=3, choices=CurrencyChoices.choices)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["payout_id", "id"], name="payout_event_payout_idx"),
+            models.Index(fields=["created_at"], name="payout_event_created_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.payout_id}: {self.from_status or '-'} -> {self.to_status or '-'}"
+
+
+def hash_token(key: str) -> str:
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class ApiToken(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="api_tokens")
+    name = models.CharField(max_length=64, blank=True)
+    prefix = models.CharField(max_length=8, editable=False)
+    key_hash = models.CharField(max_length=64, unique=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    revoked_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self) -> str:
+        return f"{self.prefix}… ({self.name or self.user})"
+
+    @classmethod
+    def issue(cls, user, name: str = "") -> tuple[ApiToken, str]:
+        key = secrets.token_urlsafe(32)
+        token = cls.objects.create(user=user, name=name, prefix=key[:8], key_hash=hash_token(key))
+        return token, key
 
-    def mark_failed(self) -> None:
-        self.status = PayoutStatus.FAILED
-        self.save(update_fields=["status", "updated_at"])
+    def revoke(self) -> None:
+        self.revoked_at = timezone.now()
+        self.save(update_fields=["revoked_at"])
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager, suppress
+from uuid import UUID
+
+import redis
+import redis.asyncio
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from payouts.signals import PayoutChange, payouts_changed
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "payout-status"
+
+_broker: StatusBroker | None = None
+_broker_lock = threading.Lock()
+
+
+class Subscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.queue: asyncio.Queue[str] = asyncio.Queue()
+
+    def notify(self, status: str) -> None:
+        with suppress(RuntimeError):
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, status)
+
+    async def wait(self, timeout: float) -> str | None:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class StatusBroker:
+    @classmethod
+    def from_settings(cls) -> StatusBroker:
+        return cls()
+
+    def publish(self, updates: Iterable[tuple[UUID | str, str]]) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, payout_id: UUID | str):
+        raise NotImplementedError
+
+
+class LocalStatusBroker(StatusBroker):
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.subscriptions: dict[str, set[Subscription]] = {}
+
+    def publish(self, updates: Iterable[tuple[UUID | str, str]]) -> None:
+        self.deliver(updates)
+
+    def deliver(self, updates: Iterable[tuple[UUID | str, str]]) -> None:
+        with self.lock:
+            targets = [
+                (subscription, status)
+                for payout_id, status in updates
+                for subscription in self.subscriptions.get(str(payout_id), ())
+            ]
+        for subscription, status in targets:
+            subscription.notify(status)
+
+    @asynccontextmanager
+    async def subscribe(self, payout_id: UUID | str) -> AsyncIterator[Subscription]:
+        key = str(payout_id)
+        subscription = Subscription(asyncio.get_running_loop())
+        with self.lock:
+            self.subscriptions.setdefault(key, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self.lock:
+                subscribers = self.subscriptions.get(key, set())
+                subscribers.discard(subscription)
+                if not subscribers:
+                    self.subscriptions.pop(key, None)
+
+
+class RedisStatusBroker(LocalStatusBroker):
+    ready_timeout = 1.0
+
+    def __init__(self, url: str) -> None:
+        super().__init__()
+        self.url = url
+        self.client = redis.Redis.from_url(url)
+        self.listener: asyncio.Task | None = None
+        self.ready: asyncio.Event | None = None
+
+    @classmethod
+    def from_settings(cls) -> RedisStatusBroker:
+        return cls(settings.PAYOUT_STATUS_PUBSUB_URL)
+
+    def publish(self, updates: Iterable[tuple[UUID | str, str]]) -> None:
+        pipeline = self.client.pipeline(transaction=False)
+        for payout_id, status in updates:
+            pipeline.publish(f"{CHANNEL_PREFIX}:{payout_id}", status)
+        try:
+            pipeline.execute()
+        except redis.RedisError as exc:
+            logger.warning("Could not publish payout status notifications: %s", exc)
+
+    @asynccontextmanager
+    async def subscribe(self, payout_id: UUID | str) -> AsyncIterator[Subscription]:
+        ready = self.ensure_listener()
+        async with super().subscribe(payout_id) as subscription:
+            # Waiters re-read the database on timeout, so a slow listener only delays them.
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(ready.wait(), self.ready_timeout)
+            yield subscription
+
+    def ensure_listener(self) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
+        if self.listener is None or self.listener.done() or self.listener.get_loop() is not loop:
+            self.ready = asyncio.Event()
+            self.listener = loop.create_task(self.listen(self.ready))
+        return self.ready
+
+    async def listen(self, ready: asyncio.Event) -> None:
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            # One pattern subscription per process fans out to every local waiter.
+            await pubsub.psubscribe(f"{CHANNEL_PREFIX}:*")
+            ready.set()
+            async for message in pubsub.listen():
+                self.handle_message(message)
+        except (redis.RedisError, OSError) as exc:
+            logger.warning("Payout status listener stopped: %s", exc)
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+
+    def handle_message(self, message: dict) -> None:
+        channel = message["channel"].decode()
+        payout_id = channel.split(":", 1)[1]
+        self.deliver([(payout_id, message["data"].decode())])
+
+
+def get_broker() -> StatusBroker:
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.PAYOUT_STATUS_BROKER).from_settings()
+    return _broker
+
+
+@receiver(payouts_changed, dispatch_uid="payouts.notifications.publish_status_changes")
+def publish_status_changes(sender, changes: list[PayoutChange], **kwargs) -> None:
+    updates = [
+        (change.payout_id, change.after.status if change.after else "")
+        for change in changes
+        if change.status_changed
+    ]
+    if updates:
+        transaction.on_commit(lambda: get_broker().publish(updates))
+
+
+@receiver(setting_changed, dispatch_uid="payouts.notifications.reset_broker")
+def reset_broker(setting: str, **kwargs) -> None:
+    global _broker
+    if setting.startswith("PAYOUT_STATUS_"):
+        _broker = None
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+from uuid import UUID
+
+from celery import current_app
+from django.conf import settings
+from django.db import transaction
+
+from payouts.models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+PROCESS_PAYOUTS_TASK = "payouts.tasks.process_payouts_batch"
+
+
+def enqueue(task: str, payout_ids: Iterable[UUID | str]) -> None:
+    OutboxMessage.objects.bulk_create(
+        [OutboxMessage(task=task, payout_id=payout_id) for payout_id in payout_ids]
+    )
+
+
+def pending_count() -> int:
+    return OutboxMessage.objects.count()
+
+
+def relay_batch(batch_size: int | None = None) -> int:
+    batch_size = batch_size or settings.PAYOUT_OUTBOX_BATCH_SIZE
+    chunk_size = max(settings.PAYOUT_TASK_CHUNK_SIZE, 1)
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .order_by("id")
+            .values_list("id", "task", "payout_id")[:batch_size]
+        )
+        if not messages:
+            return 0
+
+        ids_by_task: dict[str, list[str]] = defaultdict(list)
+        for _, task, payout_id in messages:
+            ids_by_task[task].append(str(payout_id))
+        for task, payout_ids in ids_by_task.items():
+            for start in range(0, len(payout_ids), chunk_size):
+                current_app.tasks[task].delay(payout_ids[start : start + chunk_size])
+
+        OutboxMessage.objects.filter(id__in=[message[0] for message in messages]).delete()
+    return len(messages)
+
+
+def relay(batch_size: int | None = None, max_batches: int | None = None) -> int:
+    batch_size = batch_size or settings.PAYOUT_OUTBOX_BATCH_SIZE
+    max_batches = max_batches or settings.PAYOUT_OUTBOX_MAX_BATCHES
+    relayed = 0
+    for _ in range(max_batches):
+        count = relay_batch(batch_size)
+        relayed += count
+        if count < batch_size:
+            break
+    if relayed:
+        logger.info("Relayed %s outbox messages.", relayed)
+    return relayed
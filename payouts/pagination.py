@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from collections.abc import Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Model, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def _field_name(ordering: str) -> str:
+    return ordering.lstrip("-")
+
+
+def _is_descending(ordering: str) -> bool:
+    return ordering.startswith("-")
+
+
+def _invert(ordering: str) -> str:
+    return ordering[1:] if _is_descending(ordering) else f"-{ordering}"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    return value
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    tiebreaker_fields: Sequence[str] = ("created_at", "id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self) -> None:
+        self.page_size = settings.PAYOUT_PAGE_SIZE
+        self.max_page_size = settings.PAYOUT_MAX_PAGE_SIZE
+        self.next_link: str | None = None
+        self.previous_link: str | None = None
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> list:
+        return self.build_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> list:
+        return self.build_page([row async for row in self.page_queryset(queryset, request)])
+
+    def page_queryset(self, queryset: QuerySet, request: Request) -> QuerySet:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        self.cursor = self.decode_cursor(request, queryset.model)
+
+        self.reverse = False
+        if self.cursor is not None:
+            values, self.reverse = self.cursor
+            queryset = queryset.filter(self.keyset_filter(values, self.reverse))
+
+        ordering = [_invert(item) for item in self.ordering] if self.reverse else self.ordering
+        return queryset.order_by(*ordering)[: self.page_size + 1]
+
+    def build_page(self, rows: list) -> list:
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        self.next_link = None
+        self.previous_link = None
+        if rows:
+            if has_more or self.reverse:
+                self.next_link = self.encode_cursor(rows[-1], reverse=False)
+            if self.cursor is not None and (has_more or not self.reverse):
+                self.previous_link = self.encode_cursor(rows[0], reverse=True)
+        return rows
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(requested, 1), self.max_page_size)
+
+    def get_ordering(self, queryset: QuerySet) -> list[str]:
+        ordering = [
+            item
+            for item in (queryset.query.order_by or queryset.model._meta.ordering)
+            if isinstance(item, str)
+        ]
+        if not ordering:
+            ordering = [f"-{field}" for field in self.tiebreaker_fields]
+        ordering = ["id" if item == "pk" else "-id" if item == "-pk" else item for item in ordering]
+        present = {_field_name(item) for item in ordering}
+        prefix = "-" if _is_descending(ordering[0]) else ""
+        ordering.extend(
+            f"{prefix}{field}" for field in self.tiebreaker_fields if field not in present
+        )
+        return ordering
+
+    def keyset_filter(self, values: list[Any], reverse: bool) -> Q:
+        matched: dict[str, Any] = {}
+        condition = Q()
+        for ordering, value in zip(self.ordering, values):
+            field = _field_name(ordering)
+            descending = _is_descending(ordering) != reverse
+            condition |= Q(**matched, **{f"{field}__{'lt' if descending else 'gt'}": value})
+            matched[field] = value
+
+        first = _field_name(self.ordering[0])
+        first_descending = _is_descending(self.ordering[0]) != reverse
+        bound = Q(**{f"{first}__{'lte' if first_descending else 'gte'}": values[0]})
+        return bound & condition
+
+    def encode_cursor(self, row: Any, reverse: bool) -> str:
+        values = [
+            _encode_value(row[field] if isinstance(row, dict) else getattr(row, field))
+            for field in map(_field_name, self.ordering)
+        ]
+        payload = json.dumps({"o": self.ordering, "v": values, "r": reverse}, separators=(",", ":"))
+        token = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request: Request, model: type[Model]) -> tuple[list[Any], bool] | None:
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            ordering, values, reverse = payload["o"], payload["v"], bool(payload["r"])
+        except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if ordering != self.ordering or not isinstance(values, list) or len(values) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            values = [
+                self.cursor_value(model, _field_name(item), value) for item, value in zip(ordering, values)
+            ]
+        except (ValidationError, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def cursor_value(self, model: type[Model], field_name: str, value: Any) -> Any:
+        # Cursor tokens are client-controlled: coerce every value to its model field type here so
+        # a tampered token is rejected as a bad cursor instead of failing inside the query.
+        if value is None or isinstance(value, (dict, list)):
+            raise ValueError(f"Unsupported cursor value for {field_name!r}.")
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return value
+        return field.to_python(value)
+
+    def get_paginated_response(self, data: list) -> Response:
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.next_link),
+                    ("previous", self.previous_link),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque keyset pagination cursor.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
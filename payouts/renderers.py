@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import csv
+import datetime
+import decimal
+import json
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Sequence
+from typing import Any
+
+from django.utils import timezone
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def encode_datetime(value: datetime.datetime, tz: datetime.tzinfo | None = None) -> str:
+    if timezone.is_aware(value):
+        value = value.astimezone(tz or timezone.get_current_timezone())
+    representation = value.isoformat()
+    if representation.endswith("+00:00"):
+        representation = representation[:-6] + "Z"
+    return representation
+
+
+class PayoutJSONEncoder(JSONEncoder):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.tz = timezone.get_current_timezone()
+
+    def default(self, obj: Any) -> Any:
+        if isinstance(obj, datetime.datetime):
+            return encode_datetime(obj, self.tz)
+        if isinstance(obj, decimal.Decimal):
+            return f"{obj:f}"
+        return super().default(obj)
+
+
+class PayoutJSONRenderer(JSONRenderer):
+    encoder_class = PayoutJSONEncoder
+
+
+class _LineBuffer:
+    def write(self, value: str) -> str:
+        return value
+
+
+def _csv_value(value: Any, tz: datetime.tzinfo) -> Any:
+    if isinstance(value, datetime.datetime):
+        return encode_datetime(value, tz)
+    if isinstance(value, decimal.Decimal):
+        return f"{value:f}"
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+class StreamingRenderer(BaseRenderer):
+    charset = "utf-8"
+    batch_size = 500
+
+    def render(self, data: Any, accepted_media_type=None, renderer_context=None) -> bytes:
+        return json.dumps(data, cls=PayoutJSONEncoder).encode(self.charset)
+
+    def header(self, fields: Sequence[str]) -> list[str]:
+        return []
+
+    def row_encoder(self, fields: Sequence[str]) -> Callable[[Sequence[Any]], str]:
+        raise NotImplementedError
+
+    def stream(self, fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+        yield from self.header(fields)
+        yield from self._batched(map(self.row_encoder(fields), rows))
+
+    async def astream(self, fields: Sequence[str], rows: AsyncIterable[Sequence[Any]]) -> AsyncIterator[str]:
+        # Under ASGI a sync iterator would be drained into a list before the first byte is sent.
+        for line in self.header(fields):
+            yield line
+        encode = self.row_encoder(fields)
+        batch: list[str] = []
+        async for row in rows:
+            batch.append(encode(row))
+            if len(batch) >= self.batch_size:
+                yield "".join(batch)
+                batch = []
+        if batch:
+            yield "".join(batch)
+
+    def _batched(self, lines: Iterable[str]) -> Iterator[str]:
+        batch: list[str] = []
+        for line in lines:
+            batch.append(line)
+            if len(batch) >= self.batch_size:
+                yield "".join(batch)
+                batch = []
+        if batch:
+            yield "".join(batch)
+
+
+class NDJSONRenderer(StreamingRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def row_encoder(self, fields: Sequence[str]) -> Callable[[Sequence[Any]], str]:
+        encoder = PayoutJSONEncoder(separators=(",", ":"))
+        return lambda row: encoder.encode(dict(zip(fields, row))) + "\n"
+
+
+class CSVRenderer(StreamingRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+    def header(self, fields: Sequence[str]) -> list[str]:
+        return [csv.writer(_LineBuffer()).writerow(fields)]
+
+    def row_encoder(self, fields: Sequence[str]) -> Callable[[Sequence[Any]], str]:
+        writer = csv.writer(_LineBuffer())
+        tz = timezone.get_current_timezone()
+        return lambda row: writer.writerow([_csv_value(value, tz) for value in row])
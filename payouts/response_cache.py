@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+from uuid import UUID, uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.dispatch import receiver
+
+from payouts.models import TERMINAL_STATUSES
+from payouts.renderers import PayoutJSONEncoder
+from payouts.signals import PayoutChange, payouts_changed
+
+
+class CachedPayout(NamedTuple):
+    etag: str
+    data: dict
+
+
+class Lookup(NamedTuple):
+    entry: CachedPayout | None
+    generation: str
+
+
+def _cache_key(payout_id: Any) -> str:
+    return f"payouts:retrieve:{payout_id}"
+
+
+def _generation_key(payout_id: Any) -> str:
+    return f"payouts:retrieve-generation:{payout_id}"
+
+
+def etag_for(data: dict) -> str:
+    body = json.dumps(data, cls=PayoutJSONEncoder, sort_keys=True, separators=(",", ":"))
+    return '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def enabled() -> bool:
+    return bool(
+        settings.PAYOUT_RETRIEVE_CACHE_TTL_SECONDS or settings.PAYOUT_RETRIEVE_CACHE_TERMINAL_TTL_SECONDS
+    )
+
+
+def _generation_timeout() -> int:
+    # Outlives every entry, so an expired generation can only invalidate, never revive, an entry.
+    return max(
+        settings.PAYOUT_RETRIEVE_CACHE_TTL_SECONDS,
+        settings.PAYOUT_RETRIEVE_CACHE_TERMINAL_TTL_SECONDS,
+    )
+
+
+def get(payout_id: UUID) -> Lookup:
+    # Entries are tagged with the payout's generation, which invalidation replaces. A fill that
+    # read the row before a commit carries the old generation and is ignored even if it lands
+    # after the invalidation, so pass ``generation`` from here to ``store``.
+    if not enabled():
+        return Lookup(None, "")
+    key, generation_key = _cache_key(payout_id), _generation_key(payout_id)
+    found = cache.get_many([key, generation_key])
+    generation = found.get(generation_key)
+    if generation is None:
+        cache.add(generation_key, uuid4().hex, _generation_timeout())
+        return Lookup(None, cache.get(generation_key, ""))
+    entry = found.get(key)
+    if entry is None or entry[0] != generation:
+        return Lookup(None, generation)
+    return Lookup(CachedPayout(*entry[1:]), generation)
+
+
+def store(payout_id: UUID, data: dict, generation: str) -> CachedPayout:
+    entry = CachedPayout(etag_for(data), data)
+    if data["status"] in TERMINAL_STATUSES:
+        timeout = settings.PAYOUT_RETRIEVE_CACHE_TERMINAL_TTL_SECONDS
+    else:
+        timeout = settings.PAYOUT_RETRIEVE_CACHE_TTL_SECONDS
+    if timeout and generation:
+        cache.set(_cache_key(payout_id), (generation, *entry), timeout)
+    return entry
+
+
+def matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def invalidate(payout_ids: Iterable[Any]) -> None:
+    keys = [_generation_key(payout_id) for payout_id in payout_ids]
+    if keys:
+        transaction.on_commit(
+            lambda: cache.set_many({key: uuid4().hex for key in keys}, _generation_timeout())
+        )
+
+
+@receiver(payouts_changed, dispatch_uid="payouts.response_cache.invalidate_changed")
+def invalidate_changed(sender, changes: list[PayoutChange], **kwargs) -> None:
+    invalidate(change.payout_id for change in changes)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import NamedTuple
+from uuid import UUID
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from payouts.models import Payout, PayoutStatus
+
+RISK_FIELDS = ("id", "amount", "currency", "recipient_account", "created_at")
+
+
+class RiskCandidate(NamedTuple):
+    id: UUID
+    amount: Decimal
+    currency: str
+    recipient_account: str
+    created_at: datetime
+
+
+class PriorPayout(NamedTuple):
+    created_at: datetime
+    id: UUID
+    amount: Decimal
+
+
+class RiskContext:
+    def __init__(self, candidates: Sequence[RiskCandidate], now: datetime | None = None) -> None:
+        self.candidates = candidates
+        self.now = now or timezone.now()
+        self._exposure: dict[timedelta, dict[str, list[PriorPayout]]] = {}
+
+    def exposure(self, window: timedelta) -> dict[str, list[PriorPayout]]:
+        # Live payouts in the window per account, ordered by (created_at, id). Only rows created
+        # before the latest candidate are loaded: later payouts must never count against earlier
+        # ones, otherwise a backlog split across batches rejects its own oldest items.
+        if window not in self._exposure:
+            accounts = {candidate.recipient_account for candidate in self.candidates}
+            latest = max((candidate.created_at for candidate in self.candidates), default=self.now)
+            rows = (
+                Payout.objects.filter(
+                    recipient_account__in=accounts,
+                    created_at__gte=self.now - window,
+                    created_at__lte=latest,
+                )
+                .exclude(id__in=[candidate.id for candidate in self.candidates])
+                .exclude(status__in=[PayoutStatus.FAILED, PayoutStatus.CANCELLED])
+                .order_by("created_at", "id")
+                .values_list("recipient_account", "created_at", "id", "amount")
+            )
+            exposure: dict[str, list[PriorPayout]] = defaultdict(list)
+            for account, *prior in rows:
+                exposure[account].append(PriorPayout(*prior))
+            self._exposure[window] = dict(exposure)
+        return self._exposure[window]
+
+
+class RiskRule:
+    name = "rule"
+
+    @classmethod
+    def from_settings(cls) -> RiskRule:
+        return cls()
+
+    def evaluate(self, context: RiskContext) -> Iterable[UUID]:
+        raise NotImplementedError
+
+
+class CurrencyLimitRule(RiskRule):
+    name = "currency_limit"
+
+    def __init__(self, limits: dict[str, Decimal], default: Decimal | None = None) -> None:
+        self.limits = {currency: Decimal(limit) for currency, limit in limits.items()}
+        self.default = None if default is None else Decimal(default)
+
+    @classmethod
+    def from_settings(cls) -> CurrencyLimitRule:
+        return cls(settings.PAYOUT_RISK_CURRENCY_LIMITS, settings.PAYOUT_RISK_AMOUNT_LIMIT)
+
+    def evaluate(self, context: RiskContext) -> Iterable[UUID]:
+        limits, default = self.limits, self.default
+        for candidate in context.candidates:
+            limit = limits.get(candidate.currency, default)
+            if limit is not None and candidate.amount >= limit:
+                yield candidate.id
+
+
+class BlocklistRule(RiskRule):
+    name = "blocklist"
+
+    def __init__(self, accounts: Iterable[str]) -> None:
+        self.accounts = frozenset(account.replace(" ", "").upper() for account in accounts)
+
+    @classmethod
+    def from_settings(cls) -> BlocklistRule:
+        return cls(settings.PAYOUT_RISK_BLOCKED_ACCOUNTS)
+
+    def evaluate(self, context: RiskContext) -> Iterable[UUID]:
+        if not self.accounts:
+            return
+        for candidate in context.candidates:
+            if candidate.recipient_account in self.accounts:
+                yield candidate.id
+
+
+class VelocityRule(RiskRule):
+    name = "velocity"
+
+    def __init__(
+        self,
+        window: timedelta,
+        max_count: int | None = None,
+        max_amount: Decimal | None = None,
+    ) -> None:
+        self.window = window
+        self.max_count = max_count
+        self.max_amount = None if max_amount is None else Decimal(max_amount)
+
+    @classmethod
+    def from_settings(cls) -> VelocityRule:
+        return cls(
+            timedelta(seconds=settings.PAYOUT_RISK_VELOCITY_WINDOW_SECONDS),
+            settings.PAYOUT_RISK_VELOCITY_MAX_COUNT,
+            settings.PAYOUT_RISK_VELOCITY_MAX_AMOUNT,
+        )
+
+    def evaluate(self, context: RiskContext) -> Iterable[UUID]:
+        if self.max_count is None and self.max_amount is None:
+            return
+        by_account: dict[str, list[RiskCandidate]] = defaultdict(list)
+        for candidate in context.candidates:
+            by_account[candidate.recipient_account].append(candidate)
+
+        exposure = context.exposure(self.window)
+        for account, candidates in by_account.items():
+            prior = exposure.get(account, [])
+            index, count, total = 0, 0, Decimal("0")
+            for candidate in sorted(candidates, key=lambda item: (item.created_at, item.id)):
+                while index < len(prior) and prior[index][:2] < (candidate.created_at, candidate.id):
+                    count += 1
+                    total += prior[index].amount
+                    index += 1
+                if (self.max_count is not None and count + 1 > self.max_count) or (
+                    self.max_amount is not None and total + candidate.amount > self.max_amount
+                ):
+                    yield candidate.id
+                    continue
+                count += 1
+                total += candidate.amount
+
+
+class RiskEngine:
+    def __init__(self, rules: Sequence[RiskRule]) -> None:
+        self.rules = list(rules)
+
+    @classmethod
+    def from_settings(cls) -> RiskEngine:
+        return cls([import_string(path).from_settings() for path in settings.PAYOUT_RISK_RULES])
+
+    def evaluate(
+        self,
+        candidates: Sequence[RiskCandidate],
+        now: datetime | None = None,
+    ) -> dict[UUID, list[str]]:
+        context = RiskContext(candidates, now)
+        flagged: dict[UUID, list[str]] = defaultdict(list)
+        for rule in self.rules:
+            for payout_id in rule.evaluate(context):
+                flagged[payout_id].append(rule.name)
+        return dict(flagged)
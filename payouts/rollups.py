@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import random
+from collections import defaultdict
+from collections.abc import Iterable
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Sum
+from django.dispatch import receiver
+
+from payouts.models import ArchivedPayout, Payout, PayoutRollup
+from payouts.signals import PayoutChange, payouts_changed
+
+Bucket = tuple[str, str]
+
+
+def collect_deltas(changes: Iterable[PayoutChange]) -> dict[Bucket, list]:
+    deltas: dict[Bucket, list] = defaultdict(lambda: [0, Decimal("0")])
+    for change in changes:
+        if change.before is not None:
+            delta = deltas[(change.before.currency, change.before.status)]
+            delta[0] -= 1
+            delta[1] -= change.before.amount
+        if change.after is not None:
+            delta = deltas[(change.after.currency, change.after.status)]
+            delta[0] += 1
+            delta[1] += change.after.amount
+    return deltas
+
+
+def apply_deltas(deltas: dict[Bucket, list]) -> None:
+    shard = random.randrange(max(settings.PAYOUT_ROLLUP_SHARDS, 1))
+    for (currency, status), (count, amount) in sorted(deltas.items()):
+        if not count and not amount:
+            continue
+        bucket = PayoutRollup.objects.filter(currency=currency, status=status, shard=shard)
+        increment = {
+            "payout_count": F("payout_count") + count,
+            "amount_total": F("amount_total") + amount,
+        }
+        if bucket.update(**increment):
+            continue
+        try:
+            with transaction.atomic():
+                PayoutRollup.objects.create(
+                    currency=currency,
+                    status=status,
+                    shard=shard,
+                    payout_count=count,
+                    amount_total=amount,
+                )
+        except IntegrityError:
+            bucket.update(**increment)
+
+
+@receiver(payouts_changed, dispatch_uid="payouts.rollups.update_rollups")
+def update_rollups(sender, changes: list[PayoutChange], **kwargs) -> None:
+    apply_deltas(collect_deltas(changes))
+
+
+def summarize() -> list[dict]:
+    return list(
+        PayoutRollup.objects.values("currency", "status")
+        .annotate(count=Sum("payout_count"), amount_total=Sum("amount_total"))
+        .filter(count__gt=0)
+        .order_by("currency", "status")
+    )
+
+
+def rebuild() -> int:
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"LOCK TABLE {PayoutRollup._meta.db_table} IN SHARE ROW EXCLUSIVE MODE"
+                )
+        PayoutRollup.objects.all().delete()
+        totals: dict[Bucket, list] = defaultdict(lambda: [0, Decimal("0")])
+        for model in (Payout, ArchivedPayout):
+            for row in (
+                model.objects.order_by()
+                .values("currency", "status")
+                .annotate(payout_count=Count("id"), amount_total=Sum("amount"))
+            ):
+                total = totals[(row["currency"], row["status"])]
+                total[0] += row["payout_count"]
+                total[1] += row["amount_total"]
+        buckets = [
+            PayoutRollup(currency=currency, status=status, payout_count=count, amount_total=amount)
+            for (currency, status), (count, amount) in totals.items()
+        ]
+        PayoutRollup.objects.bulk_create(buckets)
+    return len(buckets)
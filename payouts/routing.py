@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpRequest, HttpResponse
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+PIN_COOKIE = "payout_primary_pin"
+ROUTED_APPS = {"payouts"}
+PRIMARY_MODELS = {"payouts.apitoken"}
+
+
+@dataclass
+class RequestRouting:
+    replica_reads: bool
+    wrote: bool = False
+
+
+_routing: ContextVar[RequestRouting | None] = ContextVar("payout_db_routing", default=None)
+
+
+def replicas() -> list[str]:
+    return list(settings.PAYOUT_READ_REPLICAS)
+
+
+@contextmanager
+def route_request(request: HttpRequest) -> Iterator[RequestRouting]:
+    state = RequestRouting(
+        replica_reads=request.method in SAFE_METHODS and PIN_COOKIE not in request.COOKIES
+    )
+    token = _routing.set(state)
+    try:
+        yield state
+    finally:
+        _routing.reset(token)
+
+
+def pin_primary(request: HttpRequest, response: HttpResponse, state: RequestRouting) -> HttpResponse:
+    pin_seconds = settings.PAYOUT_REPLICA_PIN_SECONDS
+    if pin_seconds and replicas() and (state.wrote or request.method not in SAFE_METHODS):
+        response.set_cookie(PIN_COOKIE, "1", max_age=pin_seconds, httponly=True, samesite="Lax")
+    return response
+
+
+def replica_reads(view: Callable[..., HttpResponse]) -> Callable[..., HttpResponse]:
+    @wraps(view)
+    def wrapper(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        with route_request(request) as state:
+            response = view(self, request, *args, **kwargs)
+        return pin_primary(request, response, state)
+
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints) -> str | None:
+        state = _routing.get()
+        if state is None or not state.replica_reads or state.wrote:
+            return None
+        if model._meta.app_label not in ROUTED_APPS or model._meta.label_lower in PRIMARY_MODELS:
+            return None
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return None
+        aliases = replicas()
+        return random.choice(aliases) if aliases else None
+
+    def db_for_write(self, model, **hints) -> str:
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        return True
@@ -2,9 +2,52 @@ from __future__ import annotations
 
 from decimal import Decimal
 
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 
-from payouts.models import CurrencyChoices, Payout, PayoutStatus
+from payouts import metrics, response_cache, velocity
+from payouts.models import ALLOWED_TRANSITIONS, CurrencyChoices, Payout, PayoutStatus, finalize_after_for
+from payouts.signals import PayoutChange, payouts_changed
+
+
+class PayoutListSerializer(serializers.ListSerializer):
+    def is_valid(self, *, raise_exception: bool = False) -> bool:
+        with metrics.STAGE_DURATION.time("validate_bulk"):
+            return super().is_valid(raise_exception=raise_exception)
+
+    def to_internal_value(self, data) -> list[dict]:
+        self.velocity_usage: dict[str, velocity.VelocityUsage] = {}
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data) -> dict:
+        attrs = super().run_child_validation(data)
+        if velocity.enabled():
+            # Items earlier in the same request count towards the limit as well, and the error
+            # lands on the position of the first item that exceeds it.
+            account, amount = attrs["recipient_account"], attrs["amount"]
+            usage = self.velocity_usage.get(account) or velocity.get_store().usage(account)
+            error = velocity.limit_error(account, amount, usage)
+            if error:
+                raise serializers.ValidationError({"recipient_account": [error]})
+            self.velocity_usage[account] = velocity.VelocityUsage(usage.count + 1, usage.amount + amount)
+        return attrs
+
+    def create(self, validated_data: list[dict]) -> list[Payout]:
+        payouts = [
+            Payout(**{**attrs, "status": PayoutStatus.PENDING})
+            for attrs in validated_data
+        ]
+        with transaction.atomic():
+            created = Payout.objects.bulk_create(payouts)
+            payouts_changed.send(
+                sender=Payout,
+                changes=[PayoutChange(payout.pk, None, payout.state) for payout in created],
+            )
+            if velocity.enabled():
+                items = [(payout.recipient_account, payout.amount) for payout in created]
+                transaction.on_commit(lambda: velocity.get_store().record_many(items))
+        return created
 
 
 class PayoutSerializer(serializers.ModelSerializer):
@@ -31,10 +74,16 @@ class PayoutSerializer(serializers.ModelSerializer):
             "status",
             "description",
             "callback_url",
+            "webhook_batching",
             "created_at",
             "updated_at",
         ]
         read_only_fields = ["id", "created_at", "updated_at"]
+        list_serializer_class = PayoutListSerializer
+
+    def is_valid(self, *, raise_exception: bool = False) -> bool:
+        with metrics.STAGE_DURATION.time("validate"):
+            return super().is_valid(raise_exception=raise_exception)
 
     def validate_currency(self, value: str) -> str:
         value = value.upper()
@@ -52,8 +101,51 @@ class PayoutSerializer(serializers.ModelSerializer):
         instance: Payout | None = getattr(self, "instance", None)
         if instance and instance.status == PayoutStatus.COMPLETED and value != instance.status:
             raise serializers.ValidationError("Completed payouts cannot be updated.")
+        if instance and value != instance.status and value not in ALLOWED_TRANSITIONS[instance.status]:
+            raise serializers.ValidationError(f"Cannot change status from {instance.status} to {value}.")
         return value
 
+    def validate(self, attrs: dict) -> dict:
+        if self.instance is None and velocity.enabled() and not isinstance(self.parent, PayoutListSerializer):
+            error = velocity.limit_error(attrs["recipient_account"], attrs["amount"])
+            if error:
+                raise serializers.ValidationError({"recipient_account": [error]})
+        return attrs
+
     def create(self, validated_data: dict) -> Payout:
         validated_data["status"] = PayoutStatus.PENDING
-        return super().create(validated_data)
+        with transaction.atomic():
+            payout = super().create(validated_data)
+            payouts_changed.send(sender=Payout, changes=[PayoutChange(payout.pk, None, payout.state)])
+            if velocity.enabled():
+                transaction.on_commit(
+                    lambda: velocity.get_store().record(payout.recipient_account, payout.amount)
+                )
+        return payout
+
+    def update(self, instance: Payout, validated_data: dict) -> Payout:
+        with transaction.atomic():
+            target = validated_data.get("status", instance.status)
+            if target != instance.status:
+                # The worker may have moved the payout since validation; re-check under the row lock.
+                instance.status = (
+                    Payout.objects.select_for_update().values_list("status", flat=True).get(pk=instance.pk)
+                )
+                if target not in ALLOWED_TRANSITIONS[instance.status]:
+                    raise serializers.ValidationError(
+                        {"status": [f"Cannot change status from {instance.status} to {target}."]}
+                    )
+                validated_data["finalize_after"] = finalize_after_for(target, timezone.now())
+            before = instance.state
+            payout = super().update(instance, validated_data)
+            if payout.state != before:
+                payouts_changed.send(
+                    sender=Payout,
+                    changes=[PayoutChange(payout.pk, before, payout.state)],
+                )
+            else:
+                response_cache.invalidate([payout.pk])
+        return payout
+
+
+PAYOUT_READ_FIELDS = tuple(PayoutSerializer.Meta.fields)
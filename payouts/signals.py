@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+from typing import NamedTuple
+
+from django.dispatch import Signal
+
+
+class PayoutState(NamedTuple):
+    currency: str
+    status: str
+    amount: Decimal
+
+
+class PayoutChange(NamedTuple):
+    payout_id: uuid.UUID
+    before: PayoutState | None
+    after: PayoutState | None
+
+    @property
+    def status_changed(self) -> bool:
+        before = self.before.status if self.before else None
+        after = self.after.status if self.after else None
+        return before != after
+
+
+# Sent inside the writing transaction with ``changes: list[PayoutChange]``.
+payouts_changed = Signal()
@@ -2,17 +2,39 @@ from __future__ import annotations
 
 import json
 import logging
-from decimal import Decimal
-from urllib import error, request
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime, timedelta
+from typing import TypeVar
 
 from celery import shared_task
 from django.conf import settings
 from django.db import transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
 
+from payouts import outbox
 from payouts.models import Payout, PayoutStatus
+from payouts.risk import RISK_FIELDS, RiskCandidate, RiskEngine
+from payouts.webhooks import DeliveryResult, WebhookJob, deliver_webhooks
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+WEBHOOK_FIELDS = ("id", "status", "amount", "currency", "updated_at", "callback_url")
+
+
+def _log_risk_failures(flagged: dict) -> None:
+    for payout_id, rules in flagged.items():
+        logger.error("Payout %s failed automatic risk checks: %s.", payout_id, ", ".join(rules))
+
+
+def _chunked(items: Sequence[T], size: int) -> Iterator[list[T]]:
+    size = max(size, 1)
+    for start in range(0, len(items), size):
+        yield list(items[start : start + size])
+
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=5)
 def process_payout(self, payout_id: str) -> None:
@@ -26,13 +48,8 @@ def process_payout(self, payout_id: str) -> None:
         logger.info("Skipping payout %s with status %s", payout_id, payout.status)
         return
 
-    with transaction.atomic():
-        payout.refresh_from_db()
-        if payout.status == PayoutStatus.PENDING:
-            payout.mark_processing()
-
-    countdown = max(settings.PAYOUT_PROCESSING_DELAY_SECONDS, 0)
-    finalize_payout.apply_async((payout_id,), countdown=countdown)
+    if payout.status == PayoutStatus.PENDING and not payout.mark_processing():
+        logger.info("Payout %s was transitioned concurrently, skipping.", payout_id)
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=5)
@@ -43,52 +60,251 @@ def finalize_payout(self, payout_id: str) -> None:
         logger.warning("Payout %s does not exist.", payout_id)
         return
 
-    payout.refresh_from_db()
     if payout.status != PayoutStatus.PROCESSING:
         logger.info("Skipping payout %s with status %s", payout_id, payout.status)
         return
 
-    if payout.amount >= Decimal("1000000"):
-        payout.mark_failed()
-        logger.error("Payout %s failed automatic risk checks.", payout_id)
+    candidate = RiskCandidate(*(getattr(payout, field) for field in RISK_FIELDS))
+    flagged = RiskEngine.from_settings().evaluate([candidate])
+    if flagged:
+        if not payout.mark_failed():
+            logger.info("Payout %s was transitioned concurrently, skipping.", payout_id)
+            return
+        _log_risk_failures(flagged)
     else:
-        payout.mark_completed()
+        if not payout.mark_completed():
+            logger.info("Payout %s was transitioned concurrently, skipping.", payout_id)
+            return
         logger.info("Payout %s processed successfully.", payout_id)
 
     if payout.callback_url:
-        send_payout_webhook.delay(str(payout.id))
+        if payout.webhook_batching:
+            schedule_payout_webhooks([(str(payout.id), True)])
+        else:
+            send_payout_webhook.delay(str(payout.id))
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=5)
+def process_payouts_batch(self, payout_ids: list[str]) -> None:
+    processing = Payout.objects.filter(id__in=payout_ids).transition(PayoutStatus.PROCESSING)
+    if processing < len(payout_ids):
+        logger.info(
+            "Skipping %s payouts that are missing or not awaiting processing.",
+            len(payout_ids) - processing,
+        )
+
+
+def _finalize_payouts(queryset: QuerySet[Payout]) -> int:
+    with transaction.atomic():
+        rows = list(queryset.values_list(*RISK_FIELDS, "callback_url", "webhook_batching"))
+        candidates = [RiskCandidate(*row[: len(RISK_FIELDS)]) for row in rows]
+        flagged = RiskEngine.from_settings().evaluate(candidates)
+        failed_ids = [candidate.id for candidate in candidates if candidate.id in flagged]
+        completed_ids = [candidate.id for candidate in candidates if candidate.id not in flagged]
+        processing = Payout.objects.filter(status=PayoutStatus.PROCESSING)
+        if failed_ids:
+            processing.filter(id__in=failed_ids).transition(PayoutStatus.FAILED)
+        if completed_ids:
+            processing.filter(id__in=completed_ids).transition(PayoutStatus.COMPLETED)
+
+    _log_risk_failures(flagged)
+    logger.info("Finalized batch of %s payouts (%s failed).", len(rows), len(failed_ids))
+
+    schedule_payout_webhooks(
+        (str(row[0]), batching) for *row, callback_url, batching in rows if callback_url
+    )
+    return len(rows)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=5)
+def finalize_payouts_batch(self, payout_ids: list[str]) -> None:
+    _finalize_payouts(
+        Payout.objects.select_for_update().filter(id__in=payout_ids, status=PayoutStatus.PROCESSING)
+    )
+
+
+@shared_task(bind=True)
+def finalize_due_payouts(self) -> None:
+    chunk_size = max(settings.PAYOUT_FINALIZE_CHUNK_SIZE, 1)
+    finalized = 0
+    for _ in range(settings.PAYOUT_FINALIZE_MAX_CHUNKS):
+        due = (
+            Payout.objects.select_for_update(skip_locked=True)
+            .filter(status=PayoutStatus.PROCESSING, finalize_after__lte=timezone.now())
+            .order_by("finalize_after")[:chunk_size]
+        )
+        count = _finalize_payouts(due)
+        finalized += count
+        if count < chunk_size:
+            break
+    if finalized:
+        logger.info("Sweeper finalized %s due payouts.", finalized)
+
+
+@shared_task(bind=True)
+def relay_payout_outbox(self) -> None:
+    outbox.relay()
+
+
+def _webhook_payload(row: dict) -> dict:
+    return {
+        "payout_id": str(row["id"]),
+        "status": row["status"],
+        "amount": str(row["amount"]),
+        "currency": row["currency"],
+        "updated_at": row["updated_at"].isoformat(),
+    }
+
+
+def _log_delivery(result: DeliveryResult) -> None:
+    if result.delivered:
+        logger.info("Webhook sent for %s", result.job.key)
+    else:
+        logger.error(
+            "Webhook error for %s after %s attempts: %s",
+            result.job.key,
+            result.attempts,
+            result.error or f"HTTP {result.status_code}",
+        )
+
+
+def _record_webhook_deliveries(rows: Iterable[dict]) -> None:
+    ids_by_status: dict[str, list] = defaultdict(list)
+    for row in rows:
+        ids_by_status[row["status"]].append(row["id"])
+    now = timezone.now()
+    for status, payout_ids in ids_by_status.items():
+        Payout.objects.filter(id__in=payout_ids, status=status).update(
+            webhook_delivered_status=status,
+            webhook_delivered_at=now,
+            webhook_pending_since=None,
+            webhook_attempts=0,
+        )
+
+
+def _deliver_payout_webhooks(payout_ids: Sequence[str]) -> list[DeliveryResult]:
+    rows = {
+        str(row["id"]): row
+        for row in Payout.objects.filter(id__in=payout_ids)
+        .exclude(callback_url="")
+        .values(*WEBHOOK_FIELDS)
+    }
+    if len(rows) < len(payout_ids):
+        logger.warning(
+            "Webhook skipped for %s payouts: missing or without callback_url.",
+            len(payout_ids) - len(rows),
+        )
+    if not rows:
+        return []
+
+    jobs = [
+        WebhookJob(
+            key=payout_id,
+            url=row["callback_url"],
+            body=json.dumps(_webhook_payload(row)).encode("utf-8"),
+        )
+        for payout_id, row in rows.items()
+    ]
+    results = deliver_webhooks(jobs)
+    for result in results:
+        _log_delivery(result)
+    _record_webhook_deliveries(rows[result.job.key] for result in results if result.delivered)
+    return results
+
+
+def schedule_payout_webhooks(payouts: Iterable[tuple[str, bool]]) -> None:
+    immediate_ids: list[str] = []
+    batched_ids: list[str] = []
+    for payout_id, batching in payouts:
+        (batched_ids if batching else immediate_ids).append(payout_id)
+
+    if batched_ids:
+        Payout.objects.filter(id__in=batched_ids, webhook_pending_since__isnull=True).update(
+            webhook_pending_since=timezone.now()
+        )
+    enqueue_payout_webhooks(immediate_ids)
+
+
+def enqueue_payout_webhooks(payout_ids: Iterable[str]) -> None:
+    for chunk in _chunked(list(payout_ids), settings.WEBHOOK_BATCH_SIZE):
+        send_payout_webhooks.delay(chunk)
 
 
 @shared_task(bind=True, max_retries=2, default_retry_delay=10)
 def send_payout_webhook(self, payout_id: str) -> None:
-    try:
-        payout = Payout.objects.get(id=payout_id)
-    except Payout.DoesNotExist:
-        logger.warning("Webhook skipped: payout %s missing.", payout_id)
-        return
+    results = _deliver_payout_webhooks([payout_id])
+    if any(result.retryable for result in results) and self.request.retries < self.max_retries:
+        raise self.retry()
+
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=10)
+def send_payout_webhooks(self, payout_ids: list[str]) -> None:
+    results = _deliver_payout_webhooks(payout_ids)
+    retry_ids = [result.job.key for result in results if result.retryable]
+    if retry_ids and self.request.retries < self.max_retries:
+        raise self.retry(args=(retry_ids,))
+
 
-    if not payout.callback_url:
+def _claim_batched_webhooks() -> tuple[list[dict], datetime]:
+    # Pushing webhook_pending_since past the lease marks rows as in flight: overlapping flushes
+    # skip them, and a crashed worker's claim simply expires.
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=settings.WEBHOOK_BATCH_WINDOW_SECONDS)
+    lease_until = now + timedelta(seconds=settings.WEBHOOK_BATCH_CLAIM_SECONDS)
+    with transaction.atomic():
+        rows = list(
+            Payout.objects.select_for_update(skip_locked=True)
+            .filter(
+                webhook_batching=True,
+                webhook_pending_since__lte=cutoff,
+                webhook_attempts__lt=settings.WEBHOOK_MAX_ATTEMPTS,
+            )
+            .exclude(callback_url="")
+            .order_by("webhook_pending_since")
+            .values(*WEBHOOK_FIELDS)[: settings.WEBHOOK_BATCH_FLUSH_LIMIT]
+        )
+        if rows:
+            Payout.objects.filter(id__in=[row["id"] for row in rows]).update(
+                webhook_pending_since=lease_until
+            )
+    return rows, lease_until
+
+
+@shared_task(bind=True)
+def flush_batched_webhooks(self) -> None:
+    rows, lease_until = _claim_batched_webhooks()
+    if not rows:
         return
 
-    data = {
-        "payout_id": str(payout.id),
-        "status": payout.status,
-        "amount": str(payout.amount),
-        "currency": payout.currency,
-        "updated_at": payout.updated_at.isoformat(),
-    }
+    rows_by_url: dict[str, list[dict]] = defaultdict(list)
+    for row in rows:
+        rows_by_url[row["callback_url"]].append(row)
 
-    body = json.dumps(data).encode("utf-8")
-    headers = {"Content-Type": "application/json"}
-    request_obj = request.Request(
-        payout.callback_url,
-        data=body,
-        headers=headers,
-        method="POST",
-    )
+    jobs: list[WebhookJob] = []
+    batches: dict[str, list[dict]] = {}
+    for url, url_rows in rows_by_url.items():
+        for chunk in _chunked(url_rows, settings.WEBHOOK_BATCH_SIZE):
+            key = f"batch {len(jobs) + 1} to {url}"
+            body = json.dumps([_webhook_payload(row) for row in chunk]).encode("utf-8")
+            jobs.append(WebhookJob(key=key, url=url, body=body))
+            batches[key] = chunk
 
-    try:
-        with request.urlopen(request_obj, timeout=settings.WEBHOOK_TIMEOUT_SECONDS):
-            logger.info("Webhook sent for payout %s", payout_id)
-    except error.URLError as exc:
-        logger.error("Webhook error for payout %s: %s", payout_id, exc)
+    delivered: list[dict] = []
+    failed_ids: list = []
+    for result in deliver_webhooks(jobs):
+        _log_delivery(result)
+        if result.delivered:
+            delivered.extend(batches[result.job.key])
+        else:
+            failed_ids.extend(row["id"] for row in batches[result.job.key])
+
+    _record_webhook_deliveries(delivered)
+    if failed_ids:
+        Payout.objects.filter(id__in=failed_ids).update(webhook_attempts=F("webhook_attempts") + 1)
+    # Release whatever is still claimed: failed batches and rows whose status moved on while
+    # they were in flight go back to the queue for the next flush.
+    Payout.objects.filter(
+        id__in=[row["id"] for row in rows],
+        webhook_pending_since=lease_until,
+    ).update(webhook_pending_since=timezone.now())
+    logger.info("Flushed %s batched webhooks in %s requests.", len(rows), len(jobs))
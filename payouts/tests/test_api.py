@@ -1,15 +1,24 @@
 from __future__ import annotations
 
+import base64
+import csv
+import io
+import json
+import uuid
 from decimal import Decimal
 from unittest import mock
 
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
 from django.test import TestCase
 
-from payouts.models import CurrencyChoices, Payout, PayoutStatus
+from payouts import outbox
+from payouts.models import CurrencyChoices, OutboxMessage, Payout, PayoutStatus
+from payouts.serializers import PayoutSerializer
 from payouts.tasks import finalize_payout
 
 
@@ -23,8 +32,7 @@ class PayoutAPITestCase(APITestCase):
         )
         self.client.force_authenticate(self.user)
 
-    @mock.patch("payouts.views.process_payout.delay")
-    def test_create_payout_success(self, mock_delay: mock.Mock) -> None:
+    def test_create_payout_success(self) -> None:
         payload = {
             "amount": "120.50",
             "currency": "usd",
@@ -40,10 +48,13 @@ class PayoutAPITestCase(APITestCase):
         self.assertEqual(payout.status, PayoutStatus.PENDING)
         self.assertEqual(response.data["currency"], CurrencyChoices.USD)
         self.assertEqual(Decimal(response.data["amount"]), Decimal("120.50"))
-        mock_delay.assert_called_once()
+        self.assertEqual(
+            list(OutboxMessage.objects.values_list("task", "payout_id")),
+            [(outbox.PROCESS_PAYOUTS_TASK, payout.id)],
+        )
 
-    @mock.patch("payouts.views.process_payout.delay")
-    def test_celery_task_enqueued_on_create(self, mock_delay: mock.Mock) -> None:
+    @mock.patch("payouts.tasks.process_payouts_batch.delay")
+    def test_celery_task_enqueued_through_outbox(self, mock_delay: mock.Mock) -> None:
         payload = {
             "amount": "15.00",
             "currency": "EUR",
@@ -55,7 +66,12 @@ class PayoutAPITestCase(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         payout = Payout.objects.get()
-        mock_delay.assert_called_once_with(str(payout.id))
+        mock_delay.assert_not_called()
+
+        self.assertEqual(outbox.relay(), 1)
+
+        mock_delay.assert_called_once_with([str(payout.id)])
+        self.assertFalse(OutboxMessage.objects.exists())
 
     def test_patch_updates_status(self) -> None:
         payout = Payout.objects.create(
@@ -72,8 +88,43 @@ class PayoutAPITestCase(APITestCase):
         payout.refresh_from_db()
         self.assertEqual(payout.status, PayoutStatus.CANCELLED)
 
-    @mock.patch("payouts.views.process_payout.delay")
-    def test_create_payout_invalid_currency(self, mock_delay: mock.Mock) -> None:
+    def test_patch_cannot_resurrect_finished_payouts(self) -> None:
+        for source in (PayoutStatus.FAILED, PayoutStatus.CANCELLED, PayoutStatus.COMPLETED):
+            payout = Payout.objects.create(
+                amount="55.00",
+                currency=CurrencyChoices.EUR,
+                recipient_name="Carol",
+                recipient_account="CAROL-123",
+                status=source,
+            )
+            url = reverse("payout-detail", args=[payout.id])
+
+            response = self.client.patch(url, {"status": PayoutStatus.PROCESSING}, format="json")
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("status", response.data)
+            payout.refresh_from_db()
+            self.assertEqual(payout.status, source)
+            self.assertIsNone(payout.finalize_after)
+
+    def test_patch_rechecks_status_changed_after_validation(self) -> None:
+        payout = Payout.objects.create(
+            amount="55.00",
+            currency=CurrencyChoices.EUR,
+            recipient_name="Carol",
+            recipient_account="CAROL-123",
+        )
+        serializer = PayoutSerializer(payout, data={"status": PayoutStatus.CANCELLED}, partial=True)
+        self.assertTrue(serializer.is_valid())
+        Payout.objects.filter(pk=payout.pk).update(status=PayoutStatus.COMPLETED)
+
+        with self.assertRaises(ValidationError):
+            serializer.save()
+
+        payout.refresh_from_db()
+        self.assertEqual(payout.status, PayoutStatus.COMPLETED)
+
+    def test_create_payout_invalid_currency(self) -> None:
         payload = {
             "amount": "10.00",
             "currency": "ABC",
@@ -85,7 +136,52 @@ class PayoutAPITestCase(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("currency", response.data)
-        mock_delay.assert_not_called()
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_bulk_create_payouts(self) -> None:
+        payload = [
+            {
+                "amount": "10.00",
+                "currency": "usd",
+                "recipient_name": f"Worker {index}",
+                "recipient_account": f"ACC-{index:05d}",
+            }
+            for index in range(3)
+        ]
+
+        response = self.client.post(reverse("payout-bulk-create"), payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(Payout.objects.filter(status=PayoutStatus.PENDING).count(), 3)
+        self.assertEqual(
+            sorted(str(payout_id) for payout_id in OutboxMessage.objects.values_list("payout_id", flat=True)),
+            sorted(item["id"] for item in response.data),
+        )
+
+    def test_bulk_create_reports_item_errors(self) -> None:
+        payload = [
+            {
+                "amount": "10.00",
+                "currency": "USD",
+                "recipient_name": "Valid",
+                "recipient_account": "ACC-00001",
+            },
+            {
+                "amount": "10.00",
+                "currency": "ABC",
+                "recipient_name": "Invalid",
+                "recipient_account": "ACC-00002",
+            },
+        ]
+
+        response = self.client.post(reverse("payout-bulk-create"), payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("currency", response.data[1])
+        self.assertFalse(Payout.objects.exists())
+        self.assertFalse(OutboxMessage.objects.exists())
 
 
 class PayoutTaskTestCase(TestCase):
@@ -103,3 +199,222 @@ class PayoutTaskTestCase(TestCase):
     def test_finalize_triggers_webhook(self, mock_webhook: mock.Mock) -> None:
         finalize_payout.apply(args=(str(self.payout.id),))
         mock_webhook.assert_called_once_with(str(self.payout.id))
+
+    @mock.patch("payouts.tasks.process_payouts_batch.delay")
+    def test_outbox_relay_publishes_in_chunks(self, mock_delay: mock.Mock) -> None:
+        payout_ids = [uuid.uuid4() for _ in range(5)]
+        outbox.enqueue(outbox.PROCESS_PAYOUTS_TASK, payout_ids)
+
+        with self.settings(PAYOUT_TASK_CHUNK_SIZE=2):
+            self.assertEqual(outbox.relay(batch_size=3), 5)
+
+        ids = [str(payout_id) for payout_id in payout_ids]
+        mock_delay.assert_has_calls(
+            [mock.call(ids[0:2]), mock.call(ids[2:3]), mock.call(ids[3:5])]
+        )
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    @mock.patch("payouts.tasks.process_payouts_batch.delay", side_effect=ConnectionError)
+    def test_outbox_keeps_messages_when_broker_is_down(self, mock_delay: mock.Mock) -> None:
+        outbox.enqueue(outbox.PROCESS_PAYOUTS_TASK, [self.payout.id])
+
+        with self.assertRaises(ConnectionError):
+            outbox.relay()
+
+        self.assertEqual(OutboxMessage.objects.get().payout_id, self.payout.id)
+
+
+def make_cursor(ordering: list[str], values: list, reverse: bool = False) -> str:
+    payload = json.dumps({"o": ordering, "v": values, "r": reverse}).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+class PayoutListPaginationTestCase(APITestCase):
+    def setUp(self) -> None:
+        self.list_url = reverse("payout-list")
+        self.user = get_user_model().objects.create_user(username="pager", password="testpass123")
+        self.client.force_authenticate(self.user)
+        self.payouts = [
+            Payout.objects.create(
+                amount=f"{amount}.00",
+                currency=CurrencyChoices.USD,
+                recipient_name=f"Page {index}",
+                recipient_account=f"ACC-PAGE-{index}",
+            )
+            for index, amount in enumerate([30, 10, 50, 10, 20])
+        ]
+
+    def collect_pages(self, url: str) -> tuple[list[str], list[dict]]:
+        ids: list[str] = []
+        pages: list[dict] = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            page = response.json()
+            pages.append(page)
+            ids.extend(item["id"] for item in page["results"])
+            url = page["next"]
+        return ids, pages
+
+    def test_cursor_walks_all_rows_newest_first(self) -> None:
+        ids, pages = self.collect_pages(f"{self.list_url}?page_size=2")
+
+        expected = Payout.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        self.assertEqual(ids, [str(payout_id) for payout_id in expected])
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]["previous"])
+
+        response = self.client.get(pages[1]["previous"])
+        self.assertEqual(
+            [item["id"] for item in response.json()["results"]],
+            [item["id"] for item in pages[0]["results"]],
+        )
+
+    def test_cursor_respects_ordering_filter(self) -> None:
+        ids, _ = self.collect_pages(f"{self.list_url}?ordering=amount&page_size=2")
+
+        expected = Payout.objects.order_by("amount", "created_at", "id").values_list("id", flat=True)
+        self.assertEqual(ids, [str(payout_id) for payout_id in expected])
+
+    def test_invalid_cursor_returns_not_found(self) -> None:
+        response = self.client.get(f"{self.list_url}?cursor=garbage")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_mistyped_values_returns_not_found(self) -> None:
+        cursors = [
+            make_cursor(["-created_at", "-id"], ["yesterday", str(self.payouts[0].id)]),
+            make_cursor(["-created_at", "-id"], [self.payouts[0].created_at.isoformat(), "not-a-uuid"]),
+            make_cursor(["amount", "created_at", "id"], [{"a": 1}, None, 7]),
+        ]
+        urls = [self.list_url, self.list_url, f"{self.list_url}?ordering=amount"]
+
+        for url, cursor in zip(urls, cursors):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(url, {"cursor": cursor})
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PayoutSearchTestCase(APITestCase):
+    def setUp(self) -> None:
+        self.list_url = reverse("payout-list")
+        self.user = get_user_model().objects.create_user(username="searcher", password="testpass123")
+        self.client.force_authenticate(self.user)
+        self.alice = Payout.objects.create(
+            amount="10.00",
+            currency=CurrencyChoices.EUR,
+            recipient_name="Alice Smith",
+            recipient_account="ALICE-0001",
+        )
+        self.bob = Payout.objects.create(
+            amount="20.00",
+            currency=CurrencyChoices.USD,
+            recipient_name="Bob Jones",
+            recipient_account="BOB-0002",
+            status=PayoutStatus.COMPLETED,
+        )
+
+    def search(self, term: str) -> list[str]:
+        response = self.client.get(self.list_url, {"search": term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["id"] for item in response.json()["results"]]
+
+    def test_search_by_account_prefix_is_case_normalized(self) -> None:
+        self.assertEqual(self.search("alice-00"), [str(self.alice.id)])
+
+    def test_search_by_exact_currency_and_status(self) -> None:
+        self.assertEqual(self.search("eur"), [str(self.alice.id)])
+        self.assertEqual(self.search("COMPLETED"), [str(self.bob.id)])
+
+    def test_search_by_recipient_name(self) -> None:
+        self.assertEqual(self.search("bob"), [str(self.bob.id)])
+
+    def test_search_terms_are_combined(self) -> None:
+        self.assertEqual(self.search("bob pending"), [])
+
+
+class PayoutReadPathTestCase(APITestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="reader", password="testpass123")
+        self.client.force_authenticate(self.user)
+        self.payout = Payout.objects.create(
+            amount="1234.50",
+            currency=CurrencyChoices.GBP,
+            recipient_name="Reader",
+            recipient_account="ACC-READ-1",
+            description="Dashboard",
+            callback_url="https://example.com/hook",
+        )
+
+    def expected(self) -> dict:
+        payout = Payout.objects.get(pk=self.payout.pk)
+        return json.loads(JSONRenderer().render(PayoutSerializer(payout).data))
+
+    def test_retrieve_matches_model_serializer(self) -> None:
+        response = self.client.get(reverse("payout-detail", args=[self.payout.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), self.expected())
+
+    def test_list_matches_model_serializer(self) -> None:
+        response = self.client.get(reverse("payout-list"))
+
+        self.assertEqual(response.json()["results"], [self.expected()])
+
+    def test_retrieve_unknown_or_malformed_id_returns_not_found(self) -> None:
+        for lookup in [uuid.uuid4(), "not-a-uuid"]:
+            response = self.client.get(reverse("payout-detail", args=[lookup]))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PayoutExportTestCase(APITestCase):
+    def setUp(self) -> None:
+        self.export_url = reverse("payout-export")
+        self.user = get_user_model().objects.create_user(username="exporter", password="testpass123")
+        self.client.force_authenticate(self.user)
+        self.completed = Payout.objects.create(
+            amount="75.10",
+            currency=CurrencyChoices.USD,
+            recipient_name="Export, Inc.",
+            recipient_account="ACC-EXP-1",
+            status=PayoutStatus.COMPLETED,
+        )
+        self.pending = Payout.objects.create(
+            amount="12.00",
+            currency=CurrencyChoices.RUB,
+            recipient_name="Pending",
+            recipient_account="ACC-EXP-2",
+        )
+
+    def read(self, response) -> str:
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_export_ndjson_honors_status_filter(self) -> None:
+        response = self.client.get(self.export_url, {"status": "completed"})
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson; charset=utf-8")
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["id"], str(self.completed.id))
+        self.assertEqual(rows[0]["amount"], "75.10")
+
+    def test_export_csv_with_date_range(self) -> None:
+        Payout.objects.filter(pk=self.pending.pk).update(created_at="2020-01-01T00:00:00Z")
+
+        response = self.client.get(
+            self.export_url,
+            {"format": "csv", "created_after": "2021-01-01", "ordering": "amount"},
+        )
+
+        rows = list(csv.reader(io.StringIO(self.read(response))))
+        self.assertEqual(rows[0], list(PayoutSerializer.Meta.fields))
+        self.assertEqual([row[0] for row in rows[1:]], [str(self.completed.id)])
+        self.assertEqual(rows[1][3], "Export, Inc.")
+
+    def test_export_rejects_unknown_status(self) -> None:
+        response = self.client.get(self.export_url, {"status": "lost"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("status", json.loads(response.content))
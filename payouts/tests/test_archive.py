@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from payouts import archive, rollups
+from payouts.models import ArchivedPayout, Payout, PayoutRollup, PayoutStatus
+from payouts.tests.test_tasks import create_payout
+
+
+class PayoutArchiveTestCase(APITestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="archive", password="testpass123")
+        self.client.force_authenticate(self.user)
+
+    def create_old(self, days: int, **overrides) -> Payout:
+        payout = create_payout(**overrides)
+        created_at = timezone.now() - timedelta(days=days)
+        Payout.objects.filter(pk=payout.pk).update(created_at=created_at, updated_at=created_at)
+        payout.refresh_from_db()
+        return payout
+
+    def test_moves_old_terminal_payouts_in_chunks(self) -> None:
+        old = [self.create_old(120, status=PayoutStatus.COMPLETED) for _ in range(5)]
+        old_pending = self.create_old(120)
+        recent = self.create_old(10, status=PayoutStatus.FAILED)
+
+        archived = archive.archive(older_than=timedelta(days=90), chunk_size=2)
+
+        self.assertEqual(archived, 5)
+        self.assertEqual(
+            set(Payout.objects.values_list("id", flat=True)),
+            {old_pending.id, recent.id},
+        )
+        row = ArchivedPayout.objects.get(pk=old[0].pk)
+        self.assertEqual(row.created_at, old[0].created_at)
+        self.assertEqual(row.amount, old[0].amount)
+
+    def test_max_chunks_bounds_a_run(self) -> None:
+        for _ in range(5):
+            self.create_old(120, status=PayoutStatus.CANCELLED)
+
+        out = StringIO()
+        call_command("archive_payouts", "--chunk-size=2", "--max-chunks=2", stdout=out)
+
+        self.assertIn("Archived 4 payouts.", out.getvalue())
+        self.assertEqual(Payout.objects.count(), 1)
+
+    def test_retrieve_and_history_read_archived_rows(self) -> None:
+        payout = self.create_old(120, status=PayoutStatus.COMPLETED)
+        archive.archive(older_than=timedelta(days=90))
+
+        response = self.client.get(reverse("payout-detail", args=[payout.id]))
+        history = self.client.get(reverse("payout-history", args=[payout.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["status"], PayoutStatus.COMPLETED)
+        self.assertEqual(history.status_code, status.HTTP_200_OK)
+
+    def test_rollup_rebuild_keeps_archived_totals(self) -> None:
+        self.create_old(120, status=PayoutStatus.COMPLETED)
+        self.create_old(120, status=PayoutStatus.COMPLETED)
+        archive.archive(older_than=timedelta(days=90))
+
+        rollups.rebuild()
+
+        bucket = PayoutRollup.objects.get(currency="USD", status=PayoutStatus.COMPLETED)
+        self.assertEqual((bucket.payout_count, bucket.amount_total), (2, Decimal("200.00")))
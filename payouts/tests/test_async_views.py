@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import csv
+import io
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+
+from payouts import async_views, metrics
+from payouts.models import PayoutStatus
+from payouts.renderers import CSVRenderer
+from payouts.tests.test_api import make_cursor
+from payouts.tests.test_tasks import create_payout
+
+
+class AsyncPayoutViewsTestCase(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="async", password="testpass123")
+        self.client = AsyncClient()
+        self.client.force_login(self.user)
+        self.payouts = [create_payout(recipient_account=f"ACC-ASYNC-{index}") for index in range(3)]
+
+    async def test_list_matches_sync_pagination(self) -> None:
+        response = await self.client.get(reverse("async-payout-list"), {"page_size": 2})
+        self.assertEqual(response.status_code, 200)
+        first = response.json()
+        self.assertEqual(len(first["results"]), 2)
+        self.assertIn("/api/async/payouts/", first["next"])
+
+        second = (await self.client.get(first["next"])).json()
+
+        ids = [row["id"] for row in first["results"] + second["results"]]
+        self.assertEqual(ids, [str(payout.id) for payout in reversed(self.payouts)])
+        self.assertIsNotNone(second["previous"])
+
+    async def test_list_applies_filters(self) -> None:
+        response = await self.client.get(reverse("async-payout-list"), {"status": "bogus"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("status", response.json())
+
+    async def test_list_rejects_mistyped_cursor(self) -> None:
+        cursor = make_cursor(["-created_at", "-id"], ["yesterday", "not-a-uuid"])
+        response = await self.client.get(reverse("async-payout-list"), {"cursor": cursor})
+
+        self.assertEqual(response.status_code, 404)
+
+    async def test_detail_and_status(self) -> None:
+        payout = self.payouts[0]
+        detail = await self.client.get(reverse("async-payout-detail", args=[payout.id]))
+        poll = await self.client.get(reverse("async-payout-status", args=[payout.id]))
+
+        self.assertEqual(detail.json()["recipient_account"], payout.recipient_account)
+        self.assertEqual(set(poll.json()), set(async_views.STATUS_FIELDS))
+        self.assertEqual(poll.json()["status"], PayoutStatus.PENDING)
+
+    async def test_missing_and_anonymous(self) -> None:
+        missing_id = "00000000-0000-0000-0000-000000000000"
+        missing = await self.client.get(reverse("async-payout-status", args=[missing_id]))
+        anonymous = await AsyncClient().get(reverse("async-payout-list"))
+        sync_anonymous = await AsyncClient().get(reverse("payout-list"))
+        write = await self.client.post(reverse("async-payout-list"))
+
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(anonymous.status_code, sync_anonymous.status_code)
+        self.assertEqual(write.status_code, 405)
+
+    async def test_export_streams_asynchronously_under_asgi(self) -> None:
+        with mock.patch.object(CSVRenderer, "batch_size", 1):
+            response = await self.client.get(reverse("payout-export"), {"format": "csv"})
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+
+        rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+        self.assertEqual(len(chunks), len(self.payouts) + 1)
+        self.assertEqual({row[0] for row in rows[1:]}, {str(payout.id) for payout in self.payouts})
+
+    async def test_queries_are_counted_for_async_requests(self) -> None:
+        metrics.REGISTRY.reset()
+
+        await self.client.get(reverse("async-payout-status", args=[self.payouts[0].id]))
+
+        series = metrics.REQUEST_QUERIES.series[("async-payout-status", "GET")]
+        self.assertGreater(series[-1], 0)
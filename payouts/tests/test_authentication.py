@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from payouts import authentication
+from payouts.models import ApiToken, hash_token
+
+
+class PrincipalCacheTestCase(SimpleTestCase):
+    def test_evicts_least_recently_used_and_expired_entries(self) -> None:
+        principals = authentication.PrincipalCache(max_size=2, ttl_seconds=60)
+        principals.set("a", 1)
+        principals.set("b", 2)
+        principals.get("a")
+        principals.set("c", 3)
+
+        self.assertEqual((principals.get("a"), principals.get("b"), principals.get("c")), (1, None, 3))
+
+        expired = authentication.PrincipalCache(max_size=2, ttl_seconds=0)
+        expired.set("a", 1)
+        self.assertIsNone(expired.get("a"))
+
+
+class ApiTokenAuthenticationTestCase(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        authentication.get_principals().clear()
+        self.user = get_user_model().objects.create_user(username="machine", password="testpass123")
+        self.token, self.key = ApiToken.issue(self.user, name="ci")
+        self.url = reverse("payout-list")
+
+    def get(self, key: str | None = None):
+        return self.client.get(self.url, HTTP_AUTHORIZATION=f"Token {key or self.key}")
+
+    def auth_queries(self) -> list[str]:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            query["sql"]
+            for query in queries.captured_queries
+            if "payouts_apitoken" in query["sql"] or "auth_user" in query["sql"]
+        ]
+
+    def test_only_the_hash_is_stored(self) -> None:
+        self.assertNotEqual(self.token.key_hash, self.key)
+        self.assertEqual(self.token.key_hash, hash_token(self.key))
+        self.assertTrue(self.key.startswith(self.token.prefix))
+
+    def test_principal_is_cached_in_process_and_shared_cache(self) -> None:
+        self.assertEqual(len(self.auth_queries()), 1)
+        self.assertEqual(self.auth_queries(), [])
+
+        authentication.get_principals().discard([self.token.key_hash])
+        self.assertEqual(self.auth_queries(), [])
+
+    def test_cached_principal_holds_no_credentials(self) -> None:
+        self.assertEqual(self.get().status_code, status.HTTP_200_OK)
+        self.assertEqual(cache.get(authentication._cache_key(self.token.key_hash)), (self.user.pk, True))
+
+        request = RequestFactory().get(self.url, HTTP_AUTHORIZATION=f"Token {self.key}")
+        first, _ = authentication.ApiTokenAuthentication().authenticate(request)
+        second, _ = authentication.ApiTokenAuthentication().authenticate(request)
+
+        self.assertIsNot(first, second)
+        self.assertIn("password", first.get_deferred_fields())
+        self.assertEqual(first.username, "machine")
+
+    def test_revocation_invalidates_cached_principal(self) -> None:
+        self.assertEqual(self.get().status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.token.revoke()
+
+        response = self.get()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response["WWW-Authenticate"], "Token")
+
+    def test_deactivated_user_is_rejected(self) -> None:
+        self.assertEqual(self.get().status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        self.assertEqual(self.get().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unknown_token_is_rejected(self) -> None:
+        self.assertEqual(self.get("not-a-token").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_issue_command_prints_usable_token(self) -> None:
+        out = StringIO()
+        call_command("issue_api_token", "machine", "--name=deploy", stdout=out)
+
+        key = out.getvalue().strip()
+        self.assertTrue(ApiToken.objects.filter(key_hash=hash_token(key), name="deploy").exists())
+        self.assertEqual(self.get(key).status_code, status.HTTP_200_OK)
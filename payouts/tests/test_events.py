@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from payouts.models import Payout, PayoutEvent, PayoutStatus
+from payouts.tests.test_tasks import create_payout
+
+
+class PayoutEventTestCase(APITestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="audit", password="testpass123")
+        self.client.force_authenticate(self.user)
+
+    def history(self, payout_id) -> list[dict]:
+        response = self.client.get(reverse("payout-history", args=[payout_id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+
+    def test_batch_transition_writes_events_in_one_insert(self) -> None:
+        payouts = [create_payout() for _ in range(20)]
+
+        with CaptureQueriesContext(connection) as queries:
+            Payout.objects.filter(id__in=[payout.id for payout in payouts]).transition(
+                PayoutStatus.PROCESSING
+            )
+
+        inserts = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('INSERT INTO "payouts_payoutevent"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            PayoutEvent.objects.filter(to_status=PayoutStatus.PROCESSING).count(),
+            20,
+        )
+
+    def test_history_streams_lifecycle_and_survives_delete(self) -> None:
+        payload = {
+            "amount": "42.00",
+            "currency": "EUR",
+            "recipient_name": "Audit",
+            "recipient_account": "ACC-AUDIT-1",
+        }
+        payout = Payout.objects.get(pk=self.client.post(reverse("payout-list"), payload).json()["id"])
+        payout.mark_processing()
+        payout.mark_completed()
+        self.client.delete(reverse("payout-detail", args=[payout.id]))
+
+        events = self.history(payout.id)
+
+        self.assertEqual(
+            [(event["from_status"], event["to_status"]) for event in events],
+            [
+                ("", PayoutStatus.PENDING),
+                (PayoutStatus.PENDING, PayoutStatus.PROCESSING),
+                (PayoutStatus.PROCESSING, PayoutStatus.COMPLETED),
+                (PayoutStatus.COMPLETED, ""),
+            ],
+        )
+        self.assertEqual(events[0]["amount"], "42.00")
+
+    def test_history_for_unknown_payout_is_not_found(self) -> None:
+        response = self.client.get(reverse("payout-history", args=["not-a-uuid"]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from payouts.models import OutboxMessage, Payout
+
+
+class PayoutIdempotencyTestCase(APITestCase):
+    payload = {
+        "amount": "99.00",
+        "currency": "USD",
+        "recipient_name": "Retry",
+        "recipient_account": "ACC-RETRY-1",
+    }
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.list_url = reverse("payout-list")
+        self.user = get_user_model().objects.create_user(username="retry", password="testpass123")
+        self.client.force_authenticate(self.user)
+
+    def post(self, key: str, payload: dict | None = None):
+        return self.client.post(
+            self.list_url,
+            payload or self.payload,
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_repeated_key_replays_cached_response(self) -> None:
+        first = self.post("order-1")
+
+        with self.assertNumQueries(0):
+            second = self.post("order-1", {"amount": "not-validated"})
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(Payout.objects.count(), 1)
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+
+    def test_cache_miss_falls_back_to_unique_key(self) -> None:
+        first = self.post("order-2")
+        cache.clear()
+
+        second = self.post("order-2")
+
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.json()["id"], first.json()["id"])
+        self.assertEqual(Payout.objects.count(), 1)
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+
+    def test_cache_miss_replays_before_validation(self) -> None:
+        with self.settings(PAYOUT_VELOCITY_MAX_COUNT=1):
+            first = self.post("order-3")
+            cache.clear()
+
+            retried = self.post("order-3")
+            cache.clear()
+            malformed = self.post("order-3", {"amount": "not-validated"})
+
+        for response in (retried, malformed):
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(response["Idempotent-Replayed"], "true")
+            self.assertEqual(response.json(), first.json())
+        self.assertEqual(Payout.objects.count(), 1)
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+
+    def test_keys_are_scoped_per_user(self) -> None:
+        self.post("shared")
+        other = get_user_model().objects.create_user(username="other", password="testpass123")
+        self.client.force_authenticate(other)
+
+        response = self.post("shared")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn("Idempotent-Replayed", response)
+        self.assertEqual(Payout.objects.count(), 2)
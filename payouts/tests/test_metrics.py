@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from payouts import authentication, metrics, velocity
+from payouts.models import PayoutStatus
+from payouts.tasks import process_payouts_batch
+from payouts.tests.test_tasks import create_payout
+from payouts.tests.test_webhooks import make_dispatcher, stub_webhook_server
+from payouts.webhooks import WebhookJob
+
+
+class HistogramTestCase(SimpleTestCase):
+    def test_renders_cumulative_buckets(self) -> None:
+        histogram = metrics.Histogram("test_seconds", "Test.", ["route"], buckets=(0.1, 1))
+        for value in (0.05, 0.5, 0.7, 5):
+            histogram.observe(value, "a")
+
+        lines = histogram.render()
+
+        self.assertIn('test_seconds_bucket{route="a",le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{route="a",le="1"} 3', lines)
+        self.assertIn('test_seconds_bucket{route="a",le="+Inf"} 4', lines)
+        self.assertIn('test_seconds_count{route="a"} 4', lines)
+        self.assertIn('test_seconds_sum{route="a"} 6.25', lines)
+
+
+class StatsCollectorTestCase(SimpleTestCase):
+    def test_renders_component_stats_as_gauges(self) -> None:
+        collect = metrics.stats_collector("test_cache", "Test cache.", lambda: {"size": 3, "hits": 2})
+
+        self.assertEqual(
+            collect(),
+            [
+                "# HELP test_cache_hits Test cache. (hits).",
+                "# TYPE test_cache_hits gauge",
+                "test_cache_hits 2",
+                "# HELP test_cache_size Test cache. (size).",
+                "# TYPE test_cache_size gauge",
+                "test_cache_size 3",
+            ],
+        )
+
+
+class MetricsEndpointTestCase(APITestCase):
+    def setUp(self) -> None:
+        metrics.REGISTRY.reset()
+        self.user = get_user_model().objects.create_user(
+            username="metrics",
+            password="testpass123",
+            is_staff=True,
+        )
+        self.client.force_authenticate(self.user)
+        self.client.force_login(self.user)
+
+    def test_exposes_request_and_transition_metrics(self) -> None:
+        payload = {
+            "amount": "10.00",
+            "currency": "USD",
+            "recipient_name": "Metrics",
+            "recipient_account": "ACC-METRICS",
+        }
+        response = self.client.post(reverse("payout-list"), payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertIn('payout_status_transitions_total{source="created",target="pending"} 1', body)
+        self.assertIn('payout_stage_duration_seconds_count{stage="perform_create"} 1', body)
+        self.assertIn(
+            'payout_http_request_duration_seconds_count{view="payout-list",method="POST",status="201"} 1',
+            body,
+        )
+        self.assertEqual(metrics.REQUEST_QUERIES.count("payout-list", "POST"), 1)
+
+    def test_endpoint_requires_staff_or_allowlisted_address(self) -> None:
+        regular = get_user_model().objects.create_user(username="merchant", password="testpass123")
+        anonymous = self.client_class().get(reverse("metrics"))
+        merchant = self.client_class()
+        merchant.force_login(regular)
+        scraper = self.client_class(REMOTE_ADDR="10.0.0.9")
+
+        with self.settings(PAYOUT_METRICS_ALLOWED_IPS=["10.0.0.9"]):
+            allowlisted = scraper.get(reverse("metrics"))
+
+        self.assertEqual(anonymous.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(merchant.get(reverse("metrics")).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(allowlisted.status_code, status.HTTP_200_OK)
+
+    def test_unknown_methods_share_one_label(self) -> None:
+        self.client.generic("BREW", reverse("payout-list"))
+
+        self.assertEqual(metrics.REQUEST_QUERIES.count("payout-list", "OTHER"), 1)
+        self.assertEqual(metrics.REQUEST_QUERIES.count("payout-list", "BREW"), 0)
+
+    def test_exposes_registered_component_stats(self) -> None:
+        authentication.get_principals().get("missing")
+        with self.settings(PAYOUT_VELOCITY_STORE="payouts.velocity.LocalVelocityStore"):
+            velocity.get_store().usage("ACC-METRICS")
+            body = self.client.get(reverse("metrics")).content.decode()
+
+        self.assertIn("# TYPE payout_auth_principal_cache_size gauge", body)
+        self.assertIn("payout_velocity_store_accounts 0", body)
+
+
+class TaskMetricsTestCase(TestCase):
+    def setUp(self) -> None:
+        metrics.REGISTRY.reset()
+
+    def test_task_runtime_and_queries_are_recorded(self) -> None:
+        payout = create_payout()
+
+        process_payouts_batch.apply(args=([str(payout.id)],))
+
+        name = process_payouts_batch.name
+        self.assertEqual(metrics.TASK_DURATION.count(name, "SUCCESS"), 1)
+        self.assertEqual(metrics.TASK_QUERIES.count(name), 1)
+        self.assertGreater(metrics.TASK_QUERIES.series[(name,)][-1], 0)
+        self.assertEqual(
+            metrics.STATUS_TRANSITIONS.value(PayoutStatus.PENDING, PayoutStatus.PROCESSING),
+            1,
+        )
+
+
+class LabelLimiterTestCase(SimpleTestCase):
+    def test_values_beyond_the_limit_are_collapsed(self) -> None:
+        limit = metrics.LabelLimiter(2)
+
+        labels = [limit(host) for host in ("a.example", "b.example", "c.example", "a.example")]
+
+        self.assertEqual(labels, ["a.example", "b.example", "other", "a.example"])
+
+
+class WebhookMetricsTestCase(SimpleTestCase):
+    def test_latency_is_recorded_per_host(self) -> None:
+        metrics.REGISTRY.reset()
+        with stub_webhook_server(responses=[500]) as server:
+            asyncio.run(make_dispatcher().deliver([WebhookJob("1", server.url, b"{}")]))
+
+        self.assertEqual(metrics.WEBHOOK_DURATION.count("127.0.0.1", "http_5xx"), 1)
+        self.assertEqual(metrics.WEBHOOK_DURATION.count("127.0.0.1", "delivered"), 1)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from payouts.models import (
+    ALLOWED_TRANSITIONS,
+    TERMINAL_STATUSES,
+    CurrencyChoices,
+    Payout,
+    PayoutStatus,
+)
+
+
+class PayoutTransitionTestCase(TestCase):
+    def setUp(self) -> None:
+        self.payout = Payout.objects.create(
+            amount="42.00",
+            currency=CurrencyChoices.USD,
+            recipient_name="Eve",
+            recipient_account="ACC-EVE-1",
+        )
+
+    def test_transition_table_covers_all_statuses(self) -> None:
+        self.assertEqual(set(ALLOWED_TRANSITIONS), set(PayoutStatus.values))
+        for status in TERMINAL_STATUSES:
+            self.assertFalse(ALLOWED_TRANSITIONS[status])
+
+    def test_transition_is_single_conditional_update(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(self.payout.mark_processing())
+
+        payout_queries = [
+            query["sql"] for query in queries.captured_queries if '"payouts_payout"' in query["sql"]
+        ]
+        self.assertEqual(len(payout_queries), 1)
+        self.assertTrue(payout_queries[0].startswith("UPDATE"))
+
+        self.assertEqual(self.payout.status, PayoutStatus.PROCESSING)
+        self.payout.refresh_from_db()
+        self.assertEqual(self.payout.status, PayoutStatus.PROCESSING)
+
+    def test_stale_instance_cannot_double_transition(self) -> None:
+        stale = Payout.objects.get(pk=self.payout.pk)
+        self.assertTrue(self.payout.mark_processing())
+        self.assertTrue(self.payout.mark_completed())
+
+        self.assertFalse(stale.mark_processing())
+        self.assertEqual(stale.status, PayoutStatus.PENDING)
+        self.payout.refresh_from_db()
+        self.assertEqual(self.payout.status, PayoutStatus.COMPLETED)
+
+    def test_queryset_transition_returns_rows_affected(self) -> None:
+        Payout.objects.create(
+            amount="10.00",
+            currency=CurrencyChoices.EUR,
+            recipient_name="Finished",
+            recipient_account="ACC-DONE-1",
+            status=PayoutStatus.COMPLETED,
+        )
+
+        updated = Payout.objects.all().transition(PayoutStatus.PROCESSING)
+
+        self.assertEqual(updated, 1)
+        self.assertEqual(Payout.objects.filter(status=PayoutStatus.PROCESSING).count(), 1)
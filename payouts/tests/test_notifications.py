@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+
+from payouts import notifications
+from payouts.models import Payout, PayoutStatus
+from payouts.tests.test_tasks import create_payout
+
+
+class StatusPublishTestCase(TestCase):
+    def test_transitions_publish_after_commit(self) -> None:
+        payouts = [create_payout() for _ in range(2)]
+        queryset = Payout.objects.filter(id__in=[payout.id for payout in payouts])
+
+        with mock.patch.object(notifications.LocalStatusBroker, "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                queryset.transition(PayoutStatus.PROCESSING)
+            publish.assert_not_called()
+            for callback in callbacks:
+                callback()
+
+        published = [update for call in publish.call_args_list for update in call.args[0]]
+        self.assertEqual(
+            sorted(published),
+            sorted((payout.id, PayoutStatus.PROCESSING) for payout in payouts),
+        )
+
+
+class StatusWaitTestCase(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="waiter", password="testpass123")
+        self.client = AsyncClient()
+        self.client.force_login(self.user)
+        self.payout = create_payout()
+        self.url = reverse("async-payout-status-wait", args=[self.payout.id])
+
+    async def test_returns_immediately_when_status_already_changed(self) -> None:
+        started = time.monotonic()
+        response = await self.client.get(self.url, {"status": PayoutStatus.PROCESSING, "timeout": 5})
+
+        self.assertEqual(response.json()["status"], PayoutStatus.PENDING)
+        self.assertLess(time.monotonic() - started, 1)
+
+    async def test_times_out_with_current_status(self) -> None:
+        response = await self.client.get(self.url, {"timeout": "0.05"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], PayoutStatus.PENDING)
+
+    async def test_wakes_up_on_notification(self) -> None:
+        request = asyncio.ensure_future(self.client.get(self.url, {"timeout": 5}))
+        await asyncio.sleep(0.1)
+        self.assertFalse(request.done())
+
+        await sync_to_async(Payout.objects.filter(pk=self.payout.pk).update)(status=PayoutStatus.PROCESSING)
+        notifications.get_broker().publish([(self.payout.id, PayoutStatus.PROCESSING)])
+        response = await asyncio.wait_for(request, 1)
+
+        self.assertEqual(response.json()["status"], PayoutStatus.PROCESSING)
+        self.assertEqual(notifications.get_broker().subscriptions, {})
+
+    async def test_rejects_invalid_timeout(self) -> None:
+        response = await self.client.get(self.url, {"timeout": "soon"})
+
+        self.assertEqual(response.status_code, 400)
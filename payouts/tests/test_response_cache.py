@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from payouts import response_cache
+from payouts.models import PayoutStatus
+from payouts.tests.test_tasks import create_payout
+
+
+class PayoutResponseCacheTestCase(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="cached", password="testpass123")
+        self.client.force_authenticate(self.user)
+        self.payout = create_payout()
+        self.url = reverse("payout-detail", args=[self.payout.id])
+
+    def payout_queries(self, **headers) -> tuple:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, **headers)
+        return response, [query for query in queries.captured_queries if "payouts_payout" in query["sql"]]
+
+    def test_second_retrieve_is_served_from_cache(self) -> None:
+        first, first_queries = self.payout_queries()
+        second, second_queries = self.payout_queries()
+
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertEqual(len(first_queries), 1)
+        self.assertEqual(second_queries, [])
+
+    def test_if_none_match_returns_not_modified(self) -> None:
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"stale", {etag}')
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_transitions_and_patch_invalidate(self) -> None:
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.payout.mark_processing()
+        processing = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(processing.status_code, status.HTTP_200_OK)
+        self.assertEqual(processing.json()["status"], PayoutStatus.PROCESSING)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.url, {"recipient_name": "Renamed"}, format="json")
+        self.assertEqual(self.client.get(self.url).json()["recipient_name"], "Renamed")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(self.url)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_fill_that_lands_after_invalidation_is_ignored(self) -> None:
+        stale = self.client.get(self.url).json()
+        cache.clear()
+        # A reader misses and reads the row, then the transition commits before it fills the cache.
+        generation = response_cache.get(self.payout.id).generation
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.payout.mark_processing()
+        response_cache.store(self.payout.id, stale, generation)
+
+        self.assertIsNone(response_cache.get(self.payout.id).entry)
+        self.assertEqual(self.client.get(self.url).json()["status"], PayoutStatus.PROCESSING)
+
+    def test_terminal_payouts_use_long_ttl(self) -> None:
+        with self.settings(PAYOUT_RETRIEVE_CACHE_TTL_SECONDS=0):
+            self.client.get(self.url)
+            self.assertIsNone(response_cache.get(self.payout.id).entry)
+
+            completed = create_payout(status=PayoutStatus.COMPLETED)
+            self.client.get(reverse("payout-detail", args=[completed.id]))
+            self.assertIsNotNone(response_cache.get(completed.id).entry)
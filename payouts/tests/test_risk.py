@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from payouts.models import CurrencyChoices, Payout, PayoutStatus
+from payouts.risk import (
+    RISK_FIELDS,
+    BlocklistRule,
+    CurrencyLimitRule,
+    RiskCandidate,
+    RiskEngine,
+    VelocityRule,
+)
+from payouts.tasks import finalize_payouts_batch
+from payouts.tests.test_tasks import create_payout
+
+
+def candidates_for(*payouts: Payout) -> list[RiskCandidate]:
+    return [
+        RiskCandidate(*row)
+        for row in Payout.objects.filter(id__in=[payout.id for payout in payouts])
+        .order_by("created_at")
+        .values_list(*RISK_FIELDS)
+    ]
+
+
+class RiskRuleTestCase(TestCase):
+    def test_currency_limits_fall_back_to_default(self) -> None:
+        usd = create_payout(amount="600.00", currency=CurrencyChoices.USD)
+        eur = create_payout(amount="600.00", currency=CurrencyChoices.EUR)
+        engine = RiskEngine([CurrencyLimitRule({"USD": "500"}, default="1000")])
+
+        flagged = engine.evaluate(candidates_for(usd, eur))
+
+        self.assertEqual(flagged, {usd.id: ["currency_limit"]})
+
+    def test_blocklist_matches_normalized_accounts(self) -> None:
+        blocked = create_payout(recipient_account="ACC-BLOCKED")
+        allowed = create_payout(recipient_account="ACC-ALLOWED")
+        engine = RiskEngine([BlocklistRule(["acc-blocked "])])
+
+        self.assertEqual(engine.evaluate(candidates_for(blocked, allowed)), {blocked.id: ["blocklist"]})
+
+    def test_velocity_counts_recent_payouts_and_earlier_batch_items(self) -> None:
+        create_payout(recipient_account="ACC-VELOCITY", status=PayoutStatus.COMPLETED)
+        create_payout(recipient_account="ACC-VELOCITY", status=PayoutStatus.FAILED)
+        old = create_payout(recipient_account="ACC-VELOCITY", status=PayoutStatus.COMPLETED)
+        Payout.objects.filter(id=old.id).update(created_at=timezone.now() - timedelta(hours=2))
+        first = create_payout(recipient_account="ACC-VELOCITY")
+        second = create_payout(recipient_account="ACC-VELOCITY")
+        other = create_payout(recipient_account="ACC-OTHER")
+        engine = RiskEngine([VelocityRule(timedelta(hours=1), max_count=2)])
+
+        flagged = engine.evaluate(candidates_for(first, second, other))
+
+        self.assertEqual(flagged, {second.id: ["velocity"]})
+
+    def test_velocity_limits_amount(self) -> None:
+        create_payout(recipient_account="ACC-VELOCITY", amount="700.00")
+        small = create_payout(recipient_account="ACC-VELOCITY", amount="200.00")
+        large = create_payout(recipient_account="ACC-VELOCITY", amount="500.00")
+        engine = RiskEngine([VelocityRule(timedelta(hours=1), max_amount=Decimal("1000"))])
+
+        self.assertEqual(engine.evaluate(candidates_for(small, large)), {large.id: ["velocity"]})
+
+    def test_velocity_ignores_payouts_created_after_the_candidate(self) -> None:
+        earlier = create_payout(recipient_account="ACC-VELOCITY")
+        later = [create_payout(recipient_account="ACC-VELOCITY") for _ in range(3)]
+        engine = RiskEngine([VelocityRule(timedelta(hours=1), max_count=2)])
+
+        self.assertEqual(engine.evaluate(candidates_for(earlier)), {})
+        self.assertEqual(engine.evaluate(candidates_for(later[-1])), {later[-1].id: ["velocity"]})
+
+    def test_batch_evaluation_uses_one_query(self) -> None:
+        payouts = [create_payout(recipient_account=f"ACC-BATCH-{index % 7}") for index in range(50)]
+        candidates = candidates_for(*payouts)
+        engine = RiskEngine(
+            [
+                CurrencyLimitRule({}, default="1000000"),
+                BlocklistRule(["ACC-BATCH-1"]),
+                VelocityRule(timedelta(hours=1), max_count=5),
+            ]
+        )
+
+        with self.assertNumQueries(1):
+            flagged = engine.evaluate(candidates)
+
+        self.assertEqual(len([rules for rules in flagged.values() if "blocklist" in rules]), 7)
+
+
+class RiskEngineSettingsTestCase(TestCase):
+    def test_split_batches_pass_the_earliest_payouts(self) -> None:
+        started = timezone.now() - timedelta(minutes=30)
+        payouts = [
+            create_payout(status=PayoutStatus.PROCESSING, recipient_account="ACC-SPLIT") for _ in range(30)
+        ]
+        for index, payout in enumerate(payouts):
+            Payout.objects.filter(id=payout.id).update(created_at=started + timedelta(seconds=index))
+        batches = [[str(payout.id) for payout in payouts[start : start + 10]] for start in (0, 10, 20)]
+
+        with self.settings(
+            PAYOUT_RISK_RULES=["payouts.risk.VelocityRule"],
+            PAYOUT_RISK_VELOCITY_MAX_COUNT=20,
+        ):
+            for batch in batches:
+                finalize_payouts_batch.apply(args=(batch,))
+
+        statuses = dict(Payout.objects.values_list("id", "status"))
+        self.assertEqual(
+            [statuses[payout.id] for payout in payouts],
+            [PayoutStatus.COMPLETED] * 20 + [PayoutStatus.FAILED] * 10,
+        )
+
+    def test_finalize_batch_uses_configured_rules(self) -> None:
+        blocked = create_payout(status=PayoutStatus.PROCESSING, recipient_account="ACC-FRAUD")
+        regular = create_payout(status=PayoutStatus.PROCESSING)
+
+        with self.settings(PAYOUT_RISK_BLOCKED_ACCOUNTS=["ACC-FRAUD"]):
+            finalize_payouts_batch.apply(args=([str(blocked.id), str(regular.id)],))
+
+        blocked.refresh_from_db()
+        regular.refresh_from_db()
+        self.assertEqual(blocked.status, PayoutStatus.FAILED)
+        self.assertEqual(regular.status, PayoutStatus.COMPLETED)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from payouts import rollups
+from payouts.models import CurrencyChoices, Payout, PayoutRollup, PayoutStatus
+
+
+class PayoutRollupTestCase(APITestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="ops", password="testpass123")
+        self.client.force_authenticate(self.user)
+
+    def create(self, amount: str, currency: str = "USD") -> Payout:
+        payload = {
+            "amount": amount,
+            "currency": currency,
+            "recipient_name": "Ops",
+            "recipient_account": "ACC-OPS-01",
+        }
+        response = self.client.post(reverse("payout-list"), payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Payout.objects.get(pk=response.data["id"])
+
+    def summary(self) -> dict[tuple[str, str], tuple[int, Decimal]]:
+        response = self.client.get(reverse("payout-summary"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {
+            (row["currency"], row["status"]): (row["count"], Decimal(row["amount_total"]))
+            for row in response.json()
+        }
+
+    def test_summary_tracks_creates_and_transitions(self) -> None:
+        first = self.create("10.00")
+        self.create("5.50")
+        self.create("7.00", currency="EUR")
+        first.mark_processing()
+        Payout.objects.filter(currency=CurrencyChoices.EUR).transition(PayoutStatus.CANCELLED)
+
+        self.assertEqual(
+            self.summary(),
+            {
+                ("EUR", "cancelled"): (1, Decimal("7.00")),
+                ("USD", "pending"): (1, Decimal("5.50")),
+                ("USD", "processing"): (1, Decimal("10.00")),
+            },
+        )
+
+    def test_summary_tracks_updates_and_deletes(self) -> None:
+        payout = self.create("10.00")
+        removed = self.create("3.00")
+        detail = reverse("payout-detail", args=[payout.id])
+
+        self.client.patch(detail, {"status": "cancelled", "amount": "12.00"}, format="json")
+        self.client.delete(reverse("payout-detail", args=[removed.id]))
+
+        self.assertEqual(self.summary(), {("USD", "cancelled"): (1, Decimal("12.00"))})
+
+    def test_bulk_create_updates_rollups_once_per_bucket(self) -> None:
+        payload = [
+            {"amount": "1.00", "currency": "GBP", "recipient_name": "Bulk", "recipient_account": "ACC-BULK-1"}
+            for _ in range(5)
+        ]
+        self.client.post(reverse("payout-bulk-create"), payload, format="json")
+
+        self.assertEqual(self.summary(), {("GBP", "pending"): (5, Decimal("5.00"))})
+        self.assertEqual(PayoutRollup.objects.count(), 1)
+
+    def test_rebuild_command_recomputes_from_payouts(self) -> None:
+        self.create("10.00")
+        Payout.objects.create(
+            amount="4.00",
+            currency=CurrencyChoices.RUB,
+            recipient_name="Direct",
+            recipient_account="ACC-DIRECT",
+        )
+
+        call_command("rebuild_payout_rollups", stdout=StringIO())
+
+        self.assertEqual(
+            self.summary(),
+            {
+                ("RUB", "pending"): (1, Decimal("4.00")),
+                ("USD", "pending"): (1, Decimal("10.00")),
+            },
+        )
+        self.assertEqual(len(rollups.summarize()), 2)
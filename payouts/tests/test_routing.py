@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connections
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from payouts import routing
+from payouts.models import Payout
+from payouts.tasks import process_payouts_batch
+from payouts.tests.test_tasks import create_payout
+
+REPLICA = "replica"
+
+
+class ReplicaRoutingTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        connections.settings[REPLICA] = {**connections.settings["default"], "NAME": ":memory:", "TEST": {}}
+        call_command("migrate", database=REPLICA, verbosity=0)
+        Payout.objects.using(REPLICA).create(
+            amount="5.00",
+            currency="USD",
+            recipient_name="Replica",
+            recipient_account="ACC-REPLICA",
+        )
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        super().tearDownClass()
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_superuser(username="replica", password="testpass123")
+        self.client = APIClient()
+        self.client.force_login(self.user)
+        self.on_primary = create_payout(recipient_account="ACC-PRIMARY")
+
+    def accounts(self) -> set[str]:
+        response = self.client.get(reverse("payout-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {row["recipient_account"] for row in response.json()["results"]}
+
+    def test_reads_go_to_primary_without_replicas(self) -> None:
+        with self.settings(PAYOUT_READ_REPLICAS=[]):
+            self.assertEqual(self.accounts(), {"ACC-PRIMARY"})
+
+    def test_safe_reads_go_to_replica(self) -> None:
+        with self.settings(PAYOUT_READ_REPLICAS=[REPLICA]):
+            self.assertEqual(self.accounts(), {"ACC-REPLICA"})
+            export = self.client.get(reverse("payout-export"))
+            admin = self.client.get(reverse("admin:payouts_payout_changelist"))
+
+        self.assertIn(b"ACC-REPLICA", b"".join(export.streaming_content))
+        self.assertContains(admin, "Replica")
+
+    def test_retrieve_cache_is_filled_from_primary(self) -> None:
+        stale = Payout.objects.using(REPLICA).create(
+            id=self.on_primary.id,
+            amount="5.00",
+            currency="USD",
+            recipient_name="Stale",
+            recipient_account="ACC-PRIMARY",
+        )
+        self.addCleanup(Payout.objects.using(REPLICA).filter(id=stale.id).delete)
+        url = reverse("payout-detail", args=[self.on_primary.id])
+
+        with self.settings(PAYOUT_READ_REPLICAS=[REPLICA]):
+            with self.settings(
+                PAYOUT_RETRIEVE_CACHE_TTL_SECONDS=0,
+                PAYOUT_RETRIEVE_CACHE_TERMINAL_TTL_SECONDS=0,
+            ):
+                uncached = self.client.get(url)
+            cached = self.client.get(url)
+
+        self.assertEqual(cached.json()["recipient_name"], self.on_primary.recipient_name)
+        self.assertEqual(uncached.json()["recipient_name"], "Stale")
+
+    def test_reads_stick_to_primary_after_write(self) -> None:
+        payload = {
+            "amount": "10.00",
+            "currency": "USD",
+            "recipient_name": "Writer",
+            "recipient_account": "ACC-WRITER",
+        }
+        with self.settings(PAYOUT_READ_REPLICAS=[REPLICA]):
+            response = self.client.post(reverse("payout-list"), payload, format="json")
+            self.assertIn(routing.PIN_COOKIE, response.cookies)
+            self.assertEqual(self.accounts(), {"ACC-PRIMARY", "ACC-WRITER"})
+            self.client.cookies.pop(routing.PIN_COOKIE)
+            self.assertEqual(self.accounts(), {"ACC-REPLICA"})
+
+    def test_tasks_use_primary(self) -> None:
+        with self.settings(PAYOUT_READ_REPLICAS=[REPLICA]):
+            process_payouts_batch.apply(args=([str(self.on_primary.id)],))
+
+        self.on_primary.refresh_from_db()
+        self.assertEqual(self.on_primary.status, "processing")
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from payouts.models import CurrencyChoices, Payout, PayoutStatus
+from payouts.tasks import finalize_due_payouts, finalize_payouts_batch, process_payouts_batch
+
+
+def create_payout(**overrides) -> Payout:
+    fields = {
+        "amount": "100.00",
+        "currency": CurrencyChoices.USD,
+        "recipient_name": "Batch",
+        "recipient_account": "ACC-BATCH",
+    }
+    fields.update(overrides)
+    return Payout.objects.create(**fields)
+
+
+class PayoutBatchTaskTestCase(TestCase):
+    def test_process_batch_moves_pending_to_processing(self) -> None:
+        pending = create_payout()
+        completed = create_payout(status=PayoutStatus.COMPLETED)
+        started = timezone.now()
+
+        with self.settings(PAYOUT_PROCESSING_DELAY_SECONDS=30):
+            process_payouts_batch.apply(args=([str(pending.id), str(completed.id)],))
+
+        pending.refresh_from_db()
+        completed.refresh_from_db()
+        self.assertEqual(pending.status, PayoutStatus.PROCESSING)
+        self.assertGreaterEqual(pending.finalize_after, started + timedelta(seconds=30))
+        self.assertEqual(completed.status, PayoutStatus.COMPLETED)
+        self.assertIsNone(completed.finalize_after)
+
+    @mock.patch("payouts.tasks.send_payout_webhooks.delay")
+    def test_finalize_batch_applies_risk_check(self, mock_webhook: mock.Mock) -> None:
+        regular = create_payout(
+            status=PayoutStatus.PROCESSING,
+            callback_url="https://example.com/webhook",
+        )
+        risky = create_payout(amount="1000000.00", status=PayoutStatus.PROCESSING)
+        pending = create_payout()
+
+        finalize_payouts_batch.apply(args=([str(regular.id), str(risky.id), str(pending.id)],))
+
+        regular.refresh_from_db()
+        risky.refresh_from_db()
+        pending.refresh_from_db()
+        self.assertEqual(regular.status, PayoutStatus.COMPLETED)
+        self.assertEqual(risky.status, PayoutStatus.FAILED)
+        self.assertEqual(pending.status, PayoutStatus.PENDING)
+        mock_webhook.assert_called_once_with([str(regular.id)])
+
+    def test_process_batch_query_count_does_not_grow_with_batch(self) -> None:
+        def run_batch(size: int) -> int:
+            payout_ids = [str(create_payout().id) for _ in range(size)]
+            with CaptureQueriesContext(connection) as queries:
+                process_payouts_batch.apply(args=(payout_ids,))
+            return len(queries.captured_queries)
+
+        with self.settings(PAYOUT_ROLLUP_SHARDS=1):
+            run_batch(1)
+            self.assertEqual(run_batch(2), run_batch(20))
+
+
+class FinalizeSweeperTestCase(TestCase):
+    def create_processing(self, due_in: int, **overrides) -> Payout:
+        return create_payout(
+            status=PayoutStatus.PROCESSING,
+            finalize_after=timezone.now() + timedelta(seconds=due_in),
+            **overrides,
+        )
+
+    @mock.patch("payouts.tasks.send_payout_webhooks.delay")
+    def test_sweeper_finalizes_only_due_payouts(self, mock_webhook: mock.Mock) -> None:
+        due = self.create_processing(-1, callback_url="https://example.com/webhook")
+        risky = self.create_processing(-1, amount="1000000.00")
+        later = self.create_processing(60)
+
+        finalize_due_payouts.apply()
+
+        for payout in (due, risky, later):
+            payout.refresh_from_db()
+        self.assertEqual(due.status, PayoutStatus.COMPLETED)
+        self.assertIsNone(due.finalize_after)
+        self.assertEqual(risky.status, PayoutStatus.FAILED)
+        self.assertEqual(later.status, PayoutStatus.PROCESSING)
+        mock_webhook.assert_called_once_with([str(due.id)])
+
+    def test_sweeper_works_in_bounded_chunks(self) -> None:
+        for _ in range(5):
+            self.create_processing(-1)
+
+        with self.settings(PAYOUT_FINALIZE_CHUNK_SIZE=2, PAYOUT_FINALIZE_MAX_CHUNKS=2):
+            finalize_due_payouts.apply()
+
+        self.assertEqual(Payout.objects.filter(status=PayoutStatus.COMPLETED).count(), 4)
+        self.assertEqual(Payout.objects.filter(status=PayoutStatus.PROCESSING).count(), 1)
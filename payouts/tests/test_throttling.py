@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from unittest import mock
+
+import redis
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from payouts import metrics
+from payouts.models import ApiToken
+from payouts.tests.test_tasks import create_payout
+from payouts.throttling import LocalTokenBucketStore, RedisTokenBucketStore
+
+WRITE_LIMITED = {"read": None, "write": "2/min"}
+
+
+class TokenBucketStoreTestCase(SimpleTestCase):
+    def test_bucket_refills_at_rate_up_to_capacity(self) -> None:
+        store = LocalTokenBucketStore()
+
+        waits = [store.take("client", rate=1, capacity=2, now=0) for _ in range(3)]
+
+        self.assertEqual(waits, [0.0, 0.0, 1.0])
+        self.assertEqual(store.take("client", rate=1, capacity=2, now=1.5), 0.0)
+        self.assertEqual(store.take("other", rate=1, capacity=2, now=1.5), 0.0)
+
+    def test_cost_above_capacity_needs_a_full_bucket_and_leaves_debt(self) -> None:
+        store = LocalTokenBucketStore()
+
+        self.assertEqual(store.take("client", rate=1, capacity=2, cost=5, now=0), 0.0)
+        self.assertEqual(store.take("client", rate=1, capacity=2, cost=1, now=1), 3.0)
+        self.assertEqual(store.take("client", rate=1, capacity=2, cost=5, now=4), 1.0)
+
+    def test_redis_store_falls_back_to_local_buckets(self) -> None:
+        store = RedisTokenBucketStore("redis://127.0.0.1:1/0")
+
+        with self.assertLogs("payouts.throttling", "WARNING"):
+            waits = [store.take("client", rate=0.01, capacity=1) for _ in range(2)]
+
+        self.assertEqual(waits[0], 0.0)
+        self.assertGreater(waits[1], 0)
+
+
+    def test_open_breaker_skips_redis(self) -> None:
+        store = RedisTokenBucketStore("redis://127.0.0.1:1/0", breaker_seconds=60)
+        store.script = mock.Mock(side_effect=redis.ConnectionError("down"))
+
+        with self.assertLogs("payouts.throttling", "WARNING") as logs:
+            for _ in range(3):
+                store.take("client", rate=1, capacity=5)
+        store.open_until = 0
+        with self.assertLogs("payouts.throttling", "WARNING"):
+            store.take("client", rate=1, capacity=5)
+
+        self.assertEqual(len(logs.output), 1)
+        self.assertEqual(store.script.call_count, 2)
+
+
+class PayoutThrottleTestCase(APITestCase):
+    def setUp(self) -> None:
+        metrics.REGISTRY.reset()
+        self.user = get_user_model().objects.create_user(username="bursty", password="testpass123")
+        self.client.force_authenticate(self.user)
+        self.payload = {
+            "amount": "10.00",
+            "currency": "USD",
+            "recipient_name": "Bursty",
+            "recipient_account": "ACC-BURSTY",
+        }
+
+    def test_writes_are_limited_per_client(self) -> None:
+        other = get_user_model().objects.create_user(username="calm", password="testpass123")
+        with self.settings(PAYOUT_THROTTLE_RATES=WRITE_LIMITED):
+            created = [
+                self.client.post(reverse("payout-list"), self.payload, format="json") for _ in range(3)
+            ]
+            listed = self.client.get(reverse("payout-list"))
+            self.client.force_authenticate(other)
+            other_created = self.client.post(reverse("payout-list"), self.payload, format="json")
+
+        self.assertEqual([response.status_code for response in created], [201, 201, 429])
+        self.assertEqual(created[-1]["Retry-After"], "30")
+        self.assertEqual(listed.status_code, status.HTTP_200_OK)
+        self.assertEqual(other_created.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(metrics.REQUESTS_REJECTED.value("rate_limit"), 1)
+
+    def test_bulk_create_costs_one_token_per_item(self) -> None:
+        url = reverse("payout-bulk-create")
+        with self.settings(PAYOUT_THROTTLE_RATES={"read": None, "write": "5/min"}):
+            first = self.client.post(url, [self.payload] * 3, format="json")
+            second = self.client.post(url, [self.payload] * 3, format="json")
+            single = self.client.post(reverse("payout-list"), self.payload, format="json")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(single.status_code, status.HTTP_201_CREATED)
+
+    def test_tokens_get_their_own_buckets(self) -> None:
+        keys = [ApiToken.issue(self.user)[1] for _ in range(2)]
+        self.client.force_authenticate(None)
+        url = reverse("payout-list")
+        with self.settings(PAYOUT_THROTTLE_RATES=WRITE_LIMITED):
+            first = [
+                self.client.post(url, self.payload, format="json", HTTP_AUTHORIZATION=f"Token {keys[0]}")
+                for _ in range(3)
+            ]
+            second = self.client.post(url, self.payload, format="json", HTTP_AUTHORIZATION=f"Token {keys[1]}")
+
+        self.assertEqual(first[-1].status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+
+    def test_creates_are_rejected_when_backlog_is_full(self) -> None:
+        create_payout()
+        create_payout()
+
+        with self.settings(PAYOUT_ADMISSION_MAX_BACKLOG=2, PAYOUT_ADMISSION_RETRY_AFTER_SECONDS=7):
+            rejected = self.client.post(reverse("payout-list"), self.payload, format="json")
+            bulk = self.client.post(reverse("payout-bulk-create"), [self.payload], format="json")
+            listed = self.client.get(reverse("payout-list"))
+        with self.settings(PAYOUT_ADMISSION_MAX_BACKLOG=3):
+            accepted = self.client.post(reverse("payout-list"), self.payload, format="json")
+
+        self.assertEqual(rejected.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(rejected["Retry-After"], "7")
+        self.assertEqual(bulk.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(listed.status_code, status.HTTP_200_OK)
+        self.assertEqual(accepted.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(metrics.REQUESTS_REJECTED.value("backlog"), 2)
+
+    def test_async_reads_share_the_read_bucket(self) -> None:
+        payout = create_payout()
+        self.client.force_login(self.user)
+        url = reverse("async-payout-status", args=[payout.id])
+        with self.settings(PAYOUT_THROTTLE_RATES={"read": "1/min", "write": None}):
+            first = self.client.get(url)
+            second = self.client.get(url)
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(second["Retry-After"], "60")
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from payouts.velocity import CacheVelocityStore, LocalVelocityStore, VelocityUsage
+
+
+class LocalVelocityStoreTestCase(SimpleTestCase):
+    def test_usage_slides_with_window(self) -> None:
+        store = LocalVelocityStore(window_seconds=300, bucket_seconds=60)
+        store.record("ACC-1", Decimal("10.50"), now=0)
+        store.record_many([("ACC-1", Decimal("5.25")), ("ACC-2", Decimal("1.00"))], now=120)
+
+        self.assertEqual(store.usage("ACC-1", now=240), VelocityUsage(2, Decimal("15.75")))
+        self.assertEqual(store.usage("ACC-1", now=300), VelocityUsage(1, Decimal("5.25")))
+        self.assertEqual(store.usage("ACC-3", now=300), VelocityUsage(0, Decimal("0")))
+        self.assertEqual(store.stats()["hits"], 2)
+        self.assertEqual(store.stats()["misses"], 1)
+
+    def test_expired_buckets_are_evicted(self) -> None:
+        store = LocalVelocityStore(window_seconds=120, bucket_seconds=60)
+        store.record("ACC-1", Decimal("1.00"), now=0)
+        self.assertEqual(store.stats()["accounts"], 1)
+        self.assertGreater(store.stats()["memory_bytes"], 0)
+
+        store.record("ACC-2", Decimal("1.00"), now=600)
+
+        stats = store.stats()
+        self.assertEqual((stats["accounts"], stats["buckets"]), (1, 1))
+
+
+class CacheVelocityStoreTestCase(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_counters_are_shared_through_cache(self) -> None:
+        writer = CacheVelocityStore(window_seconds=300, bucket_seconds=60)
+        reader = CacheVelocityStore(window_seconds=300, bucket_seconds=60)
+        writer.record_many([("ACC-1", Decimal("2.00")), ("ACC-1", Decimal("3.00"))], now=60)
+        writer.record("ACC-1", Decimal("4.00"), now=200)
+
+        self.assertEqual(reader.usage("ACC-1", now=299), VelocityUsage(3, Decimal("9.00")))
+        self.assertEqual(reader.usage("ACC-1", now=400), VelocityUsage(1, Decimal("4.00")))
+        self.assertEqual(writer.stats()["writes"], 4)
+
+
+class PayoutVelocityLimitTestCase(APITestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="velocity", password="testpass123")
+        self.client.force_authenticate(self.user)
+
+    def post(self, account: str, amount: str = "10.00"):
+        payload = {
+            "amount": amount,
+            "currency": "USD",
+            "recipient_name": "Velocity",
+            "recipient_account": account,
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse("payout-list"), payload, format="json")
+
+    def test_create_rejects_payouts_over_count_limit(self) -> None:
+        with self.settings(
+            PAYOUT_VELOCITY_STORE="payouts.velocity.LocalVelocityStore",
+            PAYOUT_VELOCITY_MAX_COUNT=2,
+        ):
+            self.assertEqual(self.post("ACC-LIMIT-1").status_code, status.HTTP_201_CREATED)
+            self.assertEqual(self.post("ACC-LIMIT-1").status_code, status.HTTP_201_CREATED)
+            rejected = self.post("ACC-LIMIT-1")
+            other = self.post("ACC-LIMIT-2")
+
+        self.assertEqual(rejected.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("recipient_account", rejected.json())
+        self.assertEqual(other.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_create_counts_towards_amount_limit(self) -> None:
+        payload = [
+            {
+                "amount": "60.00",
+                "currency": "USD",
+                "recipient_name": "Velocity",
+                "recipient_account": "ACC-LIMIT-3",
+            }
+        ] * 2
+        with self.settings(
+            PAYOUT_VELOCITY_STORE="payouts.velocity.LocalVelocityStore",
+            PAYOUT_VELOCITY_MAX_AMOUNT="150",
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                bulk = self.client.post(reverse("payout-bulk-create"), payload, format="json")
+            rejected = self.post("ACC-LIMIT-3", amount="40.00")
+
+        self.assertEqual(bulk.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(rejected.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_create_sums_items_per_account(self) -> None:
+        item = {"amount": "60.00", "currency": "USD", "recipient_name": "Velocity"}
+        payload = [
+            {**item, "recipient_account": "ACC-LIMIT-4"},
+            {**item, "recipient_account": "ACC-LIMIT-5"},
+            {**item, "recipient_account": "ACC-LIMIT-4"},
+            {**item, "recipient_account": "ACC-LIMIT-4"},
+        ]
+        with self.settings(
+            PAYOUT_VELOCITY_STORE="payouts.velocity.LocalVelocityStore",
+            PAYOUT_VELOCITY_MAX_COUNT=2,
+        ):
+            response = self.client.post(reverse("payout-bulk-create"), payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.json()
+        self.assertEqual(errors[:3], [{}, {}, {}])
+        self.assertIn("recipient_account", errors[3])
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from payouts.models import CurrencyChoices, Payout, PayoutStatus
+from payouts.tasks import (
+    finalize_payouts_batch,
+    flush_batched_webhooks,
+    schedule_payout_webhooks,
+    send_payout_webhooks,
+)
+from payouts.webhooks import WebhookDispatcher, WebhookJob, deliver_webhooks
+
+
+class StubWebhookServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, responses: list[int] | None = None, delay: float = 0) -> None:
+        super().__init__(("127.0.0.1", 0), StubWebhookHandler)
+        self.responses = list(responses or [])
+        self.delay = delay
+        self.bodies: list[bytes] = []
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/hook"
+
+    def next_status(self) -> int:
+        with self.lock:
+            return self.responses.pop(0) if self.responses else 200
+
+
+class StubWebhookHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StubWebhookServer
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        status_code = self.server.next_status()
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        with self.server.lock:
+            self.server.bodies.append(body)
+        self.send_response(status_code)
+        if status_code == 204:
+            self.end_headers()
+            return
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@contextmanager
+def stub_webhook_server(
+    responses: list[int] | None = None,
+    delay: float = 0,
+) -> Iterator[StubWebhookServer]:
+    server = StubWebhookServer(responses, delay)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def make_dispatcher(**overrides) -> WebhookDispatcher:
+    options = {
+        "concurrency": 10,
+        "connections_per_host": 2,
+        "timeout": 5,
+        "max_attempts": 3,
+        "backoff": 0,
+    }
+    options.update(overrides)
+    return WebhookDispatcher(**options)
+
+
+class WebhookDispatcherTestCase(SimpleTestCase):
+    def test_reuses_keep_alive_connections_per_host(self) -> None:
+        with stub_webhook_server() as server:
+            jobs = [WebhookJob(str(index), server.url, b"{}") for index in range(20)]
+            results = asyncio.run(make_dispatcher().deliver(jobs))
+
+        self.assertTrue(all(result.delivered for result in results))
+        self.assertEqual(len(server.bodies), 20)
+        self.assertLessEqual(server.connections, 2)
+
+    def test_timeout_excludes_waiting_for_a_pooled_connection(self) -> None:
+        with stub_webhook_server(delay=0.3) as server:
+            jobs = [WebhookJob(str(index), server.url, b"{}") for index in range(40)]
+            dispatcher = make_dispatcher(concurrency=50, connections_per_host=4, timeout=1, max_attempts=1)
+            results = asyncio.run(dispatcher.deliver(jobs))
+
+        self.assertTrue(all(result.delivered for result in results))
+        self.assertEqual(len(server.bodies), 40)
+
+    def test_no_content_responses_keep_the_connection_alive(self) -> None:
+        with stub_webhook_server(responses=[204] * 5) as server:
+            jobs = [WebhookJob(str(index), server.url, b"{}") for index in range(5)]
+            dispatcher = make_dispatcher(concurrency=1, connections_per_host=1, timeout=1)
+            results = asyncio.run(dispatcher.deliver(jobs))
+
+        self.assertEqual([result.status_code for result in results], [204] * 5)
+        self.assertTrue(all(result.delivered and result.attempts == 1 for result in results))
+        self.assertEqual(len(server.bodies), 5)
+        self.assertEqual(server.connections, 1)
+
+    def test_retries_server_errors_with_backoff(self) -> None:
+        with stub_webhook_server(responses=[503, 500]) as server:
+            [result] = asyncio.run(make_dispatcher().deliver([WebhookJob("1", server.url, b"{}")]))
+
+        self.assertTrue(result.delivered)
+        self.assertEqual(result.attempts, 3)
+
+    def test_client_errors_are_not_retried(self) -> None:
+        with stub_webhook_server(responses=[404]) as server:
+            [result] = asyncio.run(make_dispatcher().deliver([WebhookJob("1", server.url, b"{}")]))
+
+        self.assertFalse(result.delivered)
+        self.assertFalse(result.retryable)
+        self.assertEqual(result.attempts, 1)
+
+    def test_unreachable_host_fails_after_max_attempts(self) -> None:
+        with stub_webhook_server() as server:
+            url = server.url
+        [result] = asyncio.run(make_dispatcher().deliver([WebhookJob("1", url, b"{}")]))
+
+        self.assertFalse(result.delivered)
+        self.assertTrue(result.retryable)
+        self.assertEqual(result.attempts, 3)
+
+
+class SendPayoutWebhooksTaskTestCase(TestCase):
+    def test_delivers_batch_payloads(self) -> None:
+        with stub_webhook_server() as server:
+            payouts = [
+                Payout.objects.create(
+                    amount="25.00",
+                    currency=CurrencyChoices.GBP,
+                    recipient_name="Hook",
+                    recipient_account=f"ACC-HOOK-{index}",
+                    status=PayoutStatus.COMPLETED,
+                    callback_url=server.url,
+                )
+                for index in range(3)
+            ]
+            with self.settings(WEBHOOK_RETRY_BACKOFF_SECONDS=0):
+                send_payout_webhooks.apply(args=([str(payout.id) for payout in payouts],))
+
+        delivered = [json.loads(body) for body in server.bodies]
+        self.assertCountEqual(
+            [item["payout_id"] for item in delivered],
+            [str(payout.id) for payout in payouts],
+        )
+        self.assertEqual(delivered[0]["status"], PayoutStatus.COMPLETED)
+        self.assertEqual(delivered[0]["amount"], "25.00")
+
+
+class BatchedWebhookTestCase(TestCase):
+    def create_payout(self, url: str, **overrides) -> Payout:
+        fields = {
+            "amount": "10.00",
+            "currency": CurrencyChoices.USD,
+            "recipient_name": "Batch",
+            "recipient_account": "ACC-BATCHED",
+            "status": PayoutStatus.PROCESSING,
+            "callback_url": url,
+            "webhook_batching": True,
+        }
+        fields.update(overrides)
+        return Payout.objects.create(**fields)
+
+    @mock.patch("payouts.tasks.send_payout_webhooks.delay")
+    def test_finalize_defers_batched_payouts(self, mock_send: mock.Mock) -> None:
+        batched = self.create_payout("https://example.com/hook")
+        immediate = self.create_payout("https://example.com/hook", webhook_batching=False)
+
+        finalize_payouts_batch.apply(args=([str(batched.id), str(immediate.id)],))
+
+        batched.refresh_from_db()
+        self.assertIsNotNone(batched.webhook_pending_since)
+        mock_send.assert_called_once_with([str(immediate.id)])
+
+    def test_flush_posts_one_array_per_callback_url(self) -> None:
+        with stub_webhook_server() as first, stub_webhook_server() as second:
+            payouts = [self.create_payout(first.url) for _ in range(3)]
+            payouts.append(self.create_payout(second.url))
+            schedule_payout_webhooks((str(payout.id), True) for payout in payouts)
+            Payout.objects.filter(id=payouts[0].id).transition(PayoutStatus.COMPLETED)
+
+            with self.settings(WEBHOOK_BATCH_WINDOW_SECONDS=0, WEBHOOK_RETRY_BACKOFF_SECONDS=0):
+                flush_batched_webhooks.apply()
+
+        self.assertEqual(len(first.bodies), 1)
+        self.assertEqual(len(second.bodies), 1)
+        delivered = json.loads(first.bodies[0])
+        self.assertEqual(len(delivered), 3)
+        statuses = {item["payout_id"]: item["status"] for item in delivered}
+        self.assertEqual(statuses[str(payouts[0].id)], PayoutStatus.COMPLETED)
+
+        payouts[0].refresh_from_db()
+        self.assertIsNone(payouts[0].webhook_pending_since)
+        self.assertEqual(payouts[0].webhook_delivered_status, PayoutStatus.COMPLETED)
+        self.assertIsNotNone(payouts[0].webhook_delivered_at)
+
+    def test_failed_flush_keeps_payouts_pending(self) -> None:
+        with stub_webhook_server(responses=[500, 500, 500]) as server:
+            payout = self.create_payout(server.url)
+            schedule_payout_webhooks([(str(payout.id), True)])
+
+            with self.settings(WEBHOOK_BATCH_WINDOW_SECONDS=0, WEBHOOK_RETRY_BACKOFF_SECONDS=0):
+                flush_batched_webhooks.apply()
+
+        payout.refresh_from_db()
+        self.assertIsNotNone(payout.webhook_pending_since)
+        self.assertEqual(payout.webhook_attempts, 1)
+        self.assertEqual(payout.webhook_delivered_status, "")
+
+    def test_overlapping_flush_skips_claimed_payouts(self) -> None:
+        with stub_webhook_server() as server:
+            payout = self.create_payout(server.url)
+            schedule_payout_webhooks([(str(payout.id), True)])
+
+            def deliver_during_overlapping_flush(jobs):
+                with mock.patch("payouts.tasks.deliver_webhooks") as overlapping:
+                    flush_batched_webhooks.apply()
+                overlapping.assert_not_called()
+                return deliver_webhooks(jobs)
+
+            with (
+                self.settings(WEBHOOK_BATCH_WINDOW_SECONDS=0, WEBHOOK_RETRY_BACKOFF_SECONDS=0),
+                mock.patch("payouts.tasks.deliver_webhooks", side_effect=deliver_during_overlapping_flush),
+            ):
+                flush_batched_webhooks.apply()
+
+        self.assertEqual(len(server.bodies), 1)
+        payout.refresh_from_db()
+        self.assertIsNone(payout.webhook_pending_since)
+
+    def test_failed_flush_releases_claim_for_next_flush(self) -> None:
+        with stub_webhook_server(responses=[500, 500, 500, 500]) as server:
+            payout = self.create_payout(server.url)
+            schedule_payout_webhooks([(str(payout.id), True)])
+
+            with self.settings(
+                WEBHOOK_BATCH_WINDOW_SECONDS=0,
+                WEBHOOK_RETRY_BACKOFF_SECONDS=0,
+                WEBHOOK_MAX_ATTEMPTS=2,
+            ):
+                flush_batched_webhooks.apply()
+                flush_batched_webhooks.apply()
+
+        payout.refresh_from_db()
+        self.assertEqual(len(server.bodies), 4)
+        self.assertEqual(payout.webhook_attempts, 2)
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+import redis
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+from payouts import metrics
+from payouts.models import Payout, PayoutStatus
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# Refills the bucket from Redis server time, takes ``cost`` tokens if available and
+# returns the seconds to wait otherwise, as a string so fractions survive the reply.
+# A cost above the capacity needs a full bucket and leaves it in debt for the excess.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - updated, 0) * rate)
+local needed = math.min(cost, capacity)
+local wait = 0
+if tokens >= needed then
+    tokens = tokens - cost
+else
+    wait = (needed - tokens) / rate
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "ts", tostring(now))
+redis.call("PEXPIRE", KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+_store: TokenBucketStore | None = None
+_store_lock = threading.Lock()
+_backlog: tuple[float, int] | None = None
+_backlog_lock = threading.Lock()
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    count, period = rate.split("/")
+    return int(count), PERIODS[period[0]]
+
+
+class TokenBucketStore:
+    @classmethod
+    def from_settings(cls) -> TokenBucketStore:
+        return cls()
+
+    def take(self, key: str, rate: float, capacity: float, cost: float = 1) -> float:
+        raise NotImplementedError
+
+
+class LocalTokenBucketStore(TokenBucketStore):
+    max_keys = 10_000
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.buckets: dict[str, tuple[float, float, float, float]] = {}
+
+    def take(
+        self,
+        key: str,
+        rate: float,
+        capacity: float,
+        cost: float = 1,
+        now: float | None = None,
+    ) -> float:
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            tokens, updated, _, _ = self.buckets.get(key, (capacity, now, rate, capacity))
+            tokens = min(capacity, tokens + max(now - updated, 0) * rate)
+            needed = min(cost, capacity)
+            if tokens >= needed:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (needed - tokens) / rate
+            self.buckets[key] = (tokens, now, rate, capacity)
+            if len(self.buckets) > self.max_keys:
+                self.evict(now)
+        return wait
+
+    def evict(self, now: float) -> None:
+        for key, (tokens, updated, rate, capacity) in list(self.buckets.items()):
+            if tokens + (now - updated) * rate >= capacity:
+                del self.buckets[key]
+
+
+class RedisTokenBucketStore(TokenBucketStore):
+    key_prefix = "payout-throttle"
+
+    def __init__(self, url: str, breaker_seconds: float = 5) -> None:
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+        self.fallback = LocalTokenBucketStore()
+        self.breaker_seconds = breaker_seconds
+        self.open_until = 0.0
+
+    @classmethod
+    def from_settings(cls) -> RedisTokenBucketStore:
+        return cls(settings.PAYOUT_THROTTLE_REDIS_URL, settings.PAYOUT_THROTTLE_BREAKER_SECONDS)
+
+    def take(self, key: str, rate: float, capacity: float, cost: float = 1) -> float:
+        # While the breaker is open, requests go straight to the in-process buckets instead of
+        # each waiting out the socket timeout; the first request after it closes probes Redis.
+        if self.open_until > time.monotonic():
+            return self.fallback.take(key, rate, capacity, cost)
+        try:
+            return float(self.script(keys=[f"{self.key_prefix}:{key}"], args=[rate, capacity, cost]))
+        except redis.RedisError as exc:
+            self.open_until = time.monotonic() + self.breaker_seconds
+            logger.warning(
+                "Throttle store unavailable, using in-process buckets for %ss: %s",
+                self.breaker_seconds,
+                exc,
+            )
+            return self.fallback.take(key, rate, capacity, cost)
+
+
+def get_store() -> TokenBucketStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = import_string(settings.PAYOUT_THROTTLE_STORE).from_settings()
+    return _store
+
+
+def pending_backlog() -> int:
+    global _backlog
+    now = time.monotonic()
+    cached = _backlog
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    with _backlog_lock:
+        if _backlog is None or _backlog[0] <= now:
+            count = Payout.objects.filter(status=PayoutStatus.PENDING).count()
+            _backlog = (now + settings.PAYOUT_ADMISSION_CHECK_INTERVAL_SECONDS, count)
+        return _backlog[1]
+
+
+class PayoutRateThrottle(BaseThrottle):
+    def __init__(self) -> None:
+        self.wait_seconds: float | None = None
+
+    def client_key(self, request) -> str:
+        if isinstance(request.auth, str):
+            return f"token:{request.auth}"
+        if request.user and request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+    def allow_request(self, request, view) -> bool:
+        scope = "read" if request.method in SAFE_METHODS else "write"
+        rate = settings.PAYOUT_THROTTLE_RATES.get(scope)
+        if not rate:
+            return True
+        count, period = parse_rate(rate)
+        self.wait_seconds = get_store().take(
+            f"{scope}:{self.client_key(request)}",
+            count / period,
+            count,
+            self.cost(request, scope),
+        )
+        if self.wait_seconds:
+            metrics.REQUESTS_REJECTED.inc("rate_limit")
+            return False
+        return True
+
+    def cost(self, request, scope: str) -> int:
+        # Bulk creates pay one token per item, like the equivalent single creates.
+        if scope == "write" and isinstance(request.data, list):
+            return max(len(request.data), 1)
+        return 1
+
+    def wait(self) -> float | None:
+        return self.wait_seconds
+
+
+class QueueAdmissionThrottle(BaseThrottle):
+    def allow_request(self, request, view) -> bool:
+        limit = settings.PAYOUT_ADMISSION_MAX_BACKLOG
+        if not limit or request.method != "POST":
+            return True
+        if pending_backlog() < limit:
+            return True
+        metrics.REQUESTS_REJECTED.inc("backlog")
+        return False
+
+    def wait(self) -> float:
+        return settings.PAYOUT_ADMISSION_RETRY_AFTER_SECONDS
+
+
+@receiver(setting_changed, dispatch_uid="payouts.throttling.reset_state")
+def reset_state(setting: str, **kwargs) -> None:
+    global _store, _backlog
+    if setting.startswith("PAYOUT_THROTTLE_"):
+        _store = None
+    if setting.startswith("PAYOUT_ADMISSION_"):
+        _backlog = None
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections.abc import Iterable
+from decimal import Decimal
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from payouts import metrics
+
+_store: VelocityStore | None = None
+_store_lock = threading.Lock()
+
+
+class VelocityUsage(NamedTuple):
+    count: int
+    amount: Decimal
+
+
+def _to_cents(amount: Decimal) -> int:
+    return int(Decimal(amount).scaleb(2).to_integral_value())
+
+
+class VelocityStore:
+    def __init__(self, window_seconds: int, bucket_seconds: int) -> None:
+        self.bucket_seconds = max(bucket_seconds, 1)
+        self.bucket_count = max(-(-window_seconds // self.bucket_seconds), 1)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls) -> VelocityStore:
+        return cls(settings.PAYOUT_VELOCITY_WINDOW_SECONDS, settings.PAYOUT_VELOCITY_BUCKET_SECONDS)
+
+    def current_bucket(self, now: float | None = None) -> int:
+        return int((time.time() if now is None else now) // self.bucket_seconds)
+
+    def record(self, account: str, amount: Decimal, now: float | None = None) -> None:
+        self.record_many([(account, amount)], now)
+
+    def record_many(self, items: Iterable[tuple[str, Decimal]], now: float | None = None) -> None:
+        raise NotImplementedError
+
+    def usage(self, account: str, now: float | None = None) -> VelocityUsage:
+        count, cents = self.read(account, self.current_bucket(now))
+        if count:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return VelocityUsage(count, Decimal(cents).scaleb(-2))
+
+    def read(self, account: str, bucket: int) -> tuple[int, int]:
+        raise NotImplementedError
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class LocalVelocityStore(VelocityStore):
+    def __init__(self, window_seconds: int, bucket_seconds: int) -> None:
+        super().__init__(window_seconds, bucket_seconds)
+        self.lock = threading.Lock()
+        self.accounts: dict[str, dict[int, list[int]]] = {}
+        self.evicted_at = 0
+
+    def record_many(self, items: Iterable[tuple[str, Decimal]], now: float | None = None) -> None:
+        bucket = self.current_bucket(now)
+        with self.lock:
+            self.evict(bucket)
+            for account, amount in items:
+                counter = self.accounts.setdefault(account, {}).setdefault(bucket, [0, 0])
+                counter[0] += 1
+                counter[1] += _to_cents(amount)
+
+    def read(self, account: str, bucket: int) -> tuple[int, int]:
+        oldest = bucket - self.bucket_count + 1
+        with self.lock:
+            buckets = self.accounts.get(account, {})
+            live = [counter for index, counter in buckets.items() if index >= oldest]
+        return sum(counter[0] for counter in live), sum(counter[1] for counter in live)
+
+    def evict(self, bucket: int) -> None:
+        if bucket == self.evicted_at:
+            return
+        self.evicted_at = bucket
+        oldest = bucket - self.bucket_count + 1
+        for account in list(self.accounts):
+            buckets = self.accounts[account]
+            for index in [index for index in buckets if index < oldest]:
+                del buckets[index]
+            if not buckets:
+                del self.accounts[account]
+
+    def stats(self) -> dict[str, int]:
+        with self.lock:
+            buckets = sum(len(account) for account in self.accounts.values())
+            memory = sys.getsizeof(self.accounts) + sum(
+                sys.getsizeof(account)
+                + sys.getsizeof(buckets)
+                + sum(
+                    sys.getsizeof(index) + sys.getsizeof(counter) + sum(map(sys.getsizeof, counter))
+                    for index, counter in buckets.items()
+                )
+                for account, buckets in self.accounts.items()
+            )
+        return {
+            **super().stats(),
+            "accounts": len(self.accounts),
+            "buckets": buckets,
+            "memory_bytes": memory,
+        }
+
+
+class CacheVelocityStore(VelocityStore):
+    key_prefix = "payout-velocity"
+
+    def __init__(self, window_seconds: int, bucket_seconds: int, alias: str = "default") -> None:
+        super().__init__(window_seconds, bucket_seconds)
+        self.cache = caches[alias]
+        self.timeout = (self.bucket_count + 1) * self.bucket_seconds
+        self.writes = 0
+
+    def keys(self, account: str, bucket: int) -> tuple[str, str]:
+        return f"{self.key_prefix}:{account}:{bucket}:n", f"{self.key_prefix}:{account}:{bucket}:c"
+
+    def record_many(self, items: Iterable[tuple[str, Decimal]], now: float | None = None) -> None:
+        bucket = self.current_bucket(now)
+        totals: dict[str, list[int]] = {}
+        for account, amount in items:
+            counter = totals.setdefault(account, [0, 0])
+            counter[0] += 1
+            counter[1] += _to_cents(amount)
+        for account, (count, cents) in totals.items():
+            for key, delta in zip(self.keys(account, bucket), (count, cents)):
+                self.cache.add(key, 0, timeout=self.timeout)
+                try:
+                    self.cache.incr(key, delta)
+                except ValueError:
+                    self.cache.set(key, delta, timeout=self.timeout)
+                self.writes += 1
+
+    def read(self, account: str, bucket: int) -> tuple[int, int]:
+        keys = [
+            self.keys(account, index)
+            for index in range(bucket - self.bucket_count + 1, bucket + 1)
+        ]
+        values = self.cache.get_many([key for pair in keys for key in pair])
+        count = sum(values.get(count_key, 0) for count_key, _ in keys)
+        cents = sum(values.get(cents_key, 0) for _, cents_key in keys)
+        return count, cents
+
+    def stats(self) -> dict[str, int]:
+        return {**super().stats(), "writes": self.writes, "max_keys_per_account": self.bucket_count * 2}
+
+
+def enabled() -> bool:
+    return (
+        settings.PAYOUT_VELOCITY_MAX_COUNT is not None
+        or settings.PAYOUT_VELOCITY_MAX_AMOUNT is not None
+    )
+
+
+def get_store() -> VelocityStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = import_string(settings.PAYOUT_VELOCITY_STORE).from_settings()
+    return _store
+
+
+def _store_stats() -> dict[str, int]:
+    store = _store
+    return store.stats() if store is not None else {}
+
+
+metrics.REGISTRY.register_collector(
+    metrics.stats_collector("payout_velocity_store", "Velocity store statistics", _store_stats)
+)
+
+
+def limit_error(account: str, amount: Decimal, usage: VelocityUsage | None = None) -> str | None:
+    if usage is None:
+        usage = get_store().usage(account)
+    max_count = settings.PAYOUT_VELOCITY_MAX_COUNT
+    max_amount = settings.PAYOUT_VELOCITY_MAX_AMOUNT
+    if max_count is not None and usage.count + 1 > max_count:
+        return f"No more than {max_count} payouts per recipient account are allowed in the window."
+    if max_amount is not None and usage.amount + amount > Decimal(max_amount):
+        return f"No more than {max_amount} per recipient account is allowed in the window."
+    return None
+
+
+@receiver(setting_changed, dispatch_uid="payouts.velocity.reset_store")
+def reset_store(setting: str, **kwargs) -> None:
+    global _store
+    if setting.startswith("PAYOUT_VELOCITY_"):
+        _store = None
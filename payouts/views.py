@@ -1,18 +1,216 @@
-from rest_framework import filters, permissions, viewsets
+import uuid
+from collections.abc import AsyncIterator, Sequence
+from itertools import islice
 
-from payouts.models import Payout
-from payouts.serializers import PayoutSerializer
-from payouts.tasks import process_payout
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import QuerySet
+from django.http import Http404, StreamingHttpResponse
+from rest_framework import filters, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from payouts import idempotency, metrics, outbox, response_cache, rollups, routing
+from payouts.events import EVENT_FIELDS
+from payouts.filters import PayoutAttributeFilter, PayoutSearchFilter
+from payouts.models import ArchivedPayout, Payout, PayoutEvent
+from payouts.pagination import KeysetPagination
+from payouts.renderers import CSVRenderer, NDJSONRenderer, PayoutJSONRenderer
+from payouts.serializers import PAYOUT_READ_FIELDS, PayoutSerializer
+from payouts.signals import PayoutChange, payouts_changed
+from payouts.throttling import PayoutRateThrottle, QueueAdmissionThrottle
+
+
+async def _aiterate(queryset: QuerySet, chunk_size: int) -> AsyncIterator[Sequence]:
+    # QuerySet.aiterator() in Django 4.2 opens the cursor on the event loop for values_list()
+    # querysets, so pull chunks of the sync iterator through the thread-sensitive executor instead.
+    rows = queryset.iterator(chunk_size=chunk_size)
+    next_chunk = sync_to_async(lambda: list(islice(rows, chunk_size)))
+    try:
+        while chunk := await next_chunk():
+            for row in chunk:
+                yield row
+    finally:
+        await sync_to_async(rows.close)()
 
 
 class PayoutViewSet(viewsets.ModelViewSet):
-    queryset = Payout.objects.all().order_by("-created_at")
+    queryset = Payout.objects.all().order_by("-created_at", "-id")
     serializer_class = PayoutSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
+    renderer_classes = [PayoutJSONRenderer, BrowsableAPIRenderer]
+    pagination_class = KeysetPagination
+    throttle_classes = [PayoutRateThrottle, QueueAdmissionThrottle]
+    filter_backends = [PayoutAttributeFilter, filters.OrderingFilter, PayoutSearchFilter]
     ordering_fields = ["created_at", "amount", "status"]
     search_fields = ["recipient_name", "recipient_account", "currency", "status"]
 
-    def perform_create(self, serializer: PayoutSerializer) -> None:
-        payout = serializer.save()
-        process_payout.delay(str(payout.id))
+    @routing.replica_reads
+    def dispatch(self, request, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        queryset = self.filter_queryset(self.get_queryset()).values(*PAYOUT_READ_FIELDS)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(list(queryset))
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            payout_id = uuid.UUID(str(self.kwargs[lookup_url_kwarg]))
+        except ValueError:
+            raise NotFound()
+        entry, generation = response_cache.get(payout_id)
+        if entry is None:
+            # Fill the cache from the primary only: a lagging replica could store a row that an
+            # invalidation has already superseded, and it would be served until the TTL expires.
+            using = DEFAULT_DB_ALIAS if response_cache.enabled() else None
+            lookup = {self.lookup_field: payout_id}
+            try:
+                row = get_object_or_404(
+                    self.get_queryset().using(using).values(*PAYOUT_READ_FIELDS), **lookup
+                )
+            except Http404:
+                row = get_object_or_404(
+                    ArchivedPayout.objects.using(using).values(*PAYOUT_READ_FIELDS), **lookup
+                )
+            entry = response_cache.store(payout_id, row, generation)
+        self.check_object_permissions(request, entry.data)
+        headers = {"ETag": entry.etag}
+        if response_cache.matches(request.headers.get("If-None-Match"), entry.etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(entry.data, headers=headers)
+
+    def create(self, request: Request, *args, **kwargs) -> Response:
+        key = request.headers.get(idempotency.IDEMPOTENCY_HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > idempotency.MAX_KEY_LENGTH:
+            raise ValidationError(
+                {idempotency.IDEMPOTENCY_HEADER: [
+                    f"Ensure this value has at most {idempotency.MAX_KEY_LENGTH} characters."
+                ]}
+            )
+
+        scoped = idempotency.scoped_key(request.user.pk, key)
+        # A retry must replay the original outcome even when its body would no longer validate
+        # (velocity limits, malformed resend), so look the key up before validating.
+        replay = idempotency.cached_response(scoped)
+        if replay is None:
+            replay = idempotency.stored_response(scoped, PAYOUT_READ_FIELDS)
+        if replay is not None:
+            return self.idempotent_replay(replay)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            self.perform_create(serializer, idempotency_key=scoped)
+        except IntegrityError:
+            replay = idempotency.stored_response(scoped, PAYOUT_READ_FIELDS)
+            if replay is None:
+                raise
+            return self.idempotent_replay(replay)
+
+        idempotency.remember(scoped, dict(serializer.data))
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+    def idempotent_replay(self, data: dict) -> Response:
+        return Response(data, status=status.HTTP_201_CREATED, headers={"Idempotent-Replayed": "true"})
+
+    def perform_create(self, serializer: PayoutSerializer, **extra) -> None:
+        with metrics.STAGE_DURATION.time("perform_create"), transaction.atomic():
+            payout = serializer.save(**extra)
+            outbox.enqueue(outbox.PROCESS_PAYOUTS_TASK, [payout.pk])
+
+    def perform_destroy(self, instance: Payout) -> None:
+        with transaction.atomic():
+            payouts_changed.send(
+                sender=Payout,
+                changes=[PayoutChange(instance.pk, instance.state, None)],
+            )
+            instance.delete()
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk_create(self, request: Request) -> Response:
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.PAYOUT_BULK_MAX_ITEMS,
+        )
+        serializer.is_valid(raise_exception=True)
+        with metrics.STAGE_DURATION.time("perform_bulk_create"), transaction.atomic():
+            payouts = serializer.save()
+            outbox.enqueue(outbox.PROCESS_PAYOUTS_TASK, [payout.pk for payout in payouts])
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["get"], url_path="summary", pagination_class=None)
+    def summary(self, request: Request) -> Response:
+        return Response(rollups.summarize())
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        renderer_classes=[NDJSONRenderer, CSVRenderer],
+        pagination_class=None,
+    )
+    def export(self, request: Request) -> StreamingHttpResponse:
+        queryset = self.filter_queryset(self.get_queryset()).values_list(*PAYOUT_READ_FIELDS)
+        return self.stream_rows(request, PAYOUT_READ_FIELDS, queryset, "payouts")
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="history",
+        renderer_classes=[NDJSONRenderer, CSVRenderer],
+        pagination_class=None,
+    )
+    def history(self, request: Request, pk: str | None = None) -> StreamingHttpResponse:
+        try:
+            payout_id = uuid.UUID(str(pk))
+        except ValueError:
+            raise NotFound()
+        events = PayoutEvent.objects.filter(payout_id=payout_id).order_by("id")
+        if not events.exists() and not any(
+            model.objects.filter(pk=payout_id).exists() for model in (Payout, ArchivedPayout)
+        ):
+            raise NotFound()
+        return self.stream_rows(
+            request,
+            EVENT_FIELDS,
+            events.values_list(*EVENT_FIELDS),
+            f"payout-{payout_id}-history",
+        )
+
+    def stream_rows(
+        self,
+        request: Request,
+        fields: Sequence[str],
+        queryset: QuerySet,
+        filename: str,
+    ) -> StreamingHttpResponse:
+        # Bind the alias now: the body is streamed after the routing scope has ended.
+        queryset = queryset.using(queryset.db)
+        chunk_size = settings.PAYOUT_EXPORT_CHUNK_SIZE
+        renderer = request.accepted_renderer
+        if isinstance(request._request, ASGIRequest):
+            content = renderer.astream(fields, _aiterate(queryset, chunk_size))
+        else:
+            content = renderer.stream(fields, queryset.iterator(chunk_size=chunk_size))
+        response = StreamingHttpResponse(
+            content,
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}.{renderer.format}"'
+        return response
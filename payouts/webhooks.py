@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import ssl
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+from payouts import metrics
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429})
+
+
+class StaleConnectionError(ConnectionError):
+    pass
+
+
+@dataclass(frozen=True)
+class Origin:
+    scheme: str
+    host: str
+    port: int
+
+    @classmethod
+    def from_url(cls, url: str) -> Origin:
+        parts = urlsplit(url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise ValueError(f"Unsupported webhook URL: {url!r}")
+        default_port = 443 if parts.scheme == "https" else 80
+        return cls(parts.scheme, parts.hostname, parts.port or default_port)
+
+    @property
+    def host_header(self) -> str:
+        default_port = 443 if self.scheme == "https" else 80
+        return self.host if self.port == default_port else f"{self.host}:{self.port}"
+
+
+@dataclass(frozen=True)
+class WebhookJob:
+    key: str
+    url: str
+    body: bytes
+
+
+@dataclass(frozen=True)
+class DeliveryResult:
+    job: WebhookJob
+    delivered: bool
+    attempts: int
+    status_code: int | None = None
+    error: str = ""
+
+    @property
+    def retryable(self) -> bool:
+        if self.delivered:
+            return False
+        if self.status_code is None:
+            return True
+        return self.status_code >= 500 or self.status_code in RETRYABLE_STATUS_CODES
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class HostConnectionPool:
+    def __init__(self, origin: Origin, max_connections: int) -> None:
+        self.origin = origin
+        self._slots = asyncio.Semaphore(max(max_connections, 1))
+        self._idle: list[_Connection] = []
+
+    async def acquire(self, connect_timeout: float) -> _Connection:
+        await self._slots.acquire()
+        while self._idle:
+            connection = self._idle.pop()
+            if connection.writer.is_closing() or connection.reader.at_eof():
+                connection.close()
+                continue
+            connection.reused = True
+            return connection
+        try:
+            return await asyncio.wait_for(self._connect(), connect_timeout)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, connection: _Connection, reusable: bool) -> None:
+        if reusable and not connection.writer.is_closing():
+            self._idle.append(connection)
+        else:
+            connection.close()
+        self._slots.release()
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+        for connection in idle:
+            try:
+                await connection.writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+
+    async def _connect(self) -> _Connection:
+        ssl_context = ssl.create_default_context() if self.origin.scheme == "https" else None
+        reader, writer = await asyncio.open_connection(
+            self.origin.host,
+            self.origin.port,
+            ssl=ssl_context,
+        )
+        return _Connection(reader, writer)
+
+
+def _without_body(method: str, status_code: int) -> bool:
+    return method == "HEAD" or 100 <= status_code < 200 or status_code in {204, 304}
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in {b"\r\n", b"\n", b""}:
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def _read_body(
+    reader: asyncio.StreamReader,
+    headers: dict[str, str],
+    status_code: int,
+    method: str,
+    closing: bool,
+) -> bool:
+    # Returns whether the body was delimited, i.e. the connection can carry another request.
+    if _without_body(method, status_code):
+        return True
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                while (await reader.readline()) not in {b"\r\n", b"\n", b""}:
+                    pass
+                return True
+            await reader.readexactly(size + 2)
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+        return True
+    # An undelimited body ends at EOF, which only comes if the server closes the connection;
+    # otherwise drop the connection rather than wait for the timeout.
+    if closing:
+        await reader.read()
+    return False
+
+
+async def _post(connection: _Connection, origin: Origin, path: str, body: bytes) -> tuple[int, bool]:
+    head = (
+        f"POST {path} HTTP/1.1\r\n"
+        f"Host: {origin.host_header}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: keep-alive\r\n"
+        "\r\n"
+    ).encode("latin-1")
+    connection.writer.write(head + body)
+    await connection.writer.drain()
+
+    while True:
+        status_line = await connection.reader.readline()
+        if not status_line:
+            raise StaleConnectionError("Connection closed before response.")
+        version, status_code, *_ = status_line.decode("latin-1").split(" ", 2)
+        headers = await _read_headers(connection.reader)
+        # Interim 1xx responses precede the final one on the same connection.
+        if not 100 <= int(status_code) < 200:
+            break
+
+    closing = version != "HTTP/1.1" or headers.get("connection", "").lower() == "close"
+    framed = await _read_body(connection.reader, headers, int(status_code), "POST", closing)
+    return int(status_code), framed and not closing
+
+
+class WebhookDispatcher:
+    def __init__(
+        self,
+        *,
+        concurrency: int,
+        connections_per_host: int,
+        timeout: float,
+        max_attempts: int,
+        backoff: float,
+    ) -> None:
+        self.concurrency = max(concurrency, 1)
+        self.connections_per_host = connections_per_host
+        self.timeout = timeout
+        self.max_attempts = max(max_attempts, 1)
+        self.backoff = backoff
+        self._pools: dict[Origin, HostConnectionPool] = {}
+
+    @classmethod
+    def from_settings(cls) -> WebhookDispatcher:
+        return cls(
+            concurrency=settings.WEBHOOK_MAX_CONCURRENCY,
+            connections_per_host=settings.WEBHOOK_MAX_CONNECTIONS_PER_HOST,
+            timeout=settings.WEBHOOK_TIMEOUT_SECONDS,
+            max_attempts=settings.WEBHOOK_MAX_ATTEMPTS,
+            backoff=settings.WEBHOOK_RETRY_BACKOFF_SECONDS,
+        )
+
+    async def deliver(self, jobs: Iterable[WebhookJob]) -> list[DeliveryResult]:
+        slots = asyncio.Semaphore(self.concurrency)
+        try:
+            return list(await asyncio.gather(*(self._deliver(job, slots) for job in jobs)))
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            await pool.close()
+
+    async def _deliver(self, job: WebhookJob, slots: asyncio.Semaphore) -> DeliveryResult:
+        try:
+            origin = Origin.from_url(job.url)
+        except ValueError as exc:
+            return DeliveryResult(job, delivered=False, attempts=0, status_code=400, error=str(exc))
+
+        result = DeliveryResult(job, delivered=False, attempts=0)
+        for attempt in range(1, self.max_attempts + 1):
+            async with slots:
+                result = await self._attempt(job, origin, attempt)
+            if result.delivered or not result.retryable:
+                return result
+            if attempt < self.max_attempts:
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+        return result
+
+    async def _attempt(self, job: WebhookJob, origin: Origin, attempt: int) -> DeliveryResult:
+        started = time.perf_counter()
+        try:
+            status_code = await self._send(job, origin)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as exc:
+            metrics.WEBHOOK_DURATION.observe(
+                time.perf_counter() - started,
+                metrics.WEBHOOK_HOST_LABEL(origin.host),
+                "error",
+            )
+            logger.warning("Webhook %s attempt %s failed: %r", job.key, attempt, exc)
+            return DeliveryResult(job, delivered=False, attempts=attempt, error=repr(exc))
+
+        delivered = 200 <= status_code < 300
+        metrics.WEBHOOK_DURATION.observe(
+            time.perf_counter() - started,
+            metrics.WEBHOOK_HOST_LABEL(origin.host),
+            "delivered" if delivered else f"http_{status_code // 100}xx",
+        )
+        if not delivered:
+            logger.warning("Webhook %s attempt %s got HTTP %s", job.key, attempt, status_code)
+        return DeliveryResult(job, delivered=delivered, attempts=attempt, status_code=status_code)
+
+    async def _send(self, job: WebhookJob, origin: Origin) -> int:
+        pool = self._pools.get(origin)
+        if pool is None:
+            pool = self._pools[origin] = HostConnectionPool(origin, self.connections_per_host)
+        parts = urlsplit(job.url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        # Waiting for a pooled connection is bounded by the dispatcher's concurrency, not the
+        # timeout: only connecting and the request itself count against the deadline.
+        while True:
+            connection = await pool.acquire(self.timeout)
+            reusable = False
+            try:
+                status_code, reusable = await asyncio.wait_for(
+                    _post(connection, origin, path, job.body),
+                    self.timeout,
+                )
+                return status_code
+            except (StaleConnectionError, ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+                if not connection.reused:
+                    raise
+            finally:
+                pool.release(connection, reusable)
+
+
+def deliver_webhooks(jobs: Iterable[WebhookJob]) -> list[DeliveryResult]:
+    return asyncio.run(WebhookDispatcher.from_settings().deliver(jobs))